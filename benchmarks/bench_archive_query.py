@@ -0,0 +1,109 @@
+"""Benchmark: TelemetryArchive range queries over per-second history.
+
+Writes --days of per-second telemetry (--rate samples/s) for --units units
+into a fresh archive, then times random (unit, t0, t1) range queries of
+several spans. Reports the zero-copy query itself (memmap views of the
+touched day partitions), materializing the columns, and a naive baseline
+that reads every partition of the unit and masks it.
+
+The full-scale case from the design target - a year of per-second data for
+1,000 units - is about 31.5 billion samples / 504 GB on disk (16 bytes per
+sample), so the defaults write a small slice of it. Query cost depends on
+the partitions a range touches, not on archive size, so per-query numbers
+carry over to the full archive:
+
+    python benchmarks/bench_archive_query.py
+    python benchmarks/bench_archive_query.py --units 1000 --days 365 --dir /big/disk/archive
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kaeser.archive import SECONDS_PER_DAY, TelemetryArchive  # noqa: E402
+from kaeser.fleet import make_unit_ids  # noqa: E402
+
+SPANS = {'1 hour': 3600, '1 day': SECONDS_PER_DAY, '7 days': 7 * SECONDS_PER_DAY, 'full range': None}
+
+
+def write_archive(archive, unit_ids, days, rate, start):
+    rng = np.random.default_rng(0)
+    per_day = int(SECONDS_PER_DAY * rate)
+    offsets = np.arange(per_day) / rate
+    for unit_id in unit_ids:
+        for day in range(days):
+            ts = start + day * SECONDS_PER_DAY + offsets
+            archive.append(unit_id, ts, rng.normal(70, 2, per_day), rng.normal(7, 0.3, per_day))
+            archive.flush()
+
+
+def naive_query(archive, unit_id, t0, t1):
+    """Read every partition of the unit, concatenate, then mask."""
+    unit_dir = archive._unit_dir(unit_id)
+    parts = [[np.fromfile(os.path.join(unit_dir, day, name), dtype=dtype)
+              for name, dtype in (('ts.f64', np.float64), ('suhu.f32', np.float32), ('tekanan.f32', np.float32))]
+             for day in sorted(os.listdir(unit_dir))]
+    ts, suhu, tekanan = (np.concatenate(column) for column in zip(*parts))
+    mask = (ts >= t0) & (ts < t1)
+    return ts[mask], suhu[mask], tekanan[mask]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--units', type=int, default=20)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--rate', type=float, default=1.0, help='samples per second per unit')
+    parser.add_argument('--queries', type=int, default=50, help='random queries per span')
+    parser.add_argument('--dir', default=None, help='archive directory (default: a temporary directory)')
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix='kaeser-archive-')
+    unit_ids = make_unit_ids(1, args.units + 1).tolist()
+    start = float(np.datetime64('2025-01-01', 's').astype(np.int64))
+    end = start + args.days * SECONDS_PER_DAY
+    try:
+        archive = TelemetryArchive(root)
+        t = time.perf_counter()
+        write_archive(archive, unit_ids, args.days, args.rate, start)
+        write_s = time.perf_counter() - t
+        n_samples = archive.samples_written
+        print(f"units={args.units} days={args.days} rate={args.rate}/s")
+        print(f"archive           : {n_samples:,} samples, {n_samples * 16 / 1e9:.2f} GB, "
+              f"written in {write_s:.1f}s ({n_samples / write_s:,.0f} samples/s)")
+
+        rng = np.random.default_rng(1)
+        print(f"{'span':<11} {'rows/query':>12} {'query (views)':>14} {'+ columns()':>12} {'naive load':>12}")
+        for label, span in SPANS.items():
+            span = end - start if span is None else min(span, end - start)
+            timings = {'query': [], 'columns': [], 'naive': []}
+            rows = 0
+            for _ in range(args.queries):
+                unit_id = unit_ids[rng.integers(len(unit_ids))]
+                t0 = rng.uniform(start, end - span)
+                t = time.perf_counter()
+                result = archive.query(unit_id, t0, t0 + span)
+                timings['query'].append(time.perf_counter() - t)
+                t = time.perf_counter()
+                columns = result.columns()
+                timings['columns'].append(time.perf_counter() - t)
+                rows += len(columns[0])
+                if args.queries <= 10 or len(timings['naive']) < 10:
+                    t = time.perf_counter()
+                    naive = naive_query(archive, unit_id, t0, t0 + span)
+                    timings['naive'].append(time.perf_counter() - t)
+                    assert len(naive[0]) == len(columns[0])
+            ms = {k: np.median(v) * 1000 for k, v in timings.items()}
+            print(f"{label:<11} {rows // args.queries:>12,} {ms['query']:>11.2f} ms {ms['columns']:>9.2f} ms "
+                  f"{ms['naive']:>9.2f} ms")
+    finally:
+        if args.dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark: fleet-wide batch anomaly scoring throughput vs worker count.
+
+Builds synthetic 500-sample telemetry windows for --units units and runs
+score_fleet() with 1..N worker processes (N = CPU count by default),
+reporting units scored per second.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py
+    python benchmarks/bench_batch_scoring.py --units 2000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kaeser.batch import score_fleet  # noqa: E402
+from kaeser.fleet import make_unit_ids  # noqa: E402
+from kaeser.sensors import simulate_readings  # noqa: E402
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--units', type=int, default=500)
+    parser.add_argument('--window', type=int, default=500)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1))))
+    parser.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args()
+
+    windows = {
+        unit_id: simulate_readings(unit_id, n=args.window, anomaly_rate=0.05 + 0.2 * (i % 5) / 5).to_numpy()
+        for i, unit_id in enumerate(make_unit_ids(1, args.units + 1))
+    }
+
+    print(f"units={args.units} window={args.window} cpu_count={cpu_count}")
+    print(f"{'workers':>8} {'seconds':>9} {'units/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        t0 = time.perf_counter()
+        score_fleet(windows, max_workers=workers, chunksize=args.chunksize)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {args.units / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
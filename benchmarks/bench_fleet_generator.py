@@ -0,0 +1,115 @@
+"""Benchmark: vectorized generate_fleet() vs the original per-unit loop.
+
+Usage:
+    python benchmarks/bench_fleet_generator.py
+    python benchmarks/bench_fleet_generator.py --sizes 1000 50000 500000 --repeat 3
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kaeser.fleet import generate_fleet  # noqa: E402
+
+
+def legacy_load_enterprise_data(n_units):
+    # Copy of the original loop-based load_enterprise_data() body
+    base_scores = []
+    age_penalties = []
+    usage_penalties = []
+    maintenance_penalties = []
+
+    for i in range(n_units):
+        days_since_service = np.random.randint(10, 200)
+        age_penalty = min(40, (days_since_service / 365) * 40)
+        usage_penalty = np.random.randint(0, 20)
+        maintenance_penalty = np.random.randint(0, 15)
+        total_penalty = age_penalty + usage_penalty + maintenance_penalty
+        health_score = max(40, 100 - total_penalty)
+        base_scores.append(int(health_score))
+        age_penalties.append(round(age_penalty, 1))
+        usage_penalties.append(usage_penalty)
+        maintenance_penalties.append(maintenance_penalty)
+
+    statuses = []
+    for score in base_scores:
+        if score < 60:
+            statuses.append('Critical')
+        elif score < 85:
+            statuses.append('Warning')
+        else:
+            statuses.append('Healthy')
+
+    locations = np.random.choice(
+        ['Jakarta', 'Surabaya', 'Bandung', 'Semarang', 'Medan', 'Makassar'],
+        n_units,
+        p=[0.35, 0.25, 0.15, 0.10, 0.10, 0.05]
+    )
+    lat_map = {
+        'Jakarta': -6.2, 'Surabaya': -7.25, 'Bandung': -6.9,
+        'Semarang': -6.99, 'Medan': 3.59, 'Makassar': -5.13
+    }
+    lon_map = {
+        'Jakarta': 106.8, 'Surabaya': 112.75, 'Bandung': 107.6,
+        'Semarang': 110.42, 'Medan': 98.67, 'Makassar': 119.4
+    }
+    lats = [lat_map[loc] + np.random.uniform(-0.1, 0.1) for loc in locations]
+    lons = [lon_map[loc] + np.random.uniform(-0.1, 0.1) for loc in locations]
+
+    operational_hours = np.random.uniform(8, 24, n_units).round(1)
+    power_consumption = np.random.uniform(50, 150, n_units).round(1)
+    daily_energy_cost = (operational_hours * power_consumption * 1500).round(0)
+
+    return pd.DataFrame({
+        'Unit_ID': [f'K-DX-{i:03}' for i in range(1, n_units + 1)],
+        'Lokasi': locations,
+        'Status': statuses,
+        'Health_Score': base_scores,
+        'Age_Penalty': age_penalties,
+        'Usage_Penalty': usage_penalties,
+        'Maintenance_Penalty': maintenance_penalties,
+        'Last_Service': [datetime.now() - timedelta(days=int(np.random.randint(10, 200))) for _ in range(n_units)],
+        'Next_Service_Due': [datetime.now() + timedelta(days=int(np.random.randint(30, 180))) for _ in range(n_units)],
+        'Operational_Hours_Daily': operational_hours,
+        'Power_Consumption_kW': power_consumption,
+        'Daily_Energy_Cost_Rp': daily_energy_cost,
+        'Latitude': lats,
+        'Longitude': lons,
+        'Installation_Date': [datetime.now() - timedelta(days=int(np.random.randint(365, 1825))) for _ in range(n_units)]
+    })
+
+
+def best_of(fn, n_units, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(n_units)
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 1000, 50000, 100000, 500000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-legacy', type=int, default=100000,
+                        help='skip the legacy loop above this fleet size')
+    args = parser.parse_args()
+
+    print(f"{'n_units':>10} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for n_units in args.sizes:
+        vec = best_of(lambda n: generate_fleet(n, seed=42), n_units, args.repeat)
+        if n_units <= args.max_legacy:
+            legacy = best_of(legacy_load_enterprise_data, n_units, args.repeat)
+            print(f"{n_units:>10} {legacy:>12.4f} {vec:>15.4f} {legacy / vec:>8.1f}x")
+        else:
+            print(f"{n_units:>10} {'skipped':>12} {vec:>15.4f} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Benchmark: every dashboard page at several fleet sizes, against a stored baseline.
+
+For each fleet size a fresh data directory is seeded once (one headless run
+of ml_anomaly.py). Then every menu page runs in its own Python process,
+with the page preselected through ``session_state`` so that no other page
+renders first, using streamlit.testing.v1.AppTest. Each page records:
+
+- wall time of the first run (shared resources loaded from the seeded
+  data directory),
+- the page's own render time (the ``page`` span from kaeser.metrics),
+- wall time of a second, warm run,
+- IsolationForest fit time (``model_fit`` spans),
+- peak RSS of the process.
+
+Results are written as JSON. With an existing baseline file, pages that
+got slower or bigger than ``--threshold`` (and by more than a small
+absolute margin) are flagged and the exit status is 1; ``--save`` makes
+this run the new baseline.
+
+The 1-minute power history of the energy model is units x days x 5.8 KB,
+so the energy history defaults to 2 days here (KAESER_ENERGY_HISTORY_DAYS).
+Telemetry ring buffers take 16 bytes x KAESER_TELEMETRY_CAPACITY per unit
+(about 3.3 GB at 100k units with the default 2048); other settings can be
+passed with ``--env``.
+
+Usage:
+    python benchmarks/bench_pages.py --sizes 20 1000                 # compare against the baseline
+    python benchmarks/bench_pages.py --save                          # record a new baseline
+    python benchmarks/bench_pages.py --sizes 100000 --env KAESER_TELEMETRY_CAPACITY=256
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_DIR, 'benchmarks', 'baseline_pages.json')
+DEFAULT_SIZES = [20, 1000, 10000, 100000]
+MIN_SECONDS_DELTA = 0.05              # timing changes below this are noise
+MIN_RSS_DELTA = 16 * 1024 * 1024      # so are RSS changes below 16 MB
+
+CHILD = r'''
+import json, os, sys, time
+sys.path.insert(0, sys.argv[1])
+from streamlit.testing.v1 import AppTest
+from kaeser.metrics import metrics, peak_rss
+from kaeser.views import PAGES
+
+def span_total(name):
+    return sum(s['total_s'] for s in metrics.snapshot()['spans'] if s['name'] == name)
+
+at = AppTest.from_file(os.path.join(sys.argv[1], 'ml_anomaly.py'), default_timeout=float(sys.argv[3]))
+if sys.argv[2]:
+    at.session_state['nav_menu'] = next(label for label, module in PAGES.items() if module.endswith('.' + sys.argv[2]))
+t = time.perf_counter()
+at.run()
+first = time.perf_counter() - t
+page, fit = span_total('page'), span_total('model_fit')
+t = time.perf_counter()
+at.run()
+warm = time.perf_counter() - t
+print(json.dumps({
+    'first_run_s': first,
+    'page_s': page,
+    'warm_run_s': warm,
+    'fit_s': fit,
+    'peak_rss_bytes': peak_rss(),
+    'errors': [str(e.value) for e in at.exception],
+}), flush=True)
+os._exit(0)  # do not wait for background scoring / ingest threads
+'''
+
+
+def page_names():
+    sys.path.insert(0, REPO_DIR)
+    from kaeser.views import PAGES
+    return [module.rsplit('.', 1)[-1] for module in PAGES.values()]
+
+
+def run_child(page, env, timeout):
+    out = subprocess.run([sys.executable, '-c', CHILD, REPO_DIR, page, str(timeout)],
+                         cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=timeout * 3)
+    lines = out.stdout.strip().splitlines()
+    if out.returncode != 0 or not lines:
+        return {'errors': [out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f'exit {out.returncode}']}
+    return json.loads(lines[-1])
+
+
+def measure(sizes, pages, energy_days, feed_hz, timeout, extra_env):
+    results = {}
+    for size in sizes:
+        results[str(size)] = {}
+        with tempfile.TemporaryDirectory(prefix='kaeser-bench-') as data_dir:
+            env = dict(os.environ, KAESER_DATA_DIR=data_dir, KAESER_FLEET_SIZE=str(size),
+                       KAESER_ENERGY_HISTORY_DAYS=str(energy_days), KAESER_SIMULATED_FEED_HZ=str(feed_hz),
+                       KAESER_METRICS_PORT='0', PYTHONDONTWRITEBYTECODE='1')
+            env.update(extra_env)
+            seed = run_child('', env, timeout)  # seeds the fleet database
+            if 'first_run_s' in seed:
+                print(f"{size:>8,} {'(seed)':<16} {seed['first_run_s']:>9.2f}", flush=True)
+            for error in seed.get('errors', []):
+                print(f"  {size:>7,} seed error: {error}")
+            for page in pages:
+                sample = run_child(page, env, timeout)
+                results[str(size)][page] = sample
+                print(format_row(size, page, sample), flush=True)
+    return results
+
+
+def format_row(size, page, sample):
+    if 'first_run_s' not in sample:
+        return f"{size:>8,} {page:<16} error: {'; '.join(sample['errors'])}"
+    row = (f"{size:>8,} {page:<16} {sample['first_run_s']:>9.2f} {sample['page_s']:>9.2f} "
+           f"{sample['warm_run_s']:>9.2f} {sample['fit_s']:>8.2f} {(sample['peak_rss_bytes'] or 0) / 2**20:>9,.0f}")
+    if sample['errors']:
+        row += f"  error: {sample['errors'][0]}"
+    return row
+
+
+def regressions(results, baseline, threshold):
+    """(size, page, metric, old, new) for every metric that got worse than the baseline allows."""
+    found = []
+    checks = [('first_run_s', MIN_SECONDS_DELTA), ('page_s', MIN_SECONDS_DELTA), ('warm_run_s', MIN_SECONDS_DELTA),
+              ('fit_s', MIN_SECONDS_DELTA), ('peak_rss_bytes', MIN_RSS_DELTA)]
+    for size, pages in results.items():
+        for page, sample in pages.items():
+            old = baseline.get('results', {}).get(size, {}).get(page)
+            if not old or 'first_run_s' not in old:
+                continue
+            if 'first_run_s' not in sample or (sample['errors'] and not old['errors']):
+                found.append((size, page, 'errors', '-', '; '.join(sample['errors'])))
+                continue
+            for metric, min_delta in checks:
+                before, after = old.get(metric) or 0, sample.get(metric) or 0
+                if after > before * (1 + threshold) and after - before > min_delta:
+                    found.append((size, page, metric, before, after))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--pages', nargs='+', default=None, help='page modules (default: every menu page)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--output', default=None, help='also write this run to a JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown / growth')
+    parser.add_argument('--energy-days', type=int, default=2)
+    parser.add_argument('--feed-hz', type=float, default=1.0)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--env', nargs='+', default=[], metavar='KEY=VALUE', help='extra app settings')
+    args = parser.parse_args()
+    extra_env = dict(item.split('=', 1) for item in args.env)
+
+    pages = args.pages or page_names()
+    print(f"{'units':>8} {'page':<16} {'first (s)':>9} {'page (s)':>9} {'warm (s)':>9} {'fit (s)':>8} {'peak MB':>9}", flush=True)
+    results = measure(args.sizes, pages, args.energy_days, args.feed_hz, args.timeout, extra_env)
+    run = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'commit': subprocess.run(['git', '-C', REPO_DIR, 'rev-parse', '--short', 'HEAD'],
+                                     capture_output=True, text=True).stdout.strip(),
+            'energy_days': args.energy_days,
+            'feed_hz': args.feed_hz,
+            'env': extra_env,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(run, fh, indent=2)
+
+    status = 0
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        found = regressions(results, baseline, args.threshold)
+        print(f"\nvs baseline {baseline['meta'].get('commit', '?')} (threshold {args.threshold:.0%}):")
+        for size, page, metric, before, after in found:
+            if metric == 'peak_rss_bytes':
+                before, after = f'{before / 2**20:,.0f} MB', f'{after / 2**20:,.0f} MB'
+            elif metric != 'errors':
+                before, after = f'{before:.2f}s', f'{after:.2f}s'
+            print(f"  REGRESSION {int(size):>8,} {page:<16} {metric:<15} {before} -> {after}")
+        if not found:
+            print("  no regressions")
+        status = 1 if found else 0
+    if args.save or not os.path.exists(args.baseline):
+        # Merge so a partial run (some sizes / pages) keeps the rest of the baseline
+        baseline = {'results': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        for size, pages_ in results.items():
+            baseline['results'].setdefault(size, {}).update(pages_)
+        baseline['meta'] = run['meta']
+        with open(args.baseline, 'w') as fh:
+            json.dump(baseline, fh, indent=2)
+        print(f"\nbaseline written to {os.path.relpath(args.baseline, REPO_DIR)}")
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
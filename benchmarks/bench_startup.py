@@ -0,0 +1,92 @@
+"""Benchmark: cold launch to first render of ml_anomaly.py.
+
+Each sample starts a fresh Python process (so no module is cached), runs the
+app once headless with streamlit.testing.v1.AppTest on the default page and
+reports the wall time from process start to the end of the first run, plus
+which heavy modules were imported. Every sample uses an empty data directory.
+
+Compare two trees by passing git refs; a ref is exported with ``git archive``
+into a temporary directory, and WORKTREE means the files on disk.
+
+Usage:
+    python benchmarks/bench_startup.py                      # baseline commit vs working tree
+    python benchmarks/bench_startup.py --refs HEAD~1 WORKTREE --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['sklearn', 'matplotlib', 'seaborn']
+
+CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+elapsed = time.perf_counter() - t0
+print(json.dumps({
+    'seconds': elapsed,
+    'errors': [str(e.value) for e in at.exception],
+    'imported': [m for m in sys.argv[2].split(',') if m in sys.modules],
+}))
+'''
+
+
+def export_tree(ref, dest):
+    archive = os.path.join(dest, 'tree.tar')
+    subprocess.run(['git', '-C', REPO_DIR, 'archive', '--format=tar', '-o', archive, ref], check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def measure(app_dir, runs, fleet_size):
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as data_dir:
+            env = dict(os.environ, KAESER_DATA_DIR=data_dir, KAESER_FLEET_SIZE=str(fleet_size),
+                       PYTHONDONTWRITEBYTECODE='1')
+            out = subprocess.run(
+                [sys.executable, '-c', CHILD, os.path.join(app_dir, 'ml_anomaly.py'), ','.join(HEAVY_MODULES)],
+                cwd=app_dir, env=env, capture_output=True, text=True, check=True
+            )
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--refs', nargs='+', default=['baseline', 'WORKTREE'],
+                        help="git refs to compare; 'baseline' is the first commit, WORKTREE the files on disk")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--fleet-size', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'tree':<12} {'median (s)':>11} {'min (s)':>8}  heavy modules at first render")
+    for ref in args.refs:
+        with tempfile.TemporaryDirectory() as tmp:
+            if ref == 'WORKTREE':
+                app_dir = REPO_DIR
+            else:
+                if ref == 'baseline':
+                    ref = subprocess.run(['git', '-C', REPO_DIR, 'rev-list', '--max-parents=0', 'HEAD'],
+                                         capture_output=True, text=True, check=True).stdout.split()[0]
+                app_dir = export_tree(ref, tmp)
+            samples = measure(app_dir, args.runs, args.fleet_size)
+        seconds = [s['seconds'] for s in samples]
+        errors = sorted({e for s in samples for e in s['errors']})
+        label = ref[:12]
+        print(f"{label:<12} {statistics.median(seconds):>11.2f} {min(seconds):>8.2f}  {', '.join(samples[-1]['imported']) or '-'}")
+        for error in errors:
+            print(f"    error: {error}")
+
+
+if __name__ == '__main__':
+    main()
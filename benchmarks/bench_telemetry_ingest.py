@@ -0,0 +1,61 @@
+"""Benchmark: TelemetryHub ingestion throughput and producer-side latency.
+
+A producer thread submits fleet-wide batches as fast as the hub accepts them
+for --seconds. Reports samples appended per second and how long submit()
+takes on the calling thread (what the Streamlit script would pay).
+
+Usage:
+    python benchmarks/bench_telemetry_ingest.py
+    python benchmarks/bench_telemetry_ingest.py --units 10000 --batch 20000 --seconds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from kaeser.fleet import make_unit_ids  # noqa: E402
+from kaeser.telemetry import TelemetryHub  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--units', type=int, default=1000)
+    parser.add_argument('--batch', type=int, default=5000, help='samples per submit() call')
+    parser.add_argument('--seconds', type=float, default=3.0)
+    parser.add_argument('--capacity', type=int, default=2048)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    unit_ids = make_unit_ids(1, args.units + 1).astype(object)
+    hub = TelemetryHub(capacity=args.capacity)
+
+    submit_times = []
+    submitted = 0
+    t_start = time.perf_counter()
+    while time.perf_counter() - t_start < args.seconds:
+        ids = unit_ids[rng.integers(0, args.units, args.batch)]
+        ts = time.time() + np.arange(args.batch) * 1e-6
+        t0 = time.perf_counter()
+        accepted = hub.submit(ids, ts, rng.normal(70, 2, args.batch), rng.normal(7, 0.3, args.batch), block=True)
+        submit_times.append(time.perf_counter() - t0)
+        submitted += args.batch if accepted else 0
+    hub.wait_idle(timeout=60)
+    elapsed = time.perf_counter() - t_start
+
+    stats = hub.stats()
+    hub.stop()
+    submit_ms = np.array(submit_times) * 1000
+    print(f"units={args.units} batch={args.batch} capacity={args.capacity}")
+    print(f"samples submitted : {submitted:,}")
+    print(f"samples appended  : {stats['samples_ingested']:,}")
+    print(f"throughput        : {stats['samples_ingested'] / elapsed:,.0f} samples/s")
+    print(f"submit() latency  : p50 {np.percentile(submit_ms, 50):.3f} ms, p99 {np.percentile(submit_ms, 99):.3f} ms")
+    print(f"batches dropped   : {stats['batches_dropped']}")
+    print(f"ring buffer memory: {args.units * args.capacity * 16 / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Support modules for the Kaeser Smart-Enterprise AI dashboard (ml_anomaly.py)."""
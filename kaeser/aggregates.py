@@ -0,0 +1,136 @@
+"""Materialized fleet KPIs maintained off the Streamlit request path.
+
+A background thread follows the fleet store's change log and updates running
+counters for only the units that changed (subtract the old contribution, add
+the new one). Pages read the latest immutable ``FleetKPIs`` snapshot in O(1)
+instead of scanning the fleet on every rerun.
+"""
+import logging
+import threading
+from collections import Counter, namedtuple
+
+import pandas as pd
+
+STATUSES = ['Critical', 'Healthy', 'Warning']
+ONLINE_THRESHOLD = 50  # Health_Score above this counts as online
+
+FleetKPIs = namedtuple('FleetKPIs', [
+    'revision',
+    'total_units',
+    'avg_health',
+    'online_units',
+    'daily_energy_cost',
+    'monthly_energy_cost',
+    'status_counts',        # {Status: count}
+    'status_by_location',   # DataFrame, index Lokasi, columns Status
+])
+
+
+class FleetAggregates:
+    def __init__(self, store, interval=1.0):
+        self.store = store
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()            # guards the published snapshot
+        self._update_lock = threading.RLock()    # serializes counter updates
+
+        self._units = {}  # Unit_ID -> (Lokasi, Status, Health_Score, Daily_Energy_Cost_Rp)
+        self._revision = -1
+        self._rebuild()
+
+        store.subscribe(self._wake.set)
+        self._thread = threading.Thread(target=self._loop, name='fleet-aggregates', daemon=True)
+        self._thread.start()
+
+    # --- MAINTENANCE (background thread) ---
+    def _contribution(self, row):
+        return (row.Lokasi, row.Status, row.Health_Score, row.Daily_Energy_Cost_Rp)
+
+    def _rebuild(self):
+        # Revision first: edits racing with the read are re-applied by the next refresh
+        revision = self.store.revision()
+        fleet = self.store.snapshot()
+        self._units = {
+            row.Unit_ID: self._contribution(row)
+            for row in fleet[['Unit_ID', 'Lokasi', 'Status', 'Health_Score', 'Daily_Energy_Cost_Rp']].itertuples(index=False)
+        }
+        self._by_loc_status = Counter((loc, status) for loc, status, _, _ in self._units.values())
+        self._health_sum = float(fleet['Health_Score'].sum())
+        self._energy_sum = float(fleet['Daily_Energy_Cost_Rp'].sum())
+        self._online = int((fleet['Health_Score'] > ONLINE_THRESHOLD).sum())
+        self._revision = revision
+        self._publish()
+
+    def _apply(self, unit_id, new):
+        old = self._units.pop(unit_id, None)
+        for sign, item in ((-1, old), (1, new)):
+            if item is None:
+                continue
+            loc, status, health, energy = item
+            self._by_loc_status[(loc, status)] += sign
+            self._health_sum += sign * health
+            self._energy_sum += sign * energy
+            self._online += sign * (health > ONLINE_THRESHOLD)
+        if new is not None:
+            self._units[unit_id] = new
+
+    def refresh(self):
+        """Fold store edits since the last refresh into the counters.
+
+        Runs on the background thread; writers may also call it directly to
+        read their own edit on the very next rerun.
+        """
+        with self._update_lock:
+            revision, changed, rows = self.store.changes_since(self._revision)
+            if revision == self._revision:
+                return
+            if changed is None:
+                self._rebuild()
+                return
+            current = {row.Unit_ID: self._contribution(row) for row in rows.itertuples(index=False)}
+            for unit_id in changed:
+                self._apply(unit_id, current.get(unit_id))
+            self._revision = revision
+            self._publish()
+
+    def _publish(self):
+        total = len(self._units)
+        counts = {key: n for key, n in self._by_loc_status.items() if n > 0}
+        by_location = pd.Series(counts, dtype='int64')
+        if len(by_location):
+            by_location = by_location.unstack().fillna(0).astype(int)
+        else:
+            by_location = pd.DataFrame(columns=STATUSES, dtype='int64')
+        status_counts = {status: int(by_location[status].sum()) if status in by_location else 0 for status in STATUSES}
+        snapshot = FleetKPIs(
+            revision=self._revision,
+            total_units=total,
+            avg_health=self._health_sum / total if total else 0.0,
+            online_units=int(self._online),
+            daily_energy_cost=self._energy_sum,
+            monthly_energy_cost=self._energy_sum * 30,
+            status_counts=status_counts,
+            status_by_location=by_location,
+        )
+        with self._lock:
+            self._snapshot = snapshot
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception:
+                # Never let a transient read error kill the worker; next tick retries
+                logging.getLogger(__name__).exception('Fleet aggregate refresh failed')
+
+    # --- READS (any thread) ---
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
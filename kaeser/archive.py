@@ -0,0 +1,238 @@
+"""On-disk columnar archive of historical telemetry.
+
+Layout: ``<root>/<unit>/<YYYY-MM-DD>/{ts.f64,suhu.f32,tekanan.f32}``. Each
+column is a raw little-endian array, so a partition is opened with
+``np.memmap`` without parsing, and appending is a plain file append. Rows
+inside a partition are kept sorted by timestamp (epoch seconds, UTC day
+partitions), which is the time index: a ``(unit, t0, t1)`` range query
+binary-searches the two boundary partitions and returns memmap views of
+every partition in between, without copying or loading anything else.
+
+Writes are buffered in memory and flushed in batches (``flush``), so the
+ingest thread does a few large appends instead of one per sample. With
+``retention_days`` the flush also drops partitions older than that, at most
+once every ``prune_interval`` seconds.
+"""
+import os
+import shutil
+import threading
+import time
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+SECONDS_PER_DAY = 86400
+COLUMNS = (('ts', np.float64), ('suhu', np.float32), ('tekanan', np.float32))
+
+
+def day_number(ts):
+    return np.floor(np.asarray(ts, dtype=np.float64) / SECONDS_PER_DAY).astype(np.int64)
+
+
+def day_name(day):
+    return str(np.datetime64(int(day), 'D'))
+
+
+class ArchiveRange:
+    """Result of a range query: per-partition (ts, suhu, tekanan) memmap views."""
+
+    def __init__(self, unit_id, chunks):
+        self.unit_id = unit_id
+        self.chunks = chunks
+
+    def __len__(self):
+        return sum(len(ts) for ts, _, _ in self.chunks)
+
+    def columns(self, step=1):
+        """Concatenated (ts, suhu, tekanan) arrays, every ``step``-th sample (copies)."""
+        if not self.chunks:
+            return np.empty(0), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        # Offsets keep the stride continuous across partition boundaries
+        parts, offset = [], 0
+        for ts, suhu, tekanan in self.chunks:
+            start = (-offset) % step
+            parts.append((ts[start::step], suhu[start::step], tekanan[start::step]))
+            offset += len(ts)
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+    def to_frame(self, max_points=None):
+        """DataFrame (Timestamp, Suhu, Tekanan), strided down to about ``max_points`` rows."""
+        step = 1 if not max_points else max(1, -(-len(self) // max_points))
+        ts, suhu, tekanan = self.columns(step)
+        return pd.DataFrame({
+            'Timestamp': pd.to_datetime(ts, unit='s'),
+            'Suhu': suhu.astype(float),
+            'Tekanan': tekanan.astype(float)
+        })
+
+
+class TelemetryArchive:
+    def __init__(self, root, flush_interval=5.0, retention_days=None, prune_interval=3600.0):
+        self.root = root
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.prune_interval = prune_interval
+        self._pending = {}    # unit_id -> list of (ts, suhu, tekanan) batches
+        self._lock = threading.Lock()        # guards _pending
+        self._write_lock = threading.Lock()  # one flush / prune at a time
+        self._swap_lock = threading.Lock()   # partition rewrites vs. opening a partition
+        self._last_flush = time.time()
+        self._last_prune = 0.0
+        self.samples_written = 0
+        self.partitions_pruned = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _unit_dir(self, unit_id):
+        return os.path.join(self.root, quote(str(unit_id), safe=''))
+
+    def _partition_dir(self, unit_id, day):
+        return os.path.join(self._unit_dir(unit_id), day_name(day))
+
+    # --- WRITES ---
+    def append(self, unit_id, ts, suhu, tekanan):
+        """Buffer samples for ``unit_id``; they reach disk on the next ``flush``."""
+        with self._lock:
+            self._pending.setdefault(unit_id, []).append((
+                np.asarray(ts, dtype=np.float64), np.asarray(suhu, dtype=np.float32),
+                np.asarray(tekanan, dtype=np.float32)))
+
+    def flush_due(self):
+        return time.time() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.time()
+        with self._write_lock:
+            for unit_id, batches in pending.items():
+                ts, suhu, tekanan = (np.concatenate(column) for column in zip(*batches))
+                order = np.argsort(ts, kind='stable')
+                ts, suhu, tekanan = ts[order], suhu[order], tekanan[order]
+                days = day_number(ts)
+                bounds = np.flatnonzero(np.diff(days)) + 1
+                for sel in np.split(np.arange(len(ts)), bounds):
+                    if len(sel):
+                        self._write_partition(unit_id, days[sel[0]], ts[sel], suhu[sel], tekanan[sel])
+                self.samples_written += len(ts)
+        if self.retention_days and time.time() - self._last_prune >= self.prune_interval:
+            self._last_prune = time.time()
+            self.prune(pd.Timestamp.now() - pd.Timedelta(days=self.retention_days))
+
+    def _write_partition(self, unit_id, day, ts, suhu, tekanan):
+        path = self._partition_dir(unit_id, day)
+        os.makedirs(path, exist_ok=True)
+        existing = self._open_partition(path)
+        if existing is not None and len(existing[0]) and existing[0][-1] > ts[0]:
+            # Late samples: merge and rewrite the partition to keep it sorted
+            merged = [np.concatenate([np.asarray(old), new]) for old, new in zip(existing, (ts, suhu, tekanan))]
+            del existing
+            order = np.argsort(merged[0], kind='stable')
+            for (name, dtype), column in zip(COLUMNS, merged):
+                column[order].astype(dtype).tofile(os.path.join(path, name + '.tmp'))
+            # Swap all columns together: readers open a partition under the same
+            # lock, so they never pair a rewritten column with an old one
+            with self._swap_lock:
+                for name, dtype in COLUMNS:
+                    os.replace(os.path.join(path, name + '.tmp'), os.path.join(path, name + _suffix(dtype)))
+            return
+        for (name, dtype), column in zip(COLUMNS, (ts, suhu, tekanan)):
+            with open(os.path.join(path, name + _suffix(dtype)), 'ab') as fh:
+                fh.write(np.ascontiguousarray(column, dtype=dtype).tobytes())
+
+    def prune(self, before):
+        """Delete partitions for days before ``before`` (a Timestamp); returns how many."""
+        cutoff = day_name(day_number(pd.Timestamp(before).timestamp()))
+        removed = 0
+        with self._write_lock:
+            for unit_dir in os.listdir(self.root):
+                unit_path = os.path.join(self.root, unit_dir)
+                for name in os.listdir(unit_path):
+                    if name < cutoff:
+                        shutil.rmtree(os.path.join(unit_path, name), ignore_errors=True)
+                        removed += 1
+                if not os.listdir(unit_path):
+                    os.rmdir(unit_path)
+        self.partitions_pruned += removed
+        return removed
+
+    # --- READS ---
+    def _open_partition(self, path):
+        """Memmap views of one partition's columns, truncated to a common length."""
+        files = [os.path.join(path, name + _suffix(dtype)) for name, dtype in COLUMNS]
+        with self._swap_lock:
+            if not os.path.exists(files[0]):
+                return None
+            n = min(os.path.getsize(f) // np.dtype(dtype).itemsize if os.path.exists(f) else 0
+                    for f, (_, dtype) in zip(files, COLUMNS))
+            if n == 0:
+                return tuple(np.empty(0, dtype=dtype) for _, dtype in COLUMNS)
+            return tuple(np.memmap(f, dtype=dtype, mode='r', shape=(n,)) for f, (_, dtype) in zip(files, COLUMNS))
+
+    def units(self):
+        return sorted(unquote(name) for name in os.listdir(self.root))
+
+    def days(self, unit_id):
+        """Archived days of a unit as datetime64[D] values, oldest first."""
+        unit_dir = self._unit_dir(unit_id)
+        if not os.path.isdir(unit_dir):
+            return np.empty(0, dtype='datetime64[D]')
+        return np.array(sorted(os.listdir(unit_dir)), dtype='datetime64[D]')
+
+    def query(self, unit_id, t0, t1):
+        """Samples of ``unit_id`` with t0 <= ts < t1 (epoch seconds or Timestamps)."""
+        t0, t1 = _seconds(t0), _seconds(t1)
+        first, last = day_number(t0), day_number(t1)
+        chunks = []
+        for day in self.days(unit_id).astype(np.int64):
+            if day < first or day > last:
+                continue
+            columns = self._open_partition(self._partition_dir(unit_id, day))
+            if columns is None or not len(columns[0]):
+                continue
+            ts = columns[0]
+            lo = np.searchsorted(ts, t0, side='left') if day == first else 0
+            hi = np.searchsorted(ts, t1, side='left') if day == last else len(ts)
+            if hi > lo:
+                chunks.append(tuple(column[lo:hi] for column in columns))
+        return ArchiveRange(unit_id, chunks)
+
+    def latest(self, unit_id, n):
+        """The last ``n`` archived samples of a unit, newest partitions first."""
+        chunks, remaining = [], n
+        for day in self.days(unit_id).astype(np.int64)[::-1]:
+            columns = self._open_partition(self._partition_dir(unit_id, day))
+            if columns is None:
+                continue
+            take = min(remaining, len(columns[0]))
+            if take:
+                chunks.append(tuple(column[len(column) - take:] for column in columns))
+                remaining -= take
+            if remaining == 0:
+                break
+        return ArchiveRange(unit_id, chunks[::-1])
+
+    def daily_stats(self, unit_id, t0, t1):
+        """Per-day sample count and Suhu / Tekanan mean, min and max over a range."""
+        rows = []
+        for ts, suhu, tekanan in self.query(unit_id, t0, t1).chunks:
+            rows.append((pd.Timestamp(day_name(day_number(ts[0]))), len(ts),
+                         float(suhu.mean()), float(suhu.max()),
+                         float(tekanan.mean()), float(tekanan.min())))
+        return pd.DataFrame(rows, columns=['Date', 'Samples', 'Suhu_Mean', 'Suhu_Max', 'Tekanan_Mean', 'Tekanan_Min'])
+
+    def stats(self):
+        with self._lock:
+            pending = sum(len(b[0]) for batches in self._pending.values() for b in batches)
+        return {'units': len(os.listdir(self.root)), 'samples_written': self.samples_written, 'pending': pending,
+                'partitions_pruned': self.partitions_pruned}
+
+
+def _suffix(dtype):
+    return '.f64' if np.dtype(dtype) == np.float64 else '.f32'
+
+
+def _seconds(t):
+    if isinstance(t, (pd.Timestamp, np.datetime64, str)):
+        return pd.Timestamp(t).timestamp()
+    return float(t)
@@ -0,0 +1,161 @@
+"""Fleet-wide batch anomaly scoring.
+
+Every unit gets its own IsolationForest fitted on its telemetry window.
+Units are grouped into chunks and each chunk is one task for a
+ProcessPoolExecutor worker, which keeps inter-process traffic small.
+``FleetScoringJob`` keeps one pool for its lifetime, so the workers (and
+their sklearn import) are started once rather than on every pass.
+
+Because each model is fitted on its own unit's data, a contamination
+percentile would flag the same share of every unit. Units are therefore
+ranked by the share of samples scoring below the fixed IsolationForest
+threshold (``score_samples < -0.5``, the "auto" offset from the original
+paper), which is comparable across units.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from kaeser.metrics import metrics
+
+SCORE_THRESHOLD = -0.5
+MIN_SAMPLES = 50
+RESULT_COLUMNS = ['Unit_ID', 'Samples', 'Anomalies', 'Anomaly_Rate', 'Mean_Score', 'Min_Score']
+
+
+def _score_chunk(chunk, n_estimators, random_state, score_threshold):
+    # Imported here so that importing kaeser.batch stays cheap for the dashboard
+    from sklearn.ensemble import IsolationForest
+
+    rows = []
+    for unit_id, X in chunk:
+        if len(X) < MIN_SAMPLES:
+            rows.append((unit_id, len(X), 0, np.nan, np.nan, np.nan))
+            continue
+        model = IsolationForest(n_estimators=n_estimators, random_state=random_state)
+        scores = model.fit(X).score_samples(X)
+        anomalies = int((scores < score_threshold).sum())
+        rows.append((unit_id, len(X), anomalies, anomalies / len(X), scores.mean(), scores.min()))
+    return rows
+
+
+def make_pool(max_workers=None, mp_context='spawn'):
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1,
+                               mp_context=multiprocessing.get_context(mp_context))
+
+
+def score_fleet(windows, max_workers=None, chunksize=None, n_estimators=50,
+                random_state=42, score_threshold=SCORE_THRESHOLD, mp_context='spawn', pool=None):
+    """Score every unit in ``windows`` ({Unit_ID: (n_samples, n_features) array}).
+
+    Returns one row per unit, sorted by Anomaly_Rate (highest first). Units
+    with fewer than MIN_SAMPLES samples get NaN rates and sort last.
+    ``max_workers=1`` scores in-process without starting a pool. Chunks go
+    to ``pool`` when given (sized for ``max_workers``), otherwise to a pool
+    started for this call.
+    """
+    items = list(windows.items())
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, max(1, len(items)))
+    args = (n_estimators, random_state, score_threshold)
+
+    if max_workers == 1:
+        rows = _score_chunk(items, *args)
+    else:
+        # ~4 chunks per worker balances load without flooding the pool with tiny tasks
+        chunksize = chunksize or max(1, math.ceil(len(items) / (max_workers * 4)))
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        rows = []
+        own_pool = pool is None
+        pool = make_pool(max_workers, mp_context) if own_pool else pool
+        try:
+            futures = [pool.submit(_score_chunk, chunk, *args) for chunk in chunks]
+            for future in futures:
+                rows.extend(future.result())
+        finally:
+            if own_pool:
+                pool.shutdown()
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    return results.sort_values(['Anomaly_Rate', 'Min_Score'], ascending=[False, True],
+                               na_position='last').reset_index(drop=True)
+
+
+class FleetScoringJob:
+    """Runs ``score_fleet`` on a background thread and keeps the latest result.
+
+    ``latest()`` never blocks: it returns the most recent results (None until
+    the first pass finishes) and starts a new pass when they are older than
+    ``ttl`` seconds or the fleet revision changed. Passes start at most once
+    every ``min_interval`` seconds, so a stream of revision changes (the
+    health engine writes scores continuously) coalesces into one pass per
+    interval, and a failing pass is retried at the same pace.
+    """
+
+    def __init__(self, windows_source, ttl=60.0, min_interval=30.0, max_workers=None,
+                 mp_context='spawn', **score_kwargs):
+        self.windows_source = windows_source
+        self.ttl = ttl
+        self.min_interval = min_interval
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.score_kwargs = score_kwargs
+        self._lock = threading.Lock()
+        self._running = False
+        self._pool = None
+        self._results = None
+        self._computed_at = 0.0
+        self._started_at = 0.0
+        self._revision = None
+        self.passes = 0
+        self.failures = 0
+
+    def latest(self, revision=None):
+        with self._lock:
+            now = time.time()
+            stale = self._revision != revision or now - self._computed_at > self.ttl
+            if stale and not self._running and now - self._started_at >= self.min_interval:
+                self._running = True
+                self._started_at = now
+                threading.Thread(target=self._run, args=(revision,), name='fleet-scoring', daemon=True).start()
+            return self._results
+
+    def _run(self, revision):
+        try:
+            if self.max_workers > 1 and self._pool is None:
+                self._pool = make_pool(self.max_workers, self.mp_context)
+            with metrics.span('fleet_scoring'):
+                results = score_fleet(self.windows_source(), max_workers=self.max_workers, pool=self._pool,
+                                      **self.score_kwargs)
+            with self._lock:
+                self._results, self._computed_at, self._revision = results, time.time(), revision
+                self.passes += 1
+        except Exception as exc:
+            # Keep the previous results; the next latest() after min_interval retries
+            self.failures += 1
+            logging.getLogger(__name__).exception('Fleet scoring pass failed')
+            if isinstance(exc, BrokenProcessPool):
+                self._pool = None    # a worker died; start a fresh pool next pass
+        finally:
+            with self._lock:
+                self._running = False
+
+    def wait(self, timeout=None):
+        """Block until a pass has completed (scripts and benchmarks)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while self._results is None and (deadline is None or time.time() < deadline):
+            time.sleep(0.05)
+        return self._results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
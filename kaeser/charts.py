@@ -0,0 +1,123 @@
+"""Cached matplotlib rendering for the dashboard charts.
+
+``cached_chart`` draws a figure once per distinct input and keeps the
+encoded PNG/SVG bytes in a process-wide LRU cache, so reruns with unchanged
+data skip matplotlib entirely. Figures are built with the object-oriented
+``matplotlib.figure.Figure`` API (no pyplot global registry) and released
+as soon as they are encoded, so long sessions do not accumulate figures.
+
+For large series ``use_native`` tells pages to switch to Streamlit's native
+(Vega-Lite) charts instead; KAESER_CHART_BACKEND=matplotlib|native|auto
+overrides the choice.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+
+from kaeser.config import CHART_BACKEND
+from kaeser.metrics import metrics
+
+LARGE_SERIES = 5000  # points; above this "auto" uses native charts
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+def fingerprint(*parts):
+    """Stable digest of arrays, frames, series and plain values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+            digest.update(repr(list(part.columns) if isinstance(part, pd.DataFrame) else part.name).encode())
+        elif isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part).tobytes())
+            digest.update(repr((part.dtype.str, part.shape)).encode())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b'|')
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """LRU of encoded figure bytes under a byte budget."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = data
+            self.nbytes += len(data)
+            while self.nbytes > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'figures': len(self._items), 'nbytes': self.nbytes, 'hits': self.hits, 'misses': self.misses}
+
+
+figure_cache = FigureCache()
+metrics.add_collector('figure_cache', figure_cache.stats)
+
+
+def render_figure(draw, figsize=(10, 5), fmt='png', dpi=100):
+    """Draw ``draw(ax)`` on a fresh Figure and return the encoded bytes."""
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        draw(fig.add_subplot())
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def cached_chart(name, draw, *data, figsize=(10, 5), fmt='png'):
+    """Return image bytes for chart ``name`` drawn from ``data``.
+
+    ``data`` must contain everything the drawing depends on (arrays, frames,
+    labels, settings); it is hashed to form the cache key.
+    """
+    key = fingerprint(name, figsize, fmt, *data)
+    image = figure_cache.get(key)
+    if image is None:
+        with metrics.span('chart_render', chart=name):
+            image = render_figure(draw, figsize=figsize, fmt=fmt)
+        figure_cache.put(key, image)
+    return image
+
+
+def chart_key(name, *data, figsize=(10, 5), fmt='png'):
+    """Cache key ``cached_chart`` uses, for looking figures up later (reports)."""
+    return fingerprint(name, figsize, fmt, *data)
+
+
+def use_native(n_points):
+    if CHART_BACKEND == 'native':
+        return True
+    if CHART_BACKEND == 'matplotlib':
+        return False
+    return n_points > LARGE_SERIES
@@ -0,0 +1,36 @@
+"""Runtime settings, overridable through environment variables."""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where the fleet database and other on-disk state live
+DATA_DIR = os.environ.get('KAESER_DATA_DIR', os.path.join(ROOT_DIR, 'data'))
+
+# Number of synthetic units used to seed an empty fleet database
+FLEET_SIZE = int(os.environ.get('KAESER_FLEET_SIZE', '20'))
+
+# Memory budget for cached anomaly models (LRU eviction above this)
+MODEL_MEMORY_BUDGET_MB = int(os.environ.get('KAESER_MODEL_MEMORY_MB', '64'))
+
+# Telemetry ingestion: ring-buffer samples kept per unit, optional file drop
+# directory / TCP port, and the simulated feed rate (samples/s per unit, 0 = off)
+TELEMETRY_CAPACITY = int(os.environ.get('KAESER_TELEMETRY_CAPACITY', '2048'))
+TELEMETRY_DIR = os.environ.get('KAESER_TELEMETRY_DIR', '')
+TELEMETRY_PORT = int(os.environ.get('KAESER_TELEMETRY_PORT', '0'))
+SIMULATED_FEED_HZ = float(os.environ.get('KAESER_SIMULATED_FEED_HZ', '1'))
+
+# On-disk telemetry history (per unit, per day partitions); empty disables it
+ARCHIVE_DIR = os.environ.get('KAESER_ARCHIVE_DIR', os.path.join(DATA_DIR, 'archive'))
+
+# Days of archived telemetry kept; older day partitions are deleted (0 = keep all)
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('KAESER_ARCHIVE_RETENTION_DAYS', '30'))
+
+# Days of 1-minute power history kept per unit for the energy model
+ENERGY_HISTORY_DAYS = int(os.environ.get('KAESER_ENERGY_HISTORY_DAYS', '30'))
+
+# Chart rendering: "auto" draws cached matplotlib images and switches to native
+# Streamlit charts for large series; "matplotlib" / "native" force one backend
+CHART_BACKEND = os.environ.get('KAESER_CHART_BACKEND', 'auto')
+
+# Local HTTP port serving /metrics (Prometheus text) and /metrics.json (0 = off)
+METRICS_PORT = int(os.environ.get('KAESER_METRICS_PORT', '0'))
@@ -0,0 +1,191 @@
+"""Anomaly detector backends for the AI Diagnostic Laboratory.
+
+Every backend has ``fit(X)`` and ``score_samples(X)`` with the
+IsolationForest convention (higher = more normal), so the model registry
+caches any of them and ``predict_from_scores`` thresholds any of them at
+the AI sensitivity percentile.
+
+- ``IsolationForestDetector``: sklearn IsolationForest (the reference).
+- ``MiniBatchDetector``: running mean / variance merged batch by batch
+  (Chan et al.), scored by the largest per-feature z-score. Constant memory
+  per unit and ``partial_fit`` for streamed data.
+- ``RobustCovarianceDetector``: Minimum Covariance Determinant location and
+  covariance, scored by Mahalanobis distance. Catches correlated shifts
+  that no single feature shows.
+- ``ThresholdDetector``: per-feature bands around the median, scored by
+  the largest distance from the median in IQR units (robust to anomalies
+  in the training window); the sensitivity percentile sets the band
+  width. One vectorized comparison per sample.
+
+``evaluate_detectors`` fits every backend on labelled synthetic readings
+and reports latency, memory and recall / precision at a given
+contamination, so a site can pick the cheapest backend that meets its
+recall target (``pick_detector``).
+"""
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.covariance import MinCovDet
+from sklearn.ensemble import IsolationForest
+
+MIN_SCALE = 1e-9
+EVALUATION_COLUMNS = ['Detector', 'Fit_ms', 'Score_ms', 'Model_KB', 'Peak_Fit_KB', 'Recall', 'Precision',
+                      'Meets_Target']
+
+
+class IsolationForestDetector:
+    name = "Isolation Forest"
+
+    def __init__(self, random_state=42, n_estimators=100):
+        self.random_state = random_state
+        self.n_estimators = n_estimators
+        self.model = None
+
+    def fit(self, X):
+        self.model = IsolationForest(n_estimators=self.n_estimators, random_state=self.random_state).fit(X)
+        return self
+
+    def score_samples(self, X):
+        return self.model.score_samples(X)
+
+
+class MiniBatchDetector:
+    name = "Mini-batch streaming"
+
+    def __init__(self, random_state=42, batch_size=64):
+        self.batch_size = batch_size
+        self.count = 0
+        self.mean = None
+        self.m2 = None   # sum of squared deviations from the mean
+
+    def partial_fit(self, X):
+        """Merge one batch into the running mean / variance."""
+        X = np.asarray(X, dtype=float)
+        n = len(X)
+        if n == 0:
+            return self
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        if self.mean is None:
+            self.count, self.mean, self.m2 = n, batch_mean, batch_m2
+            return self
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        return self
+
+    def fit(self, X):
+        self.count, self.mean, self.m2 = 0, None, None
+        for start in range(0, len(X), self.batch_size):
+            self.partial_fit(X[start:start + self.batch_size])
+        return self
+
+    def score_samples(self, X):
+        std = np.sqrt(np.maximum(self.m2 / max(self.count, 1), MIN_SCALE))
+        return -np.abs((np.asarray(X, dtype=float) - self.mean) / std).max(axis=1)
+
+
+class RobustCovarianceDetector:
+    name = "Robust covariance (Mahalanobis)"
+
+    def __init__(self, random_state=42, support_fraction=None):
+        self.random_state = random_state
+        self.support_fraction = support_fraction
+        self.model = None
+        self.active = None
+
+    def fit(self, X):
+        X = np.asarray(X, dtype=float)
+        # Constant columns (fleet values in a single-unit window) make the covariance singular
+        self.active = X.std(axis=0) > MIN_SCALE
+        self.model = MinCovDet(support_fraction=self.support_fraction, random_state=self.random_state)
+        self.model.fit(X[:, self.active])
+        return self
+
+    def score_samples(self, X):
+        return -np.sqrt(self.model.mahalanobis(np.asarray(X, dtype=float)[:, self.active]))
+
+
+class ThresholdDetector:
+    name = "Threshold bands"
+
+    def __init__(self, random_state=42):
+        self.median = None
+        self.scale = None
+
+    def fit(self, X):
+        q1, self.median, q3 = np.quantile(np.asarray(X, dtype=float), [0.25, 0.5, 0.75], axis=0)
+        self.scale = np.maximum(q3 - q1, MIN_SCALE)
+        return self
+
+    def score_samples(self, X):
+        return -(np.abs(np.asarray(X, dtype=float) - self.median) / self.scale).max(axis=1)
+
+
+DETECTORS = {cls.name: cls for cls in (IsolationForestDetector, MiniBatchDetector, RobustCovarianceDetector,
+                                       ThresholdDetector)}
+DEFAULT_DETECTOR = IsolationForestDetector.name
+
+
+def make_detector(name, random_state=42):
+    return DETECTORS[name](random_state=random_state)
+
+
+def model_nbytes(detector):
+    """Serialized size of a fitted detector (what the model registry budgets)."""
+    return len(pickle.dumps(detector, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def recall_precision(predicted, labels):
+    """Recall and precision of boolean anomaly predictions against boolean labels."""
+    hits = np.count_nonzero(predicted & labels)
+    recall = hits / max(np.count_nonzero(labels), 1)
+    precision = hits / max(np.count_nonzero(predicted), 1)
+    return recall, precision
+
+
+def evaluate_detectors(X, labels, contamination, recall_target, names=None, random_state=42):
+    """Fit and score every backend on ``X`` and compare it with the anomaly ``labels``.
+
+    Points are flagged at the ``contamination`` percentile of each backend's
+    scores (as on the diagnostics page). Latencies are wall times of one fit
+    and one score pass; Peak_Fit_KB is the peak traced allocation during a
+    second, separately traced fit.
+    """
+    from kaeser.models import predict_from_scores
+
+    X = np.asarray(X, dtype=float)
+    labels = np.asarray(labels, dtype=bool)
+    rows = []
+    for name in names or DETECTORS:
+        detector = make_detector(name, random_state)
+        t0 = time.perf_counter()
+        detector.fit(X)
+        t1 = time.perf_counter()
+        scores = detector.score_samples(X)
+        t2 = time.perf_counter()
+
+        tracemalloc.start()
+        try:
+            make_detector(name, random_state).fit(X)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        recall, precision = recall_precision(predict_from_scores(scores, contamination) == -1, labels)
+        rows.append((name, (t1 - t0) * 1e3, (t2 - t1) * 1e3, model_nbytes(detector) / 1024, peak / 1024,
+                     recall, precision, recall >= recall_target))
+    return pd.DataFrame(rows, columns=EVALUATION_COLUMNS)
+
+
+def pick_detector(evaluation):
+    """Name of the fastest backend (fit + score) that meets the recall target, or None."""
+    passing = evaluation[evaluation['Meets_Target']]
+    if passing.empty:
+        return None
+    return passing.loc[(passing['Fit_ms'] + passing['Score_ms']).idxmin(), 'Detector']
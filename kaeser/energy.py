@@ -0,0 +1,277 @@
+"""Fleet energy model over 1-minute power history.
+
+Each unit's power draw is kept as one row of a float32 memory-mapped array
+(units x minutes) covering the last ``days`` complete days. The history is
+simulated from the unit's rated power, daily operating hours and a
+loaded/unloaded duty cycle, and rebuilt only when those inputs change.
+
+All reductions are reshapes of that array ((units, days, 24, 60)) done in
+unit blocks, so memory stays bounded however long the history is. Live
+telemetry enters as a per-unit load factor applied to the reduced per-unit
+profiles, which keeps the fleet numbers cheap to recompute on every rerun.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import ELECTRICITY_RATE
+
+MINUTES_PER_DAY = 1440
+CO2_KG_PER_KWH = 0.85         # grid emission factor
+WATER_L_PER_KWH = 1.5         # cooling-tower water a water-cooled compressor would use
+UNLOADED_SHARE = 0.25         # unloaded (idling) draw as a share of rated power
+LOADED_THRESHOLD = 0.5        # minutes above this share of rated power count as loaded
+NOMINAL_PRESSURE = 7.0        # bar; telemetry pressure scales load around this
+BLOCK_UNITS = 256             # units reduced per block
+OPTIMIZED_EFFICIENCY = 0.9    # optimized units draw 10% less power (Energy Savings Calculator)
+INPUT_COLUMNS = ['Unit_ID', 'Power_Consumption_kW', 'Operational_Hours_Daily']   # what the history depends on
+
+# Per-unit reductions of the minute history (computed once per history)
+UnitEnergy = namedtuple('UnitEnergy', [
+    'unit_ids',
+    'hourly_kw',      # (units, 24) average draw per hour of day
+    'daily_kwh',      # (units, days)
+    'loaded_kwh',     # (units,) energy while loaded
+    'idle_kwh',       # (units,) energy while running unloaded
+    'off_minutes',    # (units,) minutes switched off
+    'rated_kw',       # (units,)
+    'start',          # first day of the history (Timestamp)
+])
+
+# Annual savings over a grid of calculator inputs and over the fleet
+SavingsSweep = namedtuple('SavingsSweep', [
+    'hours', 'power_kw', 'rates',  # grid axes
+    'grid',                        # (hours, power, rates) annual savings of one unit
+    'fleet',                       # DataFrame: annual savings per rate (index) and region (+ Fleet)
+])
+
+FleetEnergy = namedtuple('FleetEnergy', [
+    'hourly_kw', 'peak_hour', 'peak_kw',
+    'daily_kwh',             # Series indexed by day
+    'monthly_kwh', 'loaded_kwh', 'idle_kwh', 'avoided_kwh',
+    'efficiency', 'co2_tons', 'co2_avoided_tons', 'water_saved_l',
+])
+
+
+_BUILD_LOCK = threading.Lock()
+
+
+class PowerHistory:
+    """Memory-mapped minute-level power history: one float32 row per unit."""
+
+    def __init__(self, path):
+        with open(path + '.json') as fh:
+            meta = json.load(fh)
+        self.path = path
+        self.key = meta['key']
+        self.unit_ids = meta['unit_ids']
+        self.rated_kw = np.asarray(meta['rated_kw'])
+        self.start = pd.Timestamp(meta['start'])
+        self.days = meta['days']
+        shape = (len(self.unit_ids), self.days * MINUTES_PER_DAY)
+        if self.unit_ids:
+            self.power = np.memmap(path, dtype=np.float32, mode='r', shape=shape)
+        else:
+            self.power = np.zeros(shape, dtype=np.float32)
+
+    @staticmethod
+    def history_key(fleet, days, end):
+        """Digest of the simulation inputs; independent of row order and of every other column."""
+        inputs = history_inputs(fleet)
+        digest = hashlib.blake2b(pd.util.hash_pandas_object(inputs, index=False).to_numpy().tobytes(), digest_size=16)
+        digest.update(f'{days}|{end}'.encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, path, fleet, days=30, end=None, seed=0):
+        """Open the history at ``path``, (re)simulating it if the fleet inputs changed."""
+        end = pd.Timestamp.now().normalize() if end is None else end
+        fleet = history_inputs(fleet)
+        key = cls.history_key(fleet, days, end)
+        # One build at a time per process; a waiting caller then reuses the new history
+        with _BUILD_LOCK:
+            if os.path.exists(path + '.json'):
+                try:
+                    history = cls(path)
+                except (OSError, ValueError):
+                    history = None    # data file and metadata disagree (e.g. another process mid-build)
+                if history is not None and history.key == key:
+                    return history
+                del history
+            return cls._simulate(path, fleet, days, end, seed, key)
+
+    @classmethod
+    def _simulate(cls, path, fleet, days, end, seed, key):
+        n_units = len(fleet)
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # Unique temp files: concurrent builds (two sessions or days) never share one
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+        os.close(fd)
+        try:
+            rated = cls._write_power(tmp, fleet, days, seed)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        if n_units:
+            os.replace(tmp, path)
+        else:
+            os.remove(tmp)
+        fd, meta_tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.json.tmp')
+        with os.fdopen(fd, 'w') as fh:
+            json.dump({'key': key, 'unit_ids': fleet['Unit_ID'].tolist(), 'rated_kw': rated.tolist(),
+                       'start': str(end - pd.Timedelta(days=days)), 'days': days}, fh)
+        os.replace(meta_tmp, path + '.json')
+        return cls(path)
+
+    @staticmethod
+    def _write_power(tmp, fleet, days, seed):
+        """Simulate the minute history into ``tmp``; returns the rated power per unit."""
+        n_units = len(fleet)
+        if n_units:
+            power = np.memmap(tmp, dtype=np.float32, mode='w+', shape=(n_units, days * MINUTES_PER_DAY))
+        rated = fleet['Power_Consumption_kW'].to_numpy(dtype=float)
+        hours = fleet['Operational_Hours_Daily'].to_numpy(dtype=float)
+        rng = np.random.default_rng(seed)
+        minute = np.arange(MINUTES_PER_DAY)
+        for u0 in range(0, n_units, BLOCK_UNITS):
+            u1 = min(u0 + BLOCK_UNITS, n_units)
+            b = u1 - u0
+            # Shift centered around early afternoon, wrapping past midnight
+            center = rng.normal(13 * 60, 90, b)
+            start = (center - hours[u0:u1] * 30) % MINUTES_PER_DAY
+            running = (minute[None, :] - start[:, None]) % MINUTES_PER_DAY < hours[u0:u1, None] * 60
+            duty = rng.uniform(0.6, 0.9, b)
+            loaded = rng.random((b, days, MINUTES_PER_DAY), dtype=np.float32) < duty[:, None, None]
+            draw = np.where(loaded, np.float32(1.0), np.float32(UNLOADED_SHARE)) * running[:, None, :]
+            draw *= (rated[u0:u1, None, None] * (1 + rng.normal(0, 0.03, (b, days, 1)))).astype(np.float32)
+            power[u0:u1] = draw.reshape(b, -1)
+        if n_units:
+            power.flush()
+            del power
+        return rated
+
+    def reduce(self):
+        """Per-unit hourly profile, daily energy and loaded/idle split (block-wise)."""
+        n_units = len(self.unit_ids)
+        hourly = np.zeros((n_units, 24))
+        daily = np.zeros((n_units, self.days))
+        loaded_kwh = np.zeros(n_units)
+        idle_kwh = np.zeros(n_units)
+        off_minutes = np.zeros(n_units, dtype=np.int64)
+        for u0 in range(0, n_units, BLOCK_UNITS):
+            u1 = min(u0 + BLOCK_UNITS, n_units)
+            block = np.asarray(self.power[u0:u1]).reshape(u1 - u0, self.days, 24, 60)
+            hourly[u0:u1] = block.mean(axis=(1, 3))
+            daily[u0:u1] = block.sum(axis=(2, 3), dtype=np.float64) / 60
+            flat = block.reshape(u1 - u0, -1)
+            is_loaded = flat > LOADED_THRESHOLD * self.rated_kw[u0:u1, None]
+            loaded_kwh[u0:u1] = np.where(is_loaded, flat, 0).sum(axis=1, dtype=np.float64) / 60
+            idle_kwh[u0:u1] = daily[u0:u1].sum(axis=1) - loaded_kwh[u0:u1]
+            off_minutes[u0:u1] = (flat == 0).sum(axis=1)
+        return UnitEnergy(self.unit_ids, hourly, daily, loaded_kwh, idle_kwh, off_minutes, self.rated_kw, self.start)
+
+
+def history_inputs(fleet):
+    """INPUT_COLUMNS of ``fleet`` sorted by Unit_ID.
+
+    Store snapshots move edited rows to the end, so the history is simulated
+    (and keyed) in Unit_ID order to stay the same across unrelated edits.
+    """
+    return fleet[INPUT_COLUMNS].sort_values('Unit_ID', kind='stable').reset_index(drop=True)
+
+
+def telemetry_load_factor(unit_ids, windows):
+    """Per-unit load factor from live telemetry: median pressure / nominal, clipped to +-20%.
+
+    Units without telemetry keep a factor of 1. Factors are rounded to 1% so
+    sample-to-sample noise does not invalidate cached charts.
+    """
+    factor = np.ones(len(unit_ids))
+    for i, unit_id in enumerate(unit_ids):
+        window = windows.get(unit_id)
+        if window is not None and len(window):
+            factor[i] = np.median(window[:, 1]) / NOMINAL_PRESSURE
+    return np.clip(factor, 0.8, 1.2).round(2)
+
+
+def fleet_energy(units, load_factor=None, unit_mask=None):
+    """Fleet totals from per-unit reductions (``units`` from ``PowerHistory.reduce``).
+
+    Daily and monthly figures are averages over the history. Avoided energy
+    is the unloaded draw a compressor without automatic shutdown would have
+    used while switched off.
+    """
+    n_days = units.daily_kwh.shape[1]
+    weight = np.ones(len(units.unit_ids)) if load_factor is None else np.asarray(load_factor, dtype=float)
+    if unit_mask is not None:
+        weight = weight * unit_mask
+
+    hourly_kw = weight @ units.hourly_kw
+    daily_kwh = weight @ units.daily_kwh
+    loaded_kwh = weight @ units.loaded_kwh / n_days
+    idle_kwh = weight @ units.idle_kwh / n_days
+    avoided_kwh = weight @ (units.off_minutes / 60 * UNLOADED_SHARE * units.rated_kw) / n_days
+    total_kwh = loaded_kwh + idle_kwh
+    monthly_kwh = total_kwh * 30
+    peak_hour = int(np.argmax(hourly_kw)) if len(hourly_kw) else 0
+
+    return FleetEnergy(
+        hourly_kw=hourly_kw,
+        peak_hour=peak_hour,
+        peak_kw=float(hourly_kw[peak_hour]),
+        daily_kwh=pd.Series(daily_kwh, index=pd.date_range(units.start, periods=n_days, freq='D'), name='kWh'),
+        monthly_kwh=monthly_kwh,
+        loaded_kwh=loaded_kwh * 30,
+        idle_kwh=idle_kwh * 30,
+        avoided_kwh=avoided_kwh * 30,
+        efficiency=100 * loaded_kwh / total_kwh if total_kwh else 0.0,
+        co2_tons=monthly_kwh * CO2_KG_PER_KWH / 1000,
+        co2_avoided_tons=avoided_kwh * 365 * CO2_KG_PER_KWH / 1000,
+        water_saved_l=monthly_kwh * WATER_L_PER_KWH,
+    )
+
+
+def hourly_cost(hourly_kw, rate=ELECTRICITY_RATE):
+    return np.asarray(hourly_kw) * rate
+
+
+def daily_savings(hours, power_kw, optimization_rate, rate=ELECTRICITY_RATE):
+    """Energy Savings Calculator formula; broadcasts over array inputs.
+
+    Optimized units run ``optimization_rate`` % fewer hours at
+    OPTIMIZED_EFFICIENCY of their current draw.
+    """
+    hours = np.asarray(hours, dtype=float)
+    current = hours * power_kw * rate
+    optimized = hours * (1 - np.asarray(optimization_rate, dtype=float) / 100) * power_kw * rate * OPTIMIZED_EFFICIENCY
+    return current - optimized
+
+
+def savings_sweep(hours, power_kw, rates, fleet=None):
+    """Annual savings over every (hours, power, rate) combination in one broadcast.
+
+    With ``fleet``, also each region's total annual savings at every rate,
+    applying the formula to each unit's own hours and power.
+    """
+    hours, power_kw, rates = (np.asarray(axis, dtype=float) for axis in (hours, power_kw, rates))
+    grid = daily_savings(hours[:, None, None], power_kw[None, :, None], rates[None, None, :]) * 360
+
+    by_region = pd.DataFrame(index=pd.Index(rates, name='Optimization_Rate'))
+    if fleet is not None and len(fleet):
+        # (units, rates) in one evaluation, then summed per region with one matrix product
+        unit_savings = daily_savings(fleet['Operational_Hours_Daily'].to_numpy(dtype=float)[:, None],
+                                     fleet['Power_Consumption_kW'].to_numpy(dtype=float)[:, None],
+                                     rates[None, :]) * 360
+        codes, regions = pd.factorize(fleet['Lokasi'], sort=True)
+        membership = np.zeros((len(regions), len(fleet)))
+        membership[codes, np.arange(len(fleet))] = 1.0
+        by_region = pd.DataFrame((membership @ unit_savings).T, index=by_region.index, columns=list(regions))
+        by_region['Fleet'] = unit_savings.sum(axis=0)
+    return SavingsSweep(hours, power_kw, rates, grid, by_region)
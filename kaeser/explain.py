@@ -0,0 +1,71 @@
+"""Per-point feature attributions for flagged anomalies.
+
+Occlusion: each feature of a point is replaced in turn by a baseline value
+(the window median) and the point is rescored. The attribution of the
+feature is how much more normal the point becomes:
+``score(x with feature j = baseline_j) - score(x)``. Because every
+backend in kaeser.detectors scores any matrix in one call, the n points x
+d features occluded copies are stacked into a single matrix and scored in
+a few large batches instead of point by point, which works the same for
+every backend.
+
+Attributions are kept per model version by the model registry (see
+``ModelRegistry.attributions``), so raising the sensitivity only explains
+the newly flagged points.
+"""
+import numpy as np
+import pandas as pd
+
+ATTRIBUTION_BATCH_ROWS = 50000   # occluded rows scored per score_samples call
+
+
+def occlusion_attributions(model, X, rows, scores, baseline=None, batch_rows=ATTRIBUTION_BATCH_ROWS):
+    """(len(rows), n_features) score change when each feature of ``X[rows]`` is set to ``baseline``.
+
+    ``scores`` are the model's scores for all of ``X``; ``baseline``
+    defaults to the median of ``X``.
+    """
+    X = np.asarray(X, dtype=float)
+    rows = np.asarray(rows, dtype=np.int64)
+    n, d = len(rows), X.shape[1]
+    if n == 0:
+        return np.zeros((0, d))
+    baseline = np.median(X, axis=0) if baseline is None else np.asarray(baseline, dtype=float)
+
+    # Row i * d + j of the stack is point i with feature j occluded
+    stacked = np.repeat(X[rows], d, axis=0)
+    stacked[np.arange(n * d), np.tile(np.arange(d), n)] = np.tile(baseline, n)
+    occluded = np.concatenate([model.score_samples(stacked[start:start + batch_rows])
+                               for start in range(0, len(stacked), batch_rows)])
+    return occluded.reshape(n, d) - np.asarray(scores, dtype=float)[rows, None]
+
+
+def attribution_shares(attributions):
+    """Attributions as each point's share per feature (negative contributions count as 0)."""
+    positive = np.maximum(attributions, 0.0)
+    total = positive.sum(axis=1, keepdims=True)
+    return np.divide(positive, total, out=np.zeros_like(positive), where=total > 0)
+
+
+def point_explanations(shares, features, index=None):
+    """One row per point: Top_Driver, Driver_Share and Second_Driver."""
+    features = np.asarray(features, dtype=object)
+    order = np.argsort(-shares, axis=1, kind='stable')
+    top = order[:, 0] if len(shares) else np.zeros(0, dtype=np.int64)
+    second = order[:, 1] if shares.shape[1] > 1 else top
+    return pd.DataFrame({
+        'Top_Driver': features[top],
+        'Driver_Share': shares[np.arange(len(shares)), top],
+        'Second_Driver': features[second],
+    }, index=index)
+
+
+def driver_summary(shares, features):
+    """Per feature: how many points it is the top driver of, and its mean share."""
+    top_counts = np.bincount(shares.argmax(axis=1), minlength=len(features)) if len(shares) else np.zeros(len(features))
+    summary = pd.DataFrame({
+        'Feature': list(features),
+        'Top_Driver_Points': top_counts.astype(int),
+        'Mean_Share': shares.mean(axis=0) if len(shares) else np.zeros(len(features)),
+    })
+    return summary.sort_values(['Mean_Share', 'Top_Driver_Points'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,170 @@
+"""Feature engineering for the anomaly models.
+
+Raw Suhu / Tekanan readings are extended with windowed statistics per
+sensor (rolling mean, standard deviation, least-squares slope and the
+lag difference ``x[t] - x[t - lag]``), the compressor duty cycle (rolling
+share of samples at loaded pressure) and the power drawn per bar of
+delivered pressure, plus the unit's fleet columns (power, daily hours and
+health penalties).
+
+Everything is computed over columnar arrays that may hold several units
+back to back (``lengths`` gives each unit's sample count). Rolling sums come
+from one cumulative sum per column, with each window clipped at its unit's
+first sample, so the cost is O(samples) for any window size and number of
+units. Slopes are per sample, which is the only time axis that archived
+(strided) and live windows share.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from kaeser.metrics import metrics
+from kaeser.models import data_fingerprint
+
+SENSOR_COLUMNS = ['Suhu', 'Tekanan']
+FLEET_FEATURE_COLUMNS = ['Power_Consumption_kW', 'Operational_Hours_Daily',
+                         'Age_Penalty', 'Usage_Penalty', 'Maintenance_Penalty']
+ROLLING_WINDOW = 20            # samples per rolling window
+LAG = 1
+LOADED_PRESSURE = 6.0          # bar; samples at or above count as the compressor running loaded
+MIN_PRESSURE = 0.1             # bar; floor for the power / pressure ratio
+
+ROLLING_COLUMNS = [f'{col}_{stat}' for col in SENSOR_COLUMNS for stat in ('Mean', 'Std', 'Slope', 'Delta')]
+
+# Feature set label -> model input columns
+FEATURE_SETS = {
+    "Sensors (Suhu, Tekanan)": SENSOR_COLUMNS,
+    "Sensors + rolling statistics": SENSOR_COLUMNS + ROLLING_COLUMNS + ['Duty_Cycle'],
+    "Full (rolling + fleet columns)": (SENSOR_COLUMNS + ROLLING_COLUMNS + ['Duty_Cycle', 'Power_Pressure_Ratio']
+                                       + FLEET_FEATURE_COLUMNS),
+}
+DEFAULT_FEATURE_SET = "Sensors (Suhu, Tekanan)"
+
+
+def _group_positions(lengths):
+    """(position within unit, index of unit start) for every sample."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum()) - starts, starts
+
+
+def _window_sum(cumsum, end, begin):
+    """Sum of x[begin:end + 1] from the inclusive cumulative sum (begin may be 0)."""
+    return cumsum[end] - np.where(begin > 0, cumsum[np.maximum(begin - 1, 0)], 0.0)
+
+
+def rolling_stats(x, lengths, window=ROLLING_WINDOW, lag=LAG):
+    """Rolling mean, std, slope and lag difference of ``x``, restarting at every unit.
+
+    The first samples of a unit use the shorter window available so far;
+    their lag difference is 0.
+    """
+    x = np.asarray(x, dtype=float)
+    position, starts = _group_positions(lengths)
+    end = np.arange(len(x))
+    begin = end - np.minimum(position, window - 1)
+    n = (end - begin + 1).astype(float)
+
+    # Centering on the overall mean and using positions within the unit keeps
+    # the cumulative sums small, so differences of them stay accurate
+    xc = x - x.mean() if len(x) else x
+    t = position.astype(float)
+    s_x = _window_sum(np.cumsum(xc), end, begin)
+    s_xx = _window_sum(np.cumsum(xc * xc), end, begin)
+    s_tx = _window_sum(np.cumsum(t * xc), end, begin)
+
+    mean_c = s_x / n
+    std = np.sqrt(np.maximum(s_xx / n - mean_c ** 2, 0.0))
+    t_mean = t - (n - 1) / 2                        # mean position of each window
+    t_var = n * (n * n - 1) / 12                    # sum of squared deviations of n consecutive positions
+    slope = np.divide(s_tx - t_mean * s_x, t_var, out=np.zeros(len(x)), where=t_var > 0)
+    lagged = np.where(position >= lag, end - lag, end)
+    return mean_c + (x.mean() if len(x) else 0.0), std, slope, x - x[lagged]
+
+
+def compute_features(suhu, tekanan, lengths, fleet_values, window=ROLLING_WINDOW, lag=LAG):
+    """Every engineered feature as {column: array} for units stored back to back.
+
+    ``fleet_values`` maps each FLEET_FEATURE_COLUMNS column to one value per
+    unit (in ``lengths`` order).
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    features = {'Suhu': np.asarray(suhu, dtype=float), 'Tekanan': np.asarray(tekanan, dtype=float)}
+    for col in SENSOR_COLUMNS:
+        stats = rolling_stats(features[col], lengths, window, lag)
+        for stat, values in zip(('Mean', 'Std', 'Slope', 'Delta'), stats):
+            features[f'{col}_{stat}'] = values
+    loaded = (features['Tekanan'] >= LOADED_PRESSURE).astype(float)
+    features['Duty_Cycle'] = rolling_stats(loaded, lengths, window, lag)[0]
+    for col in FLEET_FEATURE_COLUMNS:
+        features[col] = np.repeat(np.asarray(fleet_values[col], dtype=float), lengths)
+    features['Power_Pressure_Ratio'] = (features['Power_Consumption_kW']
+                                        / np.maximum(features['Tekanan'], MIN_PRESSURE))
+    return features
+
+
+def feature_matrix(features, columns):
+    return np.column_stack([features[col] for col in columns])
+
+
+class FeatureCache:
+    """Engineered feature matrices per (unit, feature set), LRU with ``max_entries``.
+
+    An entry is reused while the unit's data version and fleet values are
+    unchanged, so reruns with the same window skip the feature stage.
+    """
+
+    def __init__(self, max_entries=256, window=ROLLING_WINDOW, lag=LAG):
+        self.max_entries = max_entries
+        self.window = window
+        self.lag = lag
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def matrix(self, unit_id, feature_set, sensors, fleet_row, data_version):
+        """(n_samples, n_features) array of FEATURE_SETS[feature_set] for one unit.
+
+        ``sensors`` holds the Suhu / Tekanan columns and ``fleet_row`` the
+        unit's fleet columns (a Series or dict). Without a ``data_version``
+        the sensor values are fingerprinted instead.
+        """
+        columns = FEATURE_SETS[feature_set]
+        if data_version is None:
+            data_version = data_fingerprint(sensors[SENSOR_COLUMNS].to_numpy(dtype=float))
+        fleet_values = tuple(float(fleet_row[col]) for col in FLEET_FEATURE_COLUMNS)
+        key = (unit_id, feature_set)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == (data_version, fleet_values):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if columns == SENSOR_COLUMNS:
+            X = np.asarray(sensors[SENSOR_COLUMNS], dtype=float)
+        else:
+            with metrics.span('feature_engineering', feature_set=feature_set):
+                features = compute_features(sensors['Suhu'].to_numpy(), sensors['Tekanan'].to_numpy(),
+                                            [len(sensors)], dict(zip(FLEET_FEATURE_COLUMNS, fleet_values)),
+                                            window=self.window, lag=self.lag)
+                X = feature_matrix(features, columns)
+
+        with self._lock:
+            self._entries[key] = ((data_version, fleet_values), X)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return X
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'nbytes': sum(X.nbytes for _, X in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,173 @@
+"""Synthetic fleet generator.
+
+Every column is built with batched NumPy operations so that fleets of
+hundreds of thousands of units can be generated in well under a second.
+"""
+import numpy as np
+import pandas as pd
+
+from kaeser.metrics import metrics
+
+# --- CONSTANTS ---
+LOCATIONS = ['Jakarta', 'Surabaya', 'Bandung', 'Semarang', 'Medan', 'Makassar']
+LOCATION_WEIGHTS = [0.35, 0.25, 0.15, 0.10, 0.10, 0.05]
+
+LAT_MAP = {
+    'Jakarta': -6.2, 'Surabaya': -7.25, 'Bandung': -6.9,
+    'Semarang': -6.99, 'Medan': 3.59, 'Makassar': -5.13
+}
+LON_MAP = {
+    'Jakarta': 106.8, 'Surabaya': 112.75, 'Bandung': 107.6,
+    'Semarang': 110.42, 'Medan': 98.67, 'Makassar': 119.4
+}
+
+ELECTRICITY_RATE = 1500  # Rp/kWh
+
+MAX_AGE_PENALTY = 40
+MAX_USAGE_PENALTY = 20
+MAX_MAINTENANCE_PENALTY = 15
+MIN_HEALTH_SCORE = 40
+BASE_HOURS, MAX_HOURS = 8, 24      # daily hours mapped to 0 .. MAX_USAGE_PENALTY
+MAX_ANOMALY_RATE = 0.25            # anomaly rate that earns the full maintenance penalty
+
+FLEET_COLUMNS = [
+    'Unit_ID', 'Lokasi', 'Status', 'Health_Score',
+    'Age_Penalty', 'Usage_Penalty', 'Maintenance_Penalty',
+    'Last_Service', 'Next_Service_Due',
+    'Operational_Hours_Daily', 'Power_Consumption_kW', 'Daily_Energy_Cost_Rp',
+    'Latitude', 'Longitude', 'Installation_Date'
+]
+
+
+def classify_status(health_scores):
+    """Map Health_Score values to Critical (<60) / Warning (<85) / Healthy."""
+    scores = np.asarray(health_scores)
+    return np.select([scores < 60, scores < 85], ['Critical', 'Warning'], default='Healthy')
+
+
+def age_penalty(days_since_service):
+    """min(40, Days_Since_Last_Service / 365 * 40)."""
+    return np.minimum(MAX_AGE_PENALTY, np.asarray(days_since_service, dtype=float) / 365 * MAX_AGE_PENALTY)
+
+
+def usage_penalty(hours_daily):
+    """0 at 8 h/day up to 20 at 24 h/day."""
+    load = (np.asarray(hours_daily, dtype=float) - BASE_HOURS) / (MAX_HOURS - BASE_HOURS)
+    return np.round(np.clip(load, 0, 1) * MAX_USAGE_PENALTY).astype(int)
+
+
+def maintenance_penalty(anomaly_rate):
+    """0 for a clean sensor history up to 15 at a 25% anomaly rate."""
+    share = np.asarray(anomaly_rate, dtype=float) / MAX_ANOMALY_RATE
+    return np.round(np.clip(share, 0, 1) * MAX_MAINTENANCE_PENALTY).astype(int)
+
+
+def health_score(age, usage, maintenance):
+    """100 - (Age_Penalty + Usage_Penalty + Maintenance_Penalty), floor 40."""
+    return np.maximum(MIN_HEALTH_SCORE, 100 - (age + usage + maintenance)).astype(int)
+
+
+def make_unit_ids(start, stop):
+    """Unit IDs K-DX-001, K-DX-002, ... for the half-open range [start, stop)."""
+    numbers = np.arange(start, stop).astype(str)
+    return np.char.add('K-DX-', np.char.zfill(numbers, 3))
+
+
+def generate_fleet(n_units=20, seed=None):
+    """Build a synthetic fleet of ``n_units`` compressors.
+
+    Same formulas as kaeser.health, which keeps the scores current afterwards:
+        Health Score = 100 - (Age_Penalty + Usage_Penalty + Maintenance_Penalty), floor 40
+        Age_Penalty = min(40, (Days_Since_Last_Service / 365) * 40)
+        Usage_Penalty from Operational_Hours_Daily (0 at 8 h up to 20 at 24 h)
+        Maintenance_Penalty = Random(0, 15) until sensor anomaly rates are known
+    """
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp.now()
+
+    days_since_service = rng.integers(10, 200, n_units)
+    maintenance = rng.integers(0, 15, n_units)
+
+    # Locations and jittered coordinates
+    loc_codes = rng.choice(len(LOCATIONS), n_units, p=LOCATION_WEIGHTS)
+    locations = np.asarray(LOCATIONS, dtype=object)[loc_codes]
+    lats = np.array([LAT_MAP[loc] for loc in LOCATIONS])[loc_codes] + rng.uniform(-0.1, 0.1, n_units)
+    lons = np.array([LON_MAP[loc] for loc in LOCATIONS])[loc_codes] + rng.uniform(-0.1, 0.1, n_units)
+
+    # Energy
+    operational_hours = rng.uniform(8, 24, n_units).round(1)
+    power_consumption = rng.uniform(50, 150, n_units).round(1)
+    daily_energy_cost = (operational_hours * power_consumption * ELECTRICITY_RATE).round(0)
+
+    # Penalties and Health Score
+    age = age_penalty(days_since_service)
+    usage = usage_penalty(operational_hours)
+    health = health_score(age, usage, maintenance)
+
+    # Service dates (Last_Service matches the days used for Age_Penalty)
+    last_service = now - pd.to_timedelta(days_since_service, unit='D')
+    next_service = now + pd.to_timedelta(rng.integers(30, 180, n_units), unit='D')
+    installation = now - pd.to_timedelta(rng.integers(365, 1825, n_units), unit='D')
+
+    return pd.DataFrame({
+        'Unit_ID': make_unit_ids(1, n_units + 1),
+        'Lokasi': locations,
+        'Status': classify_status(health),
+        'Health_Score': health,
+        'Age_Penalty': age.round(1),
+        'Usage_Penalty': usage,
+        'Maintenance_Penalty': maintenance,
+        'Last_Service': last_service,
+        'Next_Service_Due': next_service,
+        'Operational_Hours_Daily': operational_hours,
+        'Power_Consumption_kW': power_consumption,
+        'Daily_Energy_Cost_Rp': daily_energy_cost,
+        'Latitude': lats,
+        'Longitude': lons,
+        'Installation_Date': installation
+    }, columns=FLEET_COLUMNS)
+
+
+# --- UNIT LIST PAGINATION ---
+STATUS_ICONS = {'Healthy': '🟢', 'Warning': '🟡', 'Critical': '🔴'}
+
+
+@metrics.timed('fleet_filter')
+def filter_units(fleet, location=None, statuses=None, search=''):
+    """Boolean-mask filter by Lokasi, Status list and Unit_ID substring."""
+    mask = np.ones(len(fleet), dtype=bool)
+    if location:
+        mask &= (fleet['Lokasi'] == location).to_numpy()
+    if statuses:
+        mask &= fleet['Status'].isin(statuses).to_numpy()
+    if search:
+        mask &= fleet['Unit_ID'].str.contains(search, case=False, regex=False).to_numpy()
+    return fleet[mask]
+
+
+@metrics.timed('fleet_page')
+def page_units(fleet, sort_by='Health_Score', ascending=True, page=1, page_size=25):
+    """Return ``(rows, n_pages)`` for one page of ``fleet`` sorted by ``sort_by``.
+
+    Only the requested page is materialized, and its display strings
+    (expander label, formatted dates, penalty caption) are built as whole
+    columns instead of per row.
+    """
+    n_pages = max(1, -(-len(fleet) // page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+
+    order = np.argsort(fleet[sort_by].to_numpy(), kind='stable')
+    if not ascending:
+        order = order[::-1]
+    rows = fleet.iloc[order[start:start + page_size]]
+
+    rows = rows.assign(
+        Label=rows['Status'].map(STATUS_ICONS) + ' ' + rows['Unit_ID'] + ' - ' + rows['Status'],
+        Last_Service_Str=rows['Last_Service'].dt.strftime('%d %b %Y'),
+        Next_Service_Str=rows['Next_Service_Due'].dt.strftime('%d %b %Y'),
+        Penalty_Str=('**Penalty Breakdown:** Age: ' + rows['Age_Penalty'].astype(str)
+                     + ' | Usage: ' + rows['Usage_Penalty'].astype(str)
+                     + ' | Maintenance: ' + rows['Maintenance_Penalty'].astype(str)),
+    )
+    return rows, n_pages
@@ -0,0 +1,170 @@
+"""Bulk fleet import and chunked export.
+
+Imports accept CSV or Parquet with at least Unit_ID and Lokasi. Missing
+optional columns get defaults, every row is validated with column-wise
+masks, and the derived columns (the health columns from kaeser.health,
+Daily_Energy_Cost_Rp, Latitude/Longitude from Lokasi) are computed for the
+whole file at once. Valid rows are written to the store in one transaction.
+
+Exports read the store in fixed-size chunks from a dedicated cursor and
+write each chunk straight to the output (CSV text or Parquet row groups),
+so peak memory is one chunk regardless of fleet size.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import ELECTRICITY_RATE, FLEET_COLUMNS, LAT_MAP, LOCATIONS, LON_MAP, MAX_MAINTENANCE_PENALTY
+from kaeser.health import HEALTH_COLUMNS, score_units
+
+REQUIRED_COLUMNS = ['Unit_ID', 'Lokasi']
+EXPORT_CHUNK_ROWS = 10000
+
+
+def read_upload(data, name):
+    """Read an uploaded CSV / Parquet file (bytes or file-like) into a DataFrame."""
+    buffer = io.BytesIO(data) if isinstance(data, bytes) else data
+    if name.lower().endswith('.parquet'):
+        return pd.read_parquet(buffer)
+    return pd.read_csv(buffer)
+
+
+def prepare_import(df, now=None, seed=None, existing=None):
+    """Validate an import frame and derive the computed fleet columns.
+
+    Returns ``(units, errors)``: ``units`` holds the valid rows with every
+    FLEET_COLUMNS column, ``errors`` has one row per rejected input row
+    (Row = 1-based position in the file, Unit_ID, Problem). Status,
+    Health_Score and the age / usage penalties are always computed with
+    ``score_units`` (any values in the file are ignored); a given
+    Maintenance_Penalty is kept until the unit has a live anomaly rate.
+
+    ``existing`` holds the stored rows of units the file updates: for those
+    units, optional columns missing from the file keep their stored values
+    instead of the defaults (coordinates only while Lokasi is unchanged).
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+    now = pd.Timestamp.now() if now is None else now
+    rng = np.random.default_rng(seed)
+    n = len(df)
+
+    unit_ids = df['Unit_ID'].astype('string').str.strip()
+    lokasi = df['Lokasi'].astype('string').str.strip()
+    stored = None
+    if existing is not None and len(existing):
+        # Stored row of each file row (all NaN for new units)
+        stored = existing.drop_duplicates('Unit_ID').set_index('Unit_ID').reindex(unit_ids.to_numpy())
+        stored.index = df.index
+
+    def numeric(col, default):
+        if col not in df.columns:
+            values = pd.Series(default, index=df.index, dtype=float)
+            return values if stored is None else pd.to_numeric(stored[col]).astype(float).fillna(values)
+        return pd.to_numeric(df[col], errors='coerce')
+
+    def dates(col, default):
+        if col not in df.columns:
+            values = pd.Series(default, index=df.index, dtype='datetime64[ns]')
+            return values if stored is None else pd.to_datetime(stored[col]).astype('datetime64[ns]').fillna(values)
+        values = pd.to_datetime(df[col], errors='coerce')
+        return values.dt.tz_convert(None) if values.dt.tz is not None else values
+
+    hours = numeric('Operational_Hours_Daily', 16.0)
+    power = numeric('Power_Consumption_kW', 100.0)
+    last_service = dates('Last_Service', now)
+    installation = dates('Installation_Date', now)
+    next_service = dates('Next_Service_Due', pd.NaT).fillna(last_service + pd.Timedelta(days=90))
+    maintenance = numeric('Maintenance_Penalty', 0).fillna(0)
+
+    # Coordinates default to the region center with the generator's jitter
+    known_location = lokasi.isin(LOCATIONS).fillna(False).to_numpy()
+    lat = numeric('Latitude', np.nan).to_numpy().copy()
+    lon = numeric('Longitude', np.nan).to_numpy().copy()
+    if stored is not None:
+        # Units moved to another region get new coordinates unless the file gives them
+        moved = (stored['Lokasi'] != lokasi).fillna(True).to_numpy(dtype=bool)
+        if 'Latitude' not in df.columns:
+            lat[moved] = np.nan
+        if 'Longitude' not in df.columns:
+            lon[moved] = np.nan
+    fill = np.isnan(lat) & known_location
+    lat[fill] = lokasi[fill].map(LAT_MAP).to_numpy(dtype=float) + rng.uniform(-0.1, 0.1, fill.sum())
+    fill = np.isnan(lon) & known_location
+    lon[fill] = lokasi[fill].map(LON_MAP).to_numpy(dtype=float) + rng.uniform(-0.1, 0.1, fill.sum())
+
+    checks = [
+        (unit_ids.isna() | (unit_ids == ''), 'Unit_ID is empty'),
+        (unit_ids.duplicated(keep='first') & unit_ids.notna(), 'Unit_ID appears more than once in the file'),
+        (lokasi.isna() | ~(lokasi.isin(LOCATIONS) | (~np.isnan(lat) & ~np.isnan(lon))),
+         f"Lokasi must be one of {', '.join(LOCATIONS)} (or give Latitude/Longitude)"),
+        (hours.isna() | (hours < 0) | (hours > 24), 'Operational_Hours_Daily must be from 0 to 24'),
+        (power.isna() | (power <= 0), 'Power_Consumption_kW must be positive'),
+        (maintenance.isna() | (maintenance < 0) | (maintenance > MAX_MAINTENANCE_PENALTY),
+         f'Maintenance_Penalty must be from 0 to {MAX_MAINTENANCE_PENALTY}'),
+        (last_service.isna() | installation.isna() | next_service.isna(), 'Unparseable date'),
+    ]
+    problems = np.full(n, '', dtype=object)
+    for mask, message in checks:
+        mask = mask.fillna(True).to_numpy(dtype=bool) if isinstance(mask, pd.Series) else mask
+        problems = np.where(mask & (problems == ''), message, problems)
+    valid = problems == ''
+
+    errors = pd.DataFrame({
+        'Row': np.flatnonzero(~valid) + 1,
+        'Unit_ID': unit_ids[~valid].to_numpy(dtype=object),
+        'Problem': problems[~valid],
+    })
+
+    hours_v = hours[valid].to_numpy()
+    power_v = power[valid].to_numpy()
+    units = pd.DataFrame({
+        'Unit_ID': unit_ids[valid].to_numpy(dtype=object),
+        'Lokasi': lokasi[valid].to_numpy(dtype=object),
+        'Maintenance_Penalty': maintenance[valid].round().astype(int).to_numpy(),
+        'Last_Service': last_service[valid].to_numpy(),
+        'Next_Service_Due': next_service[valid].to_numpy(),
+        'Operational_Hours_Daily': hours_v,
+        'Power_Consumption_kW': power_v,
+        'Daily_Energy_Cost_Rp': (hours_v * power_v * ELECTRICITY_RATE).round(0),
+        'Latitude': lat[valid],
+        'Longitude': lon[valid],
+        'Installation_Date': installation[valid].to_numpy(),
+    }, columns=FLEET_COLUMNS)
+    units[HEALTH_COLUMNS] = score_units(units, now=now)[HEALTH_COLUMNS]
+    return units, errors
+
+
+def export_csv(store, out, chunksize=EXPORT_CHUNK_ROWS):
+    """Write the whole fleet as CSV to the text file ``out``, one chunk at a time."""
+    rows = 0
+    for i, chunk in enumerate(store.iter_chunks(chunksize)):
+        chunk.to_csv(out, index=False, header=(i == 0))
+        rows += len(chunk)
+    if rows == 0:
+        pd.DataFrame(columns=FLEET_COLUMNS).to_csv(out, index=False)
+    return rows
+
+
+def export_parquet(store, out, chunksize=EXPORT_CHUNK_ROWS):
+    """Write the whole fleet as Parquet to ``out`` (path or binary file), one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in store.iter_chunks(chunksize):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(pd.DataFrame(columns=FLEET_COLUMNS), preserve_index=False), out)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
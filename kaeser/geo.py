@@ -0,0 +1,73 @@
+"""Grid clustering of unit coordinates for the fleet map.
+
+Units are binned into square lat/lon grid cells for each zoom level, and
+every cell becomes one map point carrying per-status counts. Only these
+aggregated points are sent to the browser.
+"""
+import numpy as np
+import pandas as pd
+
+STATUS_COLORS = {'Healthy': '#10b981', 'Warning': '#f59e0b', 'Critical': '#ef4444'}
+
+# Zoom level label -> grid cell size in degrees (1° ≈ 111 km)
+ZOOM_LEVELS = {
+    "Nationwide (~220 km)": 2.0,
+    "Regional (~55 km)": 0.5,
+    "City (~11 km)": 0.1,
+}
+
+CLUSTER_COLUMNS = ['Latitude', 'Longitude', 'Units', 'Critical', 'Warning', 'Healthy', 'color', 'size']
+
+
+def cluster_units(fleet, cell_deg):
+    """Aggregate units into ``cell_deg`` grid cells.
+
+    Each cell is placed at the mean position of its units. Color is red when
+    at least 20% of its units are Critical, amber when at least half are
+    Warning or Critical, otherwise green. ``size`` is a radius in meters
+    that grows with the square root of the unit count.
+    """
+    lat = fleet['Latitude'].to_numpy()
+    lon = fleet['Longitude'].to_numpy()
+    cell_y = np.floor(lat / cell_deg).astype(np.int64)
+    cell_x = np.floor(lon / cell_deg).astype(np.int64)
+    keys, inverse = np.unique(np.stack([cell_y, cell_x], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    n_cells = len(keys)
+
+    units = np.bincount(inverse, minlength=n_cells)
+    status = fleet['Status'].to_numpy()
+    counts = {s: np.bincount(inverse, weights=(status == s), minlength=n_cells).astype(int) for s in STATUS_COLORS}
+
+    critical_share = counts['Critical'] / np.maximum(units, 1)
+    at_risk_share = (counts['Critical'] + counts['Warning']) / np.maximum(units, 1)
+    color = np.where(critical_share >= 0.2, STATUS_COLORS['Critical'],
+                     np.where(at_risk_share >= 0.5, STATUS_COLORS['Warning'], STATUS_COLORS['Healthy']))
+
+    max_radius = cell_deg * 111000 * 0.45  # stay inside the cell
+    size = max_radius * np.sqrt(units / max(units.max(initial=1), 1))
+
+    return pd.DataFrame({
+        'Latitude': np.bincount(inverse, weights=lat, minlength=n_cells) / units,
+        'Longitude': np.bincount(inverse, weights=lon, minlength=n_cells) / units,
+        'Units': units,
+        'Critical': counts['Critical'],
+        'Warning': counts['Warning'],
+        'Healthy': counts['Healthy'],
+        'color': color,
+        'size': np.maximum(size, 500.0),
+    }, columns=CLUSTER_COLUMNS)
+
+
+def build_cluster_index(fleet, zoom_levels=ZOOM_LEVELS):
+    """Precompute the cluster layer for every zoom level: {label: DataFrame}."""
+    return {label: cluster_units(fleet, cell_deg) for label, cell_deg in zoom_levels.items()}
+
+
+def unit_points(fleet):
+    """Individual-unit layer with only the columns st.map needs."""
+    return pd.DataFrame({
+        'Latitude': fleet['Latitude'].to_numpy(),
+        'Longitude': fleet['Longitude'].to_numpy(),
+        'color': fleet['Status'].map(STATUS_COLORS).to_numpy(),
+    })
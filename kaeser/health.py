@@ -0,0 +1,167 @@
+"""Health Score engine driven by fleet data and live anomaly rates.
+
+Every unit's penalties are recomputed from its own inputs with the
+formulas in kaeser.fleet:
+    Age_Penalty from Last_Service (days since service),
+    Usage_Penalty from Operational_Hours_Daily,
+    Maintenance_Penalty from the unit's live anomaly rate
+    (kaeser.streaming; units without one keep their stored penalty),
+then Health_Score and Status follow.
+
+A background thread reacts to three kinds of events and rescores only the
+affected units:
+    - store edits (new, imported or edited units), read from the change log,
+    - new anomaly rates, where only units whose Maintenance_Penalty moves are
+      read back (by primary key),
+    - the passage of time, since Age_Penalty grows with every day: a
+      periodic vectorized pass over the snapshot.
+Only rows whose score columns actually changed are written back, in one
+``update_many`` transaction, so FleetAggregates and the page snapshots
+pick them up through the usual change log.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import age_penalty, classify_status, health_score, maintenance_penalty, usage_penalty
+
+HEALTH_COLUMNS = ['Status', 'Health_Score', 'Age_Penalty', 'Usage_Penalty', 'Maintenance_Penalty']
+
+
+def score_units(units, now=None, anomaly_rates=None):
+    """Recomputed HEALTH_COLUMNS (plus Unit_ID) for the rows of ``units``.
+
+    ``anomaly_rates`` is a Series indexed by Unit_ID; units missing from it
+    keep their current Maintenance_Penalty.
+    """
+    now = pd.Timestamp.now() if now is None else now
+    days = ((now - pd.to_datetime(units['Last_Service'])).dt.total_seconds() / 86400).fillna(0).clip(lower=0)
+    age = age_penalty(days.to_numpy())
+    usage = usage_penalty(units['Operational_Hours_Daily'].to_numpy())
+    maintenance = units['Maintenance_Penalty'].fillna(0).to_numpy(dtype=int)
+    if anomaly_rates is not None and len(anomaly_rates):
+        rates = units['Unit_ID'].map(anomaly_rates).to_numpy(dtype=float)
+        known = ~np.isnan(rates)
+        maintenance = np.where(known, maintenance_penalty(np.where(known, rates, 0)), maintenance)
+    health = health_score(age, usage, maintenance)
+    return pd.DataFrame({
+        'Unit_ID': units['Unit_ID'].to_numpy(),
+        'Status': classify_status(health),
+        'Health_Score': health,
+        'Age_Penalty': age.round(1),
+        'Usage_Penalty': usage,
+        'Maintenance_Penalty': maintenance,
+    })
+
+
+def changed_scores(units, scored):
+    """Rows of ``scored`` whose score columns differ from the stored ``units`` (same order)."""
+    changed = np.zeros(len(units), dtype=bool)
+    for col in HEALTH_COLUMNS:
+        old, new = units[col].to_numpy(), scored[col].to_numpy()
+        if col == 'Age_Penalty':
+            changed |= ~np.isclose(old.astype(float), new, atol=1e-6)
+        else:
+            changed |= old != new
+    return scored[changed]
+
+
+class HealthEngine:
+    def __init__(self, store, rates_source=None, interval=1.0, rates_interval=30.0, full_pass_interval=3600.0):
+        self.store = store
+        self.rates_source = rates_source
+        self.interval = interval
+        self.rates_interval = rates_interval
+        self.full_pass_interval = full_pass_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._update_lock = threading.RLock()    # serializes rescoring passes
+
+        self._revision = -1
+        self._rates = pd.Series(dtype=float)    # Unit_ID -> latest anomaly rate
+        self._rates_at = 0.0
+        self._full_pass_at = 0.0
+        self.units_scored = 0
+        self.units_written = 0
+        self.full_passes = 0
+
+        store.subscribe(self._wake.set)
+        self._thread = threading.Thread(target=self._loop, name='health-engine', daemon=True)
+        self._thread.start()
+
+    # --- RESCORING (background thread) ---
+    def _rescore(self, units):
+        if units is None or units.empty:
+            return 0
+        changed = changed_scores(units.reset_index(drop=True), score_units(units, anomaly_rates=self._rates))
+        self.units_scored += len(units)
+        if len(changed):
+            self.store.update_many(changed)
+            self.units_written += len(changed)
+        return len(changed)
+
+    def rescore_all(self):
+        """Vectorized pass over the whole fleet (start-up, and as Age_Penalty grows with time)."""
+        with self._update_lock:
+            revision = self.store.revision()
+            self._rescore(self.store.snapshot())
+            self._revision = revision
+            self._full_pass_at = time.time()
+            self.full_passes += 1
+
+    def refresh(self):
+        """Rescore the units edited since the last refresh."""
+        with self._update_lock:
+            revision, changed, rows = self.store.changes_since(self._revision)
+            if revision == self._revision:
+                return
+            if changed is None:
+                self.rescore_all()
+                return
+            self._rescore(rows)
+            self._revision = revision
+
+    def update_rates(self, rates):
+        """Record new anomaly rates ({Unit_ID: rate}); rescore units whose Maintenance_Penalty moves."""
+        rates = pd.Series(rates, dtype=float)
+        if rates.empty:
+            return
+        with self._update_lock:
+            old = self._rates.reindex(rates.index)
+            moved = old.isna().to_numpy() | (maintenance_penalty(old.fillna(0)) != maintenance_penalty(rates))
+            self._rates = rates.combine_first(self._rates)
+            if moved.any():
+                self._rescore(self.store.get_units(rates.index[moved]))
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                now = time.time()
+                if now - self._full_pass_at >= self.full_pass_interval:
+                    self.rescore_all()
+                self.refresh()
+                if self.rates_source is not None and now - self._rates_at >= self.rates_interval:
+                    self._rates_at = now
+                    self.update_rates(self.rates_source())
+            except Exception:
+                # Never let a transient read / write error kill the worker; next tick retries
+                logging.getLogger(__name__).exception('Health engine pass failed')
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    # --- READS (any thread) ---
+    def stats(self):
+        return {
+            'units_scored': self.units_scored,
+            'units_written': self.units_written,
+            'full_passes': self.full_passes,
+            'rated_units': len(self._rates),
+            'revision': self._revision,
+        }
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,224 @@
+"""Process-wide instrumentation: timing spans, counters and memory.
+
+``metrics.span(name, **labels)`` times a block (count, total, max and last
+duration per name and label set) and samples the process RSS when the
+block ends, so each span also records the largest RSS seen at its exit.
+``metrics.incr`` counts events such as cache lookups and misses, and
+``add_collector`` registers callables whose stats (the figure cache, the
+model registry, ...) are read at dump time.
+
+Everything can be dumped as JSON (``snapshot``) or as Prometheus text
+(``prometheus``). ``serve_metrics`` exposes both on a local HTTP port:
+``/metrics`` and ``/metrics.json``.
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = 'kaeser'
+
+
+def current_rss():
+    """Resident set size in bytes (None where /proc is not available)."""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss():
+    """High-water mark of the process RSS in bytes (None on platforms without ``resource``)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KiB on Linux
+
+
+class _Span:
+    __slots__ = ('count', 'total', 'max', 'last', 'rss_max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.rss_max = 0
+
+    def as_dict(self):
+        return {'count': self.count, 'total_s': self.total, 'max_s': self.max, 'last_s': self.last,
+                'avg_s': self.total / self.count if self.count else 0.0, 'rss_max_bytes': self.rss_max}
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = {}      # (name, labels) -> _Span
+        self._counters = {}   # (name, labels) -> value
+        self._collectors = {}
+        self.started_at = time.time()
+
+    @contextmanager
+    def span(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name, seconds, **labels):
+        """Record one span of ``seconds`` measured elsewhere."""
+        rss = current_rss() or 0
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            span = self._spans.get(key)
+            if span is None:
+                span = self._spans[key] = _Span()
+            span.count += 1
+            span.total += seconds
+            span.max = max(span.max, seconds)
+            span.last = seconds
+            span.rss_max = max(span.rss_max, rss)
+
+    def timed(self, name, **labels):
+        """Decorator form of ``span``."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def incr(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def add_collector(self, name, collect):
+        """Register ``collect()`` -> {stat: number}, read on every dump."""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """JSON-serializable dump of spans, counters, collector stats and memory."""
+        with self._lock:
+            spans = [{'name': name, 'labels': dict(labels), **span.as_dict()}
+                     for (name, labels), span in self._spans.items()]
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in self._counters.items()]
+            collectors = dict(self._collectors)
+        collected = {}
+        for name, collect in collectors.items():
+            try:
+                collected[name] = {k: v for k, v in collect().items() if isinstance(v, (int, float))}
+            except Exception as exc:  # a broken collector must not break the dump
+                collected[name] = {'error': repr(exc)}
+        return {
+            'uptime_s': time.time() - self.started_at,
+            'memory': {'rss_bytes': current_rss(), 'rss_peak_bytes': peak_rss()},
+            'spans': sorted(spans, key=lambda s: -s['total_s']),
+            'counters': sorted(counters, key=lambda c: (c['name'], sorted(c['labels'].items()))),
+            'collectors': collected,
+        }
+
+    def prometheus(self):
+        """The snapshot in Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name, kind, samples):
+            lines.append(f'# TYPE {PREFIX}_{name} {kind}')
+            for labels, value in samples:
+                if value is not None:
+                    lines.append(f'{PREFIX}_{name}{_labels(labels)} {value}')
+
+        metric('uptime_seconds', 'gauge', [({}, snap['uptime_s'])])
+        metric('rss_bytes', 'gauge', [({}, snap['memory']['rss_bytes'])])
+        metric('rss_peak_bytes', 'gauge', [({}, snap['memory']['rss_peak_bytes'])])
+        spans = [({'span': s['name'], **s['labels']}, s) for s in snap['spans']]
+        metric('span_seconds_total', 'counter', [(labels, s['total_s']) for labels, s in spans])
+        metric('span_calls_total', 'counter', [(labels, s['count']) for labels, s in spans])
+        metric('span_seconds_max', 'gauge', [(labels, s['max_s']) for labels, s in spans])
+        metric('span_rss_max_bytes', 'gauge', [(labels, s['rss_max_bytes']) for labels, s in spans])
+        for name in sorted({c['name'] for c in snap['counters']}):
+            metric(name, 'counter', [(c['labels'], c['value']) for c in snap['counters'] if c['name'] == name])
+        for collector, stats in snap['collectors'].items():
+            for stat, value in stats.items():
+                if isinstance(value, (int, float)):
+                    metric(f'{collector}_{stat}', 'gauge', [({}, value)])
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+
+metrics = Metrics()
+
+
+def tracked(cache_decorator, name=None):
+    """Wrap a ``st.cache_data`` / ``st.cache_resource`` getter with lookup / miss counters.
+
+    The miss counter sits inside the cached function, so it only runs when
+    Streamlit actually calls it.
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            metrics.incr('cache_misses_total', cache=label)
+            with metrics.span('cache_fill', cache=label):
+                return func(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(func)
+        def lookup(*args, **kwargs):
+            metrics.incr('cache_lookups_total', cache=label)
+            return cached(*args, **kwargs)
+        lookup.clear = cached.clear
+        return lookup
+    return decorator
+
+
+def serve_metrics(host='127.0.0.1', port=9600, registry=metrics):
+    """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` on a daemon thread."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] == '/metrics':
+                body, content_type = registry.prometheus().encode(), 'text/plain; version=0.0.4'
+            elif self.path.split('?')[0] == '/metrics.json':
+                body, content_type = json.dumps(registry.snapshot()).encode(), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
@@ -0,0 +1,176 @@
+"""Registry of fitted anomaly models for the AI Diagnostic Laboratory.
+
+Models are keyed by (unit, feature set, detector backend) and kept in LRU
+order under a memory budget. A model is refit only when the unit's sensor data changes. With a
+numeric data version (the telemetry sample count), small amounts of new
+data are scored with the existing model and a refit happens only once
+``refit_every`` new samples have arrived.
+
+The contamination (AI sensitivity) is deliberately *not* part of the key:
+IsolationForest builds the same trees for any contamination and only uses
+it to place the decision threshold at that percentile of the training
+scores. The registry therefore caches ``score_samples`` output and
+``predict_from_scores`` re-thresholds it, which gives the same labels as
+``IsolationForest(contamination=sens).fit_predict`` without retraining.
+The other backends in kaeser.detectors are thresholded the same way.
+
+Per-point feature attributions (kaeser.explain) are stored on the same
+entry, so they live exactly as long as the model version and scores they
+explain.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from kaeser.detectors import DEFAULT_DETECTOR, make_detector, model_nbytes
+from kaeser.explain import occlusion_attributions
+from kaeser.metrics import metrics
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes
+
+
+def data_fingerprint(X):
+    X = np.ascontiguousarray(X)
+    return hashlib.blake2b(X.tobytes() + str(X.shape).encode(), digest_size=16).hexdigest()
+
+
+def predict_from_scores(scores, contamination):
+    """-1 for anomalies, 1 for normal points, as IsolationForest.predict would return."""
+    offset = np.percentile(scores, 100.0 * contamination)
+    return np.where(scores < offset, -1, 1)
+
+
+class _Entry:
+    __slots__ = ('model', 'scores', 'data_version', 'fit_version', 'nbytes', 'fit_s', 'score_s', 'attributions')
+
+    def __init__(self, model, scores, data_version, fit_version, fit_s, score_s):
+        self.model = model
+        self.scores = scores
+        self.data_version = data_version
+        self.fit_version = fit_version
+        self.fit_s = fit_s
+        self.score_s = score_s
+        self.attributions = None   # (n_samples, n_features), NaN rows not explained yet
+        self.nbytes = model_nbytes(model) + scores.nbytes
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET, random_state=42, refit_every=250):
+        self.memory_budget = memory_budget
+        self.random_state = random_state
+        self.refit_every = refit_every
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.fits = 0
+        self.evictions = 0
+
+    def _fit(self, X, detector):
+        model = make_detector(detector, self.random_state)
+        with metrics.span('model_fit', model=detector):
+            model.fit(X)
+        self.fits += 1
+        return model
+
+    def scores(self, unit_id, features, X, data_version=None, detector=DEFAULT_DETECTOR):
+        """Return ``score_samples(X)`` for the unit's model, fitting only if needed."""
+        X = np.asarray(X, dtype=float)
+        return self._entry(unit_id, features, X, data_version, detector).scores
+
+    def attributions(self, unit_id, features, X, rows, data_version=None, detector=DEFAULT_DETECTOR):
+        """Occlusion attributions (kaeser.explain) of ``X[rows]``: array (len(rows), n_features).
+
+        Rows already explained for this model version and data are reused;
+        only the rest are scored, in one batched pass.
+        """
+        X = np.asarray(X, dtype=float)
+        rows = np.asarray(rows, dtype=np.int64)
+        entry = self._entry(unit_id, features, X, data_version, detector)
+        with self._lock:
+            if entry.attributions is None:
+                entry.attributions = np.full(X.shape, np.nan)
+                entry.nbytes += entry.attributions.nbytes
+                if self._entries.get((unit_id, tuple(features), detector)) is entry:
+                    self.nbytes += entry.attributions.nbytes
+            missing = rows[np.isnan(entry.attributions[rows, 0])]
+        if len(missing):
+            with metrics.span('explain', model=detector):
+                values = occlusion_attributions(entry.model, X, missing, entry.scores)
+            with self._lock:
+                entry.attributions[missing] = values
+        return entry.attributions[rows]
+
+    def _entry(self, unit_id, features, X, data_version, detector):
+        key = (unit_id, tuple(features), detector)
+        if data_version is None:
+            data_version = data_fingerprint(X)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.data_version == data_version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Fit (or rescore) outside the lock so other sessions are not blocked
+        if entry is not None and self._is_minor_update(entry, data_version):
+            model, fit_version, fit_s = entry.model, entry.fit_version, entry.fit_s
+        else:
+            start = time.perf_counter()
+            model, fit_version = self._fit(X, detector), data_version
+            fit_s = time.perf_counter() - start
+        start = time.perf_counter()
+        with metrics.span('model_score', model=detector):
+            scores = model.score_samples(X)
+        entry = _Entry(model, scores, data_version, fit_version, fit_s, time.perf_counter() - start)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+            self._evict()
+        return entry
+
+    def _is_minor_update(self, entry, data_version):
+        if not isinstance(data_version, (int, np.integer)) or not isinstance(entry.fit_version, (int, np.integer)):
+            return False
+        return 0 < data_version - entry.fit_version < self.refit_every
+
+    def get_model(self, unit_id, features, detector=DEFAULT_DETECTOR):
+        with self._lock:
+            entry = self._entries.get((unit_id, tuple(features), detector))
+            return None if entry is None else entry.model
+
+    def model_info(self, unit_id, features, detector=DEFAULT_DETECTOR):
+        """Latest fit / score latency (s) and size (bytes) of a cached model, or None."""
+        with self._lock:
+            entry = self._entries.get((unit_id, tuple(features), detector))
+            if entry is None:
+                return None
+            return {'fit_s': entry.fit_s, 'score_s': entry.score_s, 'nbytes': entry.nbytes}
+
+    def _evict(self):
+        # Drop least recently used models, but always keep the newest one
+        while self.nbytes > self.memory_budget and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self.nbytes -= entry.nbytes
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'models': len(self._entries),
+                'nbytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'fits': self.fits,
+                'evictions': self.evictions,
+            }
@@ -0,0 +1,329 @@
+"""Fleet-wide financial reports generated in the background.
+
+``ReportJob`` walks the fleet store in fixed-size chunks and applies the
+Financial Exposure & ROI formulas to every unit, with the risk probability
+taken from the unit's Health_Score and the page's CAPEX and savings
+inputs (those of an average unit) scaled by the unit's rated power. Each chunk is written straight to the per-unit
+CSV and Parquet files (one row group per chunk) and folded into running
+per-region totals, so memory stays at one chunk whatever the fleet size.
+
+When the last chunk is done, the region table and the executive summary
+PDF are written. PDF charts are placed from PNG bytes out of the shared
+figure cache, so a chart the Finance page already showed is not redrawn.
+"""
+import io
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from kaeser.finance import annual_savings, failure_probability, loss_per_failure
+from kaeser.fleet import LOCATIONS
+
+REPORT_CHUNK_ROWS = 5000
+
+UNIT_COLUMNS = [
+    'Unit_ID', 'Lokasi', 'Status', 'Health_Score', 'Power_Consumption_kW', 'Failure_Probability',
+    'Direct_Loss_Rp', 'Indirect_Loss_Rp', 'Total_Potential_Loss_Rp', 'Risk_Adjusted_Loss_Rp',
+    'CAPEX_Share_Rp', 'Annual_Savings_Rp', 'Annual_Value_Rp', 'ROI_Percent', 'Payback_Months',
+]
+SUM_COLUMNS = ['Power_Consumption_kW', 'Direct_Loss_Rp', 'Indirect_Loss_Rp', 'Total_Potential_Loss_Rp',
+               'Risk_Adjusted_Loss_Rp', 'CAPEX_Share_Rp', 'Annual_Savings_Rp', 'Annual_Value_Rp']
+REGION_COLUMNS = ['Lokasi', 'Units', 'Critical_Units', 'Avg_Health_Score', 'Avg_Failure_Probability',
+                  *SUM_COLUMNS, 'ROI_Percent', 'Payback_Months']
+REPORT_FILES = {
+    'units_csv': 'unit_report.csv',
+    'units_parquet': 'unit_report.parquet',
+    'regions_csv': 'region_report.csv',
+    'summary_pdf': 'executive_summary.pdf',
+}
+
+
+def unit_rows(chunk, params, mean_kw):
+    """Loss and ROI columns for one chunk of fleet rows.
+
+    ``params`` holds the Finance page inputs (downtime_cost, repair_cost,
+    affected_hours, capex_savings, energy_savings, maintenance_savings,
+    admin_fee). CAPEX and savings are those of a unit drawing the fleet's
+    mean rated power ``mean_kw`` and scale with each unit's power; the
+    avoided risk-adjusted loss counts towards the unit's annual value.
+    """
+    health = chunk['Health_Score'].to_numpy(dtype=float)
+    power = chunk['Power_Consumption_kW'].to_numpy(dtype=float)
+    probability = failure_probability(health)
+    losses = loss_per_failure(params['downtime_cost'], params['affected_hours'], params['repair_cost'])
+    direct, indirect, total = (np.full(len(chunk), loss, dtype=float) for loss in losses)
+    risk_adjusted = total * probability
+
+    scale = power / mean_kw if mean_kw else np.zeros(len(chunk))
+    capex = params['capex_savings'] * scale
+    savings = annual_savings(params['energy_savings'], params['maintenance_savings'],
+                             params['capex_savings'], params['admin_fee']) * scale
+    value = savings + risk_adjusted
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(capex > 0, value / capex * 100, np.nan)
+        payback = np.where(value > 0, capex / value * 12, np.nan)
+
+    return pd.DataFrame({
+        'Unit_ID': chunk['Unit_ID'].to_numpy(),
+        'Lokasi': chunk['Lokasi'].to_numpy(),
+        'Status': chunk['Status'].to_numpy(),
+        'Health_Score': chunk['Health_Score'].to_numpy(),
+        'Power_Consumption_kW': power,
+        'Failure_Probability': probability.round(4),
+        'Direct_Loss_Rp': direct.round(0),
+        'Indirect_Loss_Rp': indirect.round(0),
+        'Total_Potential_Loss_Rp': total.round(0),
+        'Risk_Adjusted_Loss_Rp': risk_adjusted.round(0),
+        'CAPEX_Share_Rp': capex.round(0),
+        'Annual_Savings_Rp': savings.round(0),
+        'Annual_Value_Rp': value.round(0),
+        'ROI_Percent': roi.round(1),
+        'Payback_Months': payback.round(1),
+    }, columns=UNIT_COLUMNS)
+
+
+class RegionTotals:
+    """Per-region running sums over report chunks."""
+
+    def __init__(self, regions=LOCATIONS):
+        self.regions = list(regions)
+        self.units = np.zeros(len(self.regions), dtype=np.int64)
+        self.critical = np.zeros(len(self.regions), dtype=np.int64)
+        self.health = np.zeros(len(self.regions))
+        self.probability = np.zeros(len(self.regions))
+        self.sums = np.zeros((len(self.regions), len(SUM_COLUMNS)))
+
+    def add(self, rows):
+        codes = pd.Index(self.regions).get_indexer(rows['Lokasi'])
+        new = np.unique(rows['Lokasi'].to_numpy()[codes < 0])
+        if len(new):
+            # Imported units may carry regions outside the built-in list
+            self.regions.extend(new.tolist())
+            grow = len(new)
+            self.units = np.concatenate([self.units, np.zeros(grow, dtype=np.int64)])
+            self.critical = np.concatenate([self.critical, np.zeros(grow, dtype=np.int64)])
+            self.health = np.concatenate([self.health, np.zeros(grow)])
+            self.probability = np.concatenate([self.probability, np.zeros(grow)])
+            self.sums = np.vstack([self.sums, np.zeros((grow, len(SUM_COLUMNS)))])
+            codes = pd.Index(self.regions).get_indexer(rows['Lokasi'])
+        n = len(self.regions)
+        self.units += np.bincount(codes, minlength=n)
+        self.critical += np.bincount(codes, weights=(rows['Status'] == 'Critical').to_numpy(), minlength=n).astype(np.int64)
+        self.health += np.bincount(codes, weights=rows['Health_Score'].to_numpy(dtype=float), minlength=n)
+        self.probability += np.bincount(codes, weights=rows['Failure_Probability'].to_numpy(dtype=float), minlength=n)
+        for j, col in enumerate(SUM_COLUMNS):
+            self.sums[:, j] += np.bincount(codes, weights=rows[col].to_numpy(dtype=float), minlength=n)
+
+    def frame(self):
+        units = np.maximum(self.units, 1)
+        df = pd.DataFrame(self.sums.round(0), columns=SUM_COLUMNS)
+        df.insert(0, 'Lokasi', self.regions)
+        df.insert(1, 'Units', self.units)
+        df.insert(2, 'Critical_Units', self.critical)
+        df.insert(3, 'Avg_Health_Score', (self.health / units).round(1))
+        df.insert(4, 'Avg_Failure_Probability', (self.probability / units).round(4))
+        capex, value = df['CAPEX_Share_Rp'].to_numpy(), df['Annual_Value_Rp'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['ROI_Percent'] = np.where(capex > 0, value / capex * 100, np.nan).round(1)
+            df['Payback_Months'] = np.where(value > 0, capex / value * 12, np.nan).round(1)
+        return df[df['Units'] > 0].reset_index(drop=True)[REGION_COLUMNS]
+
+
+def _summary_page(fig, regions, generated_at, parameter_table):
+    """Title, headline figures and the input parameter table."""
+    total_units = int(regions['Units'].sum())
+    fig.text(0.5, 0.95, 'Kaeser Fleet — Financial Executive Summary', ha='center', fontsize=16, weight='bold')
+    fig.text(0.5, 0.92, f'Generated {generated_at:%Y-%m-%d %H:%M} · {total_units:,} units', ha='center', fontsize=9, color='#6b7280')
+    capex, value = regions['CAPEX_Share_Rp'].sum(), regions['Annual_Value_Rp'].sum()
+    headline = [
+        ('Risk-adjusted fleet loss', f"Rp {regions['Risk_Adjusted_Loss_Rp'].sum():,.0f}"),
+        ('Total potential loss', f"Rp {regions['Total_Potential_Loss_Rp'].sum():,.0f}"),
+        ('Annual value (savings + avoided loss)', f'Rp {value:,.0f}'),
+        ('Fleet ROI', f'{value / capex * 100:.1f}%' if capex else 'n/a'),
+        ('Payback period', f'{capex / value * 12:.1f} months' if value else 'n/a'),
+        ('Critical units', f"{int(regions['Critical_Units'].sum()):,}"),
+    ]
+    for i, (label, text) in enumerate(headline):
+        y = 0.85 - i * 0.04
+        fig.text(0.1, y, label, fontsize=11)
+        fig.text(0.9, y, text, fontsize=11, ha='right', weight='bold')
+    ax = fig.add_axes([0.1, 0.05, 0.8, 0.5])
+    ax.axis('off')
+    ax.set_title('Input Parameters', fontsize=12, loc='left')
+    table = ax.table(cellText=parameter_table.values.tolist(), colLabels=list(parameter_table.columns),
+                     loc='upper center', cellLoc='left', colWidths=[0.6, 0.4])
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+
+
+def _image_page(fig, images):
+    """Stack cached PNG charts vertically on one page."""
+    from matplotlib.image import imread
+
+    for i, (title, png) in enumerate(images):
+        height = 0.9 / len(images)
+        ax = fig.add_axes([0.05, 0.95 - (i + 1) * height, 0.9, height - 0.02])
+        ax.imshow(imread(io.BytesIO(png), format='png'))
+        ax.set_title(title, fontsize=11, loc='left')
+        ax.axis('off')
+
+
+def _region_table_page(fig, regions):
+    columns = ['Lokasi', 'Units', 'Critical_Units', 'Avg_Health_Score',
+               'Risk_Adjusted_Loss_Rp', 'Annual_Value_Rp', 'ROI_Percent', 'Payback_Months']
+    labels = ['Region', 'Units', 'Critical', 'Avg Health', 'Risk-adj. Loss (Rp M)',
+              'Annual Value (Rp M)', 'ROI %', 'Payback (mo)']
+    cells = []
+    for row in regions[columns].itertuples(index=False):
+        cells.append([row[0], f'{row[1]:,}', f'{row[2]:,}', f'{row[3]:.1f}', f'{row[4] / 1e6:,.1f}',
+                      f'{row[5] / 1e6:,.1f}', f'{row[6]:.1f}', f'{row[7]:.1f}'])
+    ax = fig.add_axes([0.05, 0.05, 0.9, 0.85])
+    ax.axis('off')
+    ax.set_title('Loss & ROI by Region', fontsize=12, loc='left')
+    table = ax.table(cellText=cells, colLabels=labels, loc='upper center', cellLoc='right')
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+
+
+def region_charts(regions):
+    """Cached PNG bytes of the per-region loss and ROI charts."""
+    from kaeser.charts import cached_chart
+
+    def draw_loss(ax):
+        ax.barh(regions['Lokasi'], regions['Risk_Adjusted_Loss_Rp'] / 1e6, color='#ef4444')
+        ax.set_xlabel('Risk-adjusted Loss (Rp M)')
+        ax.invert_yaxis()
+        ax.grid(True, axis='x', alpha=0.3)
+
+    def draw_roi(ax):
+        ax.bar(regions['Lokasi'], regions['ROI_Percent'], color='#10b981')
+        ax.set_ylabel('ROI (%)')
+        ax.grid(True, axis='y', alpha=0.3)
+
+    data = regions[['Lokasi', 'Risk_Adjusted_Loss_Rp', 'ROI_Percent']]
+    return [
+        ('Risk-adjusted Loss by Region', cached_chart('report_region_loss', draw_loss, data, figsize=(10, 4))),
+        ('ROI by Region', cached_chart('report_region_roi', draw_roi, data, figsize=(10, 4))),
+    ]
+
+
+def write_summary_pdf(path, regions, parameter_table, charts=(), generated_at=None):
+    """Executive summary PDF: headline page, chart pages (cached PNGs), region table."""
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    generated_at = generated_at or pd.Timestamp.now()
+    images = [*charts, *region_charts(regions)]
+    pages = [lambda fig: _summary_page(fig, regions, generated_at, parameter_table)]
+    for i in range(0, len(images), 2):
+        pages.append(lambda fig, batch=images[i:i + 2]: _image_page(fig, batch))
+    pages.append(lambda fig: _region_table_page(fig, regions))
+
+    with PdfPages(path) as pdf:
+        for draw in pages:
+            fig = Figure(figsize=(8.27, 11.69))  # A4 portrait
+            try:
+                draw(fig)
+                pdf.savefig(fig)
+            finally:
+                fig.clear()
+        info = pdf.infodict()
+        info['Title'] = 'Kaeser Fleet Financial Executive Summary'
+
+
+class ReportJob:
+    """Builds the fleet report files on a background thread.
+
+    One report at a time per process; ``start`` returns False while one is
+    running. Files of the latest report live under ``<root>/<report id>/``
+    and the previous report is removed when a new one starts.
+    """
+
+    def __init__(self, store, root, chunksize=REPORT_CHUNK_ROWS):
+        self.store = store
+        self.root = root
+        self.chunksize = chunksize
+        self._lock = threading.Lock()
+        self._status = {'state': 'idle', 'rows': 0, 'total': 0, 'files': {}, 'error': None,
+                        'started_at': None, 'finished_at': None}
+        os.makedirs(root, exist_ok=True)
+
+    def start(self, params, parameter_table, charts=()):
+        """Start a report for the Finance page inputs ``params``.
+
+        ``parameter_table`` (Parameter / Value rows) goes on the summary page
+        and ``charts`` are (title, PNG bytes) pairs from the figure cache.
+        """
+        with self._lock:
+            if self._status['state'] == 'running':
+                return False
+            previous = self._status.get('dir')
+            report_dir = os.path.join(self.root, f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}")
+            self._status = {'state': 'running', 'rows': 0, 'total': self.store.count(), 'files': {},
+                            'error': None, 'started_at': time.time(), 'finished_at': None, 'dir': report_dir}
+        if previous:
+            shutil.rmtree(previous, ignore_errors=True)
+        threading.Thread(target=self._run, args=(report_dir, dict(params), parameter_table.copy(), list(charts)),
+                         name='fleet-report', daemon=True).start()
+        return True
+
+    def _run(self, report_dir, params, parameter_table, charts):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(report_dir, exist_ok=True)
+        paths = {name: os.path.join(report_dir, filename) for name, filename in REPORT_FILES.items()}
+        writer = None
+        try:
+            # Scaling needs the fleet's mean rated power before the first chunk
+            power = [(float(chunk['Power_Consumption_kW'].sum()), len(chunk)) for chunk in self.store.iter_chunks(50000)]
+            total_kw, n_units = (sum(column) for column in zip(*power)) if power else (0.0, 0)
+            mean_kw = total_kw / n_units if n_units else 0.0
+            totals = RegionTotals()
+            with open(paths['units_csv'], 'w', encoding='utf-8', newline='') as csv_out:
+                for i, chunk in enumerate(self.store.iter_chunks(self.chunksize)):
+                    rows = unit_rows(chunk, params, mean_kw)
+                    rows.to_csv(csv_out, index=False, header=(i == 0))
+                    table = pa.Table.from_pandas(rows, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(paths['units_parquet'], table.schema)
+                    writer.write_table(table.cast(writer.schema))
+                    totals.add(rows)
+                    with self._lock:
+                        self._status['rows'] += len(rows)
+                if writer is None:
+                    empty = pd.DataFrame(columns=UNIT_COLUMNS)
+                    empty.to_csv(csv_out, index=False)
+                    pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), paths['units_parquet'])
+            if writer is not None:
+                writer.close()
+                writer = None
+
+            regions = totals.frame()
+            regions.to_csv(paths['regions_csv'], index=False)
+            write_summary_pdf(paths['summary_pdf'], regions, parameter_table, charts)
+            with self._lock:
+                self._status.update(state='done', files=paths, regions=regions, finished_at=time.time())
+        except Exception as exc:
+            with self._lock:
+                self._status.update(state='failed', error=f'{type(exc).__name__}: {exc}', finished_at=time.time())
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def status(self):
+        """Copy of the job state: state (idle/running/done/failed), rows, total, files, error."""
+        with self._lock:
+            return dict(self._status)
+
+    def wait(self, timeout=None):
+        """Block until the running report finishes (scripts and benchmarks)."""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.status()['state'] == 'running' and (deadline is None or time.time() < deadline):
+            time.sleep(0.05)
+        return self.status()
@@ -0,0 +1,200 @@
+"""Process-wide shared resources for the dashboard (``st.cache_resource``).
+
+Heavy dependencies (scikit-learn) are imported inside the getters, so they
+load only when a page that needs them renders for the first time.
+"""
+import os
+
+import streamlit as st
+
+from kaeser.aggregates import FleetAggregates
+from kaeser.archive import TelemetryArchive
+from kaeser.config import (ARCHIVE_DIR, ARCHIVE_RETENTION_DAYS, DATA_DIR, ENERGY_HISTORY_DAYS, FLEET_SIZE,
+                           METRICS_PORT, MODEL_MEMORY_BUDGET_MB, SIMULATED_FEED_HZ, TELEMETRY_CAPACITY,
+                           TELEMETRY_DIR, TELEMETRY_PORT)
+from kaeser.fleet import generate_fleet
+from kaeser.metrics import metrics, serve_metrics, tracked
+from kaeser.store import FleetStore
+from kaeser.streaming import StreamingDetector
+from kaeser.telemetry import SimulatedFeed, TelemetryHub
+
+
+# --- ENHANCED DUMMY DATA GENERATOR WITH EXPLICIT FORMULAS ---
+# Health Score = 100 - (Age_Penalty + Usage_Penalty + Maintenance_Penalty)
+# Age_Penalty = (Days_Since_Last_Service / 365) * 40
+# Usage_Penalty = 0 .. 20 from operational hours (8 .. 24 h/day)
+# Maintenance_Penalty = 0 .. 15 from the live anomaly rate (random in the seed data)
+# (vectorized implementation lives in kaeser/fleet.py; kept current by kaeser/health.py)
+def load_enterprise_data(n_units=FLEET_SIZE, seed=None):
+    return generate_fleet(n_units, seed)
+
+
+# Instrumentation endpoint (/metrics, /metrics.json) on a local port, when enabled
+@tracked(st.cache_resource)
+def get_metrics_server():
+    return serve_metrics(port=METRICS_PORT) if METRICS_PORT else None
+
+
+# One SQLite-backed store per server process, shared by every session.
+# An empty database is seeded with the synthetic fleet on first start.
+@tracked(st.cache_resource)
+def get_fleet_store():
+    store = FleetStore(os.path.join(DATA_DIR, 'fleet.db'))
+    store.seed(load_enterprise_data())
+    return store
+
+
+# Fitted anomaly models (any detector backend), shared by all sessions (LRU under a memory budget)
+@tracked(st.cache_resource)
+def get_model_registry():
+    from kaeser.models import ModelRegistry
+    registry = ModelRegistry(memory_budget=MODEL_MEMORY_BUDGET_MB * 1024 * 1024)
+    metrics.add_collector('model_registry', registry.stats)
+    return registry
+
+
+# Engineered feature matrices per unit and feature set (reused until new data arrives)
+@tracked(st.cache_resource)
+def get_feature_cache():
+    from kaeser.features import FeatureCache
+    cache = FeatureCache()
+    metrics.add_collector('feature_cache', cache.stats)
+    return cache
+
+
+# Historical telemetry on disk (memmapped per unit and day), or None when disabled
+@tracked(st.cache_resource)
+def get_telemetry_archive():
+    if not ARCHIVE_DIR:
+        return None
+    archive = TelemetryArchive(ARCHIVE_DIR, retention_days=ARCHIVE_RETENTION_DAYS)
+    metrics.add_collector('telemetry_archive', archive.stats)
+    return archive
+
+
+# Online per-sample anomaly scoring behind the live alerts (sidebar and Executive Dashboard)
+@tracked(st.cache_resource)
+def get_streaming_detector():
+    detector = StreamingDetector()
+    metrics.add_collector('streaming_detector', detector.stats)
+    return detector
+
+
+# Sensor telemetry ring buffers, fed on background threads (archived to disk and
+# scored by the streaming detector on the way in), pruned as units are removed
+@tracked(st.cache_resource)
+def get_telemetry_hub():
+    hub = TelemetryHub(capacity=TELEMETRY_CAPACITY, archive=get_telemetry_archive(),
+                       detector=get_streaming_detector())
+    hub.track_fleet(get_fleet_store())
+    if TELEMETRY_DIR:
+        hub.watch_directory(TELEMETRY_DIR)
+    if TELEMETRY_PORT:
+        hub.serve_socket(port=TELEMETRY_PORT)
+    if SIMULATED_FEED_HZ > 0:
+        SimulatedFeed(hub, get_fleet_store().snapshot, rate_hz=SIMULATED_FEED_HZ)
+    return hub
+
+
+# Fleet-wide anomaly pass (one IsolationForest per unit, spread over a worker pool
+# kept for the app's lifetime). Runs on a background thread and refreshes once a
+# minute or when the fleet changes, at most every 30s, so pages never wait on it
+# (and never import sklearn on the script thread). Its per-unit anomaly rates feed
+# the maintenance planner; alerts come from the streaming detector only.
+@tracked(st.cache_resource)
+def get_fleet_scoring_job(window=500):
+    from kaeser.batch import FleetScoringJob
+
+    def windows():
+        unit_ids = get_fleet_store().snapshot()['Unit_ID'].tolist()
+        return get_telemetry_hub().windows(unit_ids, window)
+    return FleetScoringJob(windows, ttl=60, min_interval=30)
+
+
+# Health scores recomputed from service dates, hours and live anomaly rates on a
+# background thread (only units whose inputs changed are rescored and written)
+@tracked(st.cache_resource)
+def get_health_engine():
+    from kaeser.health import HealthEngine
+    engine = HealthEngine(get_fleet_store(), rates_source=get_streaming_detector().rates)
+    metrics.add_collector('health_engine', engine.stats)
+    return engine
+
+
+# Fleet KPIs kept current by a background thread (pages read O(1) snapshots)
+@tracked(st.cache_resource)
+def get_fleet_aggregates():
+    return FleetAggregates(get_fleet_store())
+
+
+# Map cluster layers for every zoom level, rebuilt only when the fleet changes
+@tracked(st.cache_data(max_entries=4, show_spinner=False))
+def get_cluster_index(fleet_revision):
+    from kaeser.geo import build_cluster_index
+    return build_cluster_index(get_fleet_store().snapshot())
+
+
+# Predictive maintenance plan, recomputed only when the fleet, the latest anomaly
+# rates or the planning settings change
+@tracked(st.cache_data(max_entries=8, show_spinner=False))
+def get_maintenance_plan(fleet_revision, anomaly_rates, horizon_days, jobs_per_technician):
+    from kaeser.scheduler import schedule_maintenance
+    return schedule_maintenance(get_fleet_store().snapshot(), anomaly_rates,
+                                horizon_days=horizon_days, jobs_per_technician=jobs_per_technician)
+
+
+# Per-unit reductions of the memory-mapped 1-minute power history, keyed on the
+# digest of the simulation inputs (PowerHistory.history_key), so edits to other
+# columns (health scores, status, location) reuse the cached reductions. The
+# history file is re-simulated only when unit power/hours change or a new day starts.
+@tracked(st.cache_resource(max_entries=2, show_spinner=False))
+def get_unit_energy(inputs_key, day):
+    from kaeser.energy import PowerHistory
+    history = PowerHistory.build(os.path.join(DATA_DIR, 'energy', 'power.f32'), get_fleet_store().snapshot(),
+                                 days=ENERGY_HISTORY_DAYS, end=day)
+    return history.reduce()
+
+
+# Fleet loss / ROI reports (CSV, Parquet, PDF) built on a background thread
+@tracked(st.cache_resource)
+def get_report_job():
+    from kaeser.reports import ReportJob
+    return ReportJob(get_fleet_store(), os.path.join(DATA_DIR, 'reports'))
+
+
+# Monte Carlo fleet loss distribution per region, rerun only when the fleet or
+# the simulation inputs change
+@tracked(st.cache_data(max_entries=8, show_spinner=False))
+def get_loss_simulation(fleet_revision, downtime_cost, affected_hours, repair_cost, n_sims, hours_cv, repair_cv):
+    from kaeser.finance import region_loss_table, risk_groups, simulate_losses
+    regions, probabilities, counts = risk_groups(get_fleet_store().snapshot())
+    losses = simulate_losses(counts, probabilities, downtime_cost, affected_hours, repair_cost, n_sims,
+                             hours_cv=hours_cv, repair_cv=repair_cv, seed=42)
+    return region_loss_table(regions, counts, probabilities, losses), losses.sum(axis=1)
+
+
+# Energy savings over a grid of hours x power x optimization rate (and every fleet
+# unit), evaluated once per distinct set of sweep inputs
+@tracked(st.cache_data(max_entries=8, show_spinner=False))
+def get_savings_sweep(fleet_revision, hours_range, power_range, hours_step, power_step):
+    import numpy as np
+
+    from kaeser.energy import savings_sweep
+    hours = np.arange(hours_range[0], hours_range[1] + hours_step / 2, hours_step)
+    power_kw = np.arange(power_range[0], power_range[1] + power_step / 2, power_step)
+    return savings_sweep(hours, power_kw, np.arange(0, 31), get_fleet_store().snapshot())
+
+
+# Detector backends compared on labelled synthetic readings for one unit, recomputed
+# only when the comparison settings change
+@tracked(st.cache_data(max_entries=8, show_spinner=False))
+def get_detector_evaluation(unit_id, feature_set, fleet_values, n_samples, anomaly_rate, contamination,
+                            recall_target):
+    from kaeser.detectors import evaluate_detectors
+    from kaeser.features import FEATURE_SETS, FLEET_FEATURE_COLUMNS, compute_features, feature_matrix
+    from kaeser.sensors import simulate_labelled_readings
+    readings = simulate_labelled_readings(unit_id, n=n_samples, anomaly_rate=anomaly_rate)
+    features = compute_features(readings['Suhu'].to_numpy(), readings['Tekanan'].to_numpy(), [len(readings)],
+                                dict(zip(FLEET_FEATURE_COLUMNS, fleet_values)))
+    X = feature_matrix(features, FEATURE_SETS[feature_set])
+    return evaluate_detectors(X, readings['Anomali'].to_numpy(), contamination, recall_target)
@@ -0,0 +1,78 @@
+"""Date-bucketed rollups for calendar views.
+
+Dates are reduced to integer bucket keys (days, Monday-based weeks or
+months since the epoch) with NumPy datetime arithmetic, and counts or sums
+for every bucket in the range are produced by a single ``np.bincount``.
+"""
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = ['Day', 'Week', 'Month']
+
+
+def bucket_keys(dates, freq='Day'):
+    """Integer bucket key of each date (time of day ignored)."""
+    days = np.asarray(dates, dtype='datetime64[D]')
+    if freq == 'Day':
+        return days.astype(np.int64)
+    if freq == 'Week':
+        # 1970-01-01 was a Thursday: shifting by 3 days makes weeks start on Monday
+        return (days.astype(np.int64) + 3) // 7
+    if freq == 'Month':
+        return days.astype('datetime64[M]').astype(np.int64)
+    raise ValueError(f"Unknown frequency {freq!r}, expected one of {FREQUENCIES}")
+
+
+def bucket_starts(keys, freq='Day'):
+    """First day of each bucket key, as a DatetimeIndex."""
+    keys = np.asarray(keys, dtype=np.int64)
+    if freq == 'Day':
+        starts = keys.astype('datetime64[D]')
+    elif freq == 'Week':
+        starts = (keys * 7 - 3).astype('datetime64[D]')
+    elif freq == 'Month':
+        starts = keys.astype('datetime64[M]').astype('datetime64[D]')
+    else:
+        raise ValueError(f"Unknown frequency {freq!r}, expected one of {FREQUENCIES}")
+    return pd.DatetimeIndex(starts.astype('datetime64[ns]'))
+
+
+def rollup(dates, start, end, freq='Day', weights=None, groups=None, group_labels=None):
+    """Count (or sum ``weights``) per bucket from ``start`` to ``end`` inclusive.
+
+    Every bucket in the range appears, empty ones as 0. With ``groups`` (one
+    label per date) the result has one column per group, built in the same
+    bincount pass; otherwise it has a single ``Count`` / ``Total`` column.
+    """
+    keys = bucket_keys(dates, freq)
+    first, last = bucket_keys([start, end], freq)
+    n_buckets = int(last - first + 1)
+    offset = keys - first
+    mask = (offset >= 0) & (offset < n_buckets)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)[mask]
+    offset = offset[mask]
+
+    if groups is None:
+        totals = np.bincount(offset, weights=weights, minlength=n_buckets)
+        columns = ['Total' if weights is not None else 'Count']
+        values = totals[:, None]
+    else:
+        codes, labels = pd.factorize(np.asarray(groups)[mask], sort=True)
+        if group_labels is not None:
+            # Fixed column order; dates whose group is not listed are dropped
+            codes = pd.Index(group_labels).get_indexer(labels)[codes]
+            listed = codes >= 0
+            codes, offset = codes[listed], offset[listed]
+            if weights is not None:
+                weights = weights[listed]
+            labels = list(group_labels)
+        n_groups = len(labels)
+        flat = np.bincount(offset * n_groups + codes, weights=weights, minlength=n_buckets * n_groups)
+        values = flat.reshape(n_buckets, n_groups)
+        columns = list(labels)
+
+    if weights is None:
+        values = values.astype(np.int64)
+    index = bucket_starts(np.arange(first, last + 1), freq)
+    return pd.DataFrame(values, index=index.rename('Date'), columns=columns)
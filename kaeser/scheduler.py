@@ -0,0 +1,155 @@
+"""Predictive maintenance scheduler.
+
+Failure dates are predicted for every unit x component with one broadcast
+over the fleet, then the resulting jobs are packed into per-region
+technician capacity (jobs per day) in priority order. Finding the first day
+with free capacity uses a union-find "next free day" pointer per region, so
+packing is near-linear in the number of jobs.
+"""
+import numpy as np
+import pandas as pd
+
+# Component -> (nominal life in days at full health, base repair cost Rp)
+COMPONENTS = {
+    'Air Filter': (365, 2500000),
+    'Oil Separator': (540, 8500000),
+    'Motor Bearing': (900, 12500000),
+    'Coupling': (720, 4500000),
+    'Cooling System': (600, 3200000),
+    'Pressure Valve': (800, 6800000),
+    'Control Board': (1460, 9500000),
+    'Compressor Unit': (1825, 18500000),
+}
+
+# How strongly each stress source shortens a component's life (multipliers on
+# usage penalty / 20, maintenance penalty / 15 and anomaly rate / 0.25)
+STRESS_WEIGHTS = {
+    'Air Filter': (0.6, 0.2, 0.2),
+    'Oil Separator': (0.4, 0.5, 0.3),
+    'Motor Bearing': (0.5, 0.3, 0.8),
+    'Coupling': (0.4, 0.2, 0.6),
+    'Cooling System': (0.3, 0.4, 0.8),
+    'Pressure Valve': (0.2, 0.3, 1.0),
+    'Control Board': (0.1, 0.1, 0.5),
+    'Compressor Unit': (0.4, 0.4, 0.6),
+}
+
+# Days to predicted failure -> risk level (upper bounds, inclusive)
+RISK_LEVELS = [(14, 'Critical'), (45, 'High'), (120, 'Medium')]
+RISK_ORDER = {'Critical': 0, 'High': 1, 'Medium': 2, 'Low': 3}
+
+UNITS_PER_TECHNICIAN = 10
+LEAD_DAYS = 14  # jobs are released this many days before the predicted failure
+
+SCHEDULE_COLUMNS = [
+    'Unit_ID', 'Location', 'Component', 'Predicted_Failure', 'Scheduled_Date', 'Technician',
+    'Health_Score', 'Risk_Level', 'Estimated_Cost_Rp', 'Days_Late',
+]
+
+
+def predict_failures(fleet, anomaly_rates=None, today=None):
+    """Days until failure for every unit x component (shape units x components).
+
+    Remaining life = nominal life x Health_Score/100 / stress - days since the
+    last service, where stress grows with the usage and maintenance penalties
+    and the unit's live anomaly rate. Overdue components are clipped to 0.
+    """
+    today = pd.Timestamp.now().normalize() if today is None else today
+    life = np.array([life for life, _ in COMPONENTS.values()], dtype=float)
+    weights = np.array(list(STRESS_WEIGHTS.values()))                     # (C, 3)
+
+    health = fleet['Health_Score'].to_numpy(dtype=float) / 100
+    days_since = ((today - fleet['Last_Service'].dt.normalize()).dt.days).to_numpy(dtype=float)
+    anomaly = np.zeros(len(fleet))
+    if anomaly_rates is not None:
+        anomaly = fleet['Unit_ID'].map(anomaly_rates).fillna(0).to_numpy(dtype=float)
+    load = np.stack([
+        fleet['Usage_Penalty'].to_numpy(dtype=float) / 20,
+        fleet['Maintenance_Penalty'].to_numpy(dtype=float) / 15,
+        anomaly / 0.25,
+    ], axis=1)                                                            # (U, 3)
+
+    stress = 1 + load @ weights.T                                         # (U, C)
+    remaining = life * health[:, None] / stress - days_since[:, None]
+    return np.maximum(remaining, 0).astype(int)
+
+
+def classify_risk(days_to_failure):
+    days = np.asarray(days_to_failure)
+    return np.select([days <= limit for limit, _ in RISK_LEVELS], [level for _, level in RISK_LEVELS], default='Low')
+
+
+def _pack(region_codes, release, n_regions, capacity):
+    """Assign each job (already in priority order) the first day >= release with
+    a free slot in its region. Returns (day, slot) arrays."""
+    # parent[r] maps a full day to a later day that may still have capacity;
+    # days absent from it are their own root, so memory grows with the jobs
+    # placed rather than with the scheduling horizon
+    parent = [{} for _ in range(n_regions)]
+    used = [{} for _ in range(n_regions)]
+    days = np.empty(len(release), dtype=np.int64)
+    slots = np.empty(len(release), dtype=np.int64)
+
+    for i, (r, d) in enumerate(zip(region_codes.tolist(), release.tolist())):
+        par, count = parent[r], used[r]
+        root = d
+        while root in par:
+            root = par[root]
+        while d in par and par[d] != root:  # path compression
+            par[d], d = root, par[d]
+        taken = count.get(root, 0)
+        slots[i], days[i] = taken, root
+        count[root] = taken + 1
+        if taken + 1 >= capacity[r]:
+            par[root] = root + 1
+    return days, slots
+
+
+def schedule_maintenance(fleet, anomaly_rates=None, horizon_days=180, jobs_per_technician=2,
+                         units_per_technician=UNITS_PER_TECHNICIAN, lead_days=LEAD_DAYS, today=None):
+    """Predict component failures and pack the resulting jobs into technician slots.
+
+    Every component predicted to fail within ``horizon_days`` becomes a job.
+    Each region gets ceil(units / ``units_per_technician``) technicians doing
+    ``jobs_per_technician`` jobs a day. Jobs are taken in priority order
+    (earliest failure, then lowest Health_Score) and placed on the first day
+    from ``lead_days`` before their failure date with a free slot; jobs that
+    cannot be placed before failing carry a positive ``Days_Late``.
+    """
+    today = pd.Timestamp.now().normalize() if today is None else today
+    components = np.array(list(COMPONENTS), dtype=object)
+    costs = np.array([cost for _, cost in COMPONENTS.values()], dtype=float)
+
+    days_to_failure = predict_failures(fleet, anomaly_rates, today)
+    unit_idx, comp_idx = np.nonzero(days_to_failure <= horizon_days)
+    due = days_to_failure[unit_idx, comp_idx]
+    health = fleet['Health_Score'].to_numpy()[unit_idx]
+
+    order = np.lexsort((health, due))
+    unit_idx, comp_idx, due, health = unit_idx[order], comp_idx[order], due[order], health[order]
+
+    region_codes, regions = pd.factorize(fleet['Lokasi'].to_numpy()[unit_idx])
+    fleet_regions = fleet['Lokasi'].value_counts()
+    technicians = np.ceil(fleet_regions.reindex(regions).to_numpy() / units_per_technician).astype(int)
+    capacity = (np.maximum(technicians, 1) * jobs_per_technician).tolist()
+
+    release = np.maximum(due - lead_days, 0)
+    days, slots = _pack(region_codes, release, len(regions), capacity)
+
+    # Jobs that fail before work starts are urgent repairs, 40% dearer
+    power_factor = fleet['Power_Consumption_kW'].to_numpy()[unit_idx] / 100
+    cost = costs[comp_idx] * power_factor * np.where(days > due, 1.4, 1.0)
+    technician_no = np.char.mod('%02d', slots // jobs_per_technician + 1)  # zfill fails on an empty schedule
+
+    return pd.DataFrame({
+        'Unit_ID': fleet['Unit_ID'].to_numpy()[unit_idx],
+        'Location': regions[region_codes],
+        'Component': components[comp_idx],
+        'Predicted_Failure': today + pd.to_timedelta(due, unit='D'),
+        'Scheduled_Date': today + pd.to_timedelta(days, unit='D'),
+        'Technician': np.char.add(np.char.add(regions[region_codes].astype(str), '-T'), technician_no),
+        'Health_Score': health,
+        'Risk_Level': classify_risk(due),
+        'Estimated_Cost_Rp': cost.round(-3),
+        'Days_Late': np.maximum(days - due, 0),
+    }, columns=SCHEDULE_COLUMNS).sort_values(['Scheduled_Date', 'Predicted_Failure'], kind='stable', ignore_index=True)
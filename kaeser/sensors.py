@@ -0,0 +1,61 @@
+"""Synthetic Suhu (temperature) / Tekanan (pressure) readings.
+
+Readings are seeded from the Unit_ID, so the same unit always produces the
+same series and a fitted model can be reused across reruns.
+"""
+import zlib
+
+import numpy as np
+import pandas as pd
+
+MIN_ANOMALY_RATE = 0.02
+MAX_ANOMALY_RATE = 0.25
+EQUIPMENT_LIFE_YEARS = 5.0
+
+
+def unit_seed(unit_id):
+    return zlib.crc32(str(unit_id).encode('utf-8'))
+
+
+def injected_anomaly_rate(units, now=None):
+    """Share of abnormal readings per unit: ~2% when new and lightly used, up to 25% when worn.
+
+    Wear comes only from static attributes: equipment age (Installation_Date,
+    full after EQUIPMENT_LIFE_YEARS), Operational_Hours_Daily and a fixed
+    per-unit factor. Never from Health_Score: the health engine turns the
+    observed anomaly rate into Maintenance_Penalty, so a score-driven rate
+    would feed back and keep lowering the scores of worn units on its own.
+    """
+    now = pd.Timestamp.now() if now is None else now
+    years = ((now - pd.to_datetime(units['Installation_Date'])).dt.days / 365).fillna(0).to_numpy(dtype=float)
+    age = np.clip(years / EQUIPMENT_LIFE_YEARS, 0, 1)
+    load = np.clip((units['Operational_Hours_Daily'].to_numpy(dtype=float) - 8) / 16, 0, 1)
+    unit_factor = np.array([unit_seed(unit_id) % 1000 for unit_id in units['Unit_ID']], dtype=float) / 999
+    wear = 0.4 * age + 0.3 * load + 0.3 * unit_factor
+    return MIN_ANOMALY_RATE + (MAX_ANOMALY_RATE - MIN_ANOMALY_RATE) * wear
+
+
+def simulate_readings(unit_id, n=500, anomaly_rate=0.1, seed=None):
+    rng = np.random.default_rng(unit_seed(unit_id) if seed is None else seed)
+
+    # Normal operation: ~70°C, ~7 bar
+    normal_temp = rng.normal(70, 2, n)
+    normal_pressure = rng.normal(7, 0.3, n)
+
+    # Leak / overheating events
+    n_anomalies = int(n * anomaly_rate)
+    anomaly_temp = rng.normal(90, 8, n_anomalies)
+    anomaly_pressure = rng.normal(4, 1.5, n_anomalies)
+
+    return pd.DataFrame({
+        'Suhu': np.concatenate([normal_temp, anomaly_temp]),
+        'Tekanan': np.concatenate([normal_pressure, anomaly_pressure])
+    })
+
+
+def simulate_labelled_readings(unit_id, n=500, anomaly_rate=0.1, seed=None):
+    """``simulate_readings`` shuffled into time order, with a boolean ``Anomali`` label column."""
+    readings = simulate_readings(unit_id, n=n, anomaly_rate=anomaly_rate, seed=seed)
+    readings['Anomali'] = np.arange(len(readings)) >= n
+    order = np.random.default_rng(unit_seed(unit_id) if seed is None else seed).permutation(len(readings))
+    return readings.iloc[order].reset_index(drop=True)
@@ -0,0 +1,299 @@
+"""Persistent fleet repository backed by an embedded SQLite database.
+
+Units are keyed by ``Unit_ID`` (PRIMARY KEY), so insert, update and delete
+are single indexed statements. Every write also appends to a change log;
+``snapshot()`` uses it to patch the in-process fleet frame with only the
+rows that changed since the last read, instead of reloading everything.
+
+One FleetStore is meant to be shared by all Streamlit sessions of a process
+(``st.cache_resource``). Snapshots are immutable: an edit produces a new
+frame, so a session that is halfway through a rerun keeps a consistent view.
+"""
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import FLEET_COLUMNS
+
+DATETIME_COLUMNS = ['Last_Service', 'Next_Service_Due', 'Installation_Date']
+TEXT_COLUMNS = ['Unit_ID', 'Lokasi', 'Status']
+INTEGER_COLUMNS = ['Health_Score', 'Usage_Penalty', 'Maintenance_Penalty']
+
+# Keep this many change-log entries; older readers fall back to a full reload
+CHANGE_LOG_RETENTION = 10000
+
+
+def _sql_type(column):
+    if column in TEXT_COLUMNS:
+        return 'TEXT'
+    if column in INTEGER_COLUMNS or column in DATETIME_COLUMNS:
+        return 'INTEGER'  # datetimes are stored as epoch microseconds
+    return 'REAL'
+
+
+def _to_rows(df):
+    """Convert a fleet frame into tuples ordered like FLEET_COLUMNS."""
+    columns = []
+    for col in FLEET_COLUMNS:
+        values = df[col]
+        if col in DATETIME_COLUMNS:
+            values = pd.to_datetime(values).astype('datetime64[us]').astype('int64')
+        columns.append(np.asarray(values).tolist())
+    return list(zip(*columns))
+
+
+def _from_sql(df):
+    for col in DATETIME_COLUMNS:
+        df[col] = pd.to_datetime(df[col], unit='us')
+    return df
+
+
+class FleetStore:
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+        self._frame = None
+        self._revision = -1
+        self._compacted_at = 0
+        self._listeners = []
+
+    def _create_schema(self):
+        columns = ', '.join(
+            f'"{col}" {_sql_type(col)}' + (' PRIMARY KEY' if col == 'Unit_ID' else '')
+            for col in FLEET_COLUMNS
+        )
+        with self._lock:
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS fleet ({columns})')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS fleet_changes ('
+                'revision INTEGER PRIMARY KEY AUTOINCREMENT, unit_id TEXT NOT NULL, op TEXT NOT NULL)'
+            )
+
+    # --- WRITES ---
+    def _write(self, sql, rows, op, unit_ids):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                cursor = self._conn.executemany(sql, rows)
+                self._conn.executemany(
+                    'INSERT INTO fleet_changes (unit_id, op) VALUES (?, ?)',
+                    [(uid, op) for uid in unit_ids]
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        for callback in self._listeners:
+            callback()
+        return cursor.rowcount
+
+    def subscribe(self, callback):
+        """Call ``callback()`` after every committed write in this process (keep it cheap)."""
+        self._listeners.append(callback)
+
+    def insert(self, unit):
+        """Insert one unit (dict or one-row frame). Raises KeyError if the Unit_ID exists."""
+        df = pd.DataFrame([unit]) if isinstance(unit, dict) else unit
+        return self.insert_many(df)
+
+    def insert_many(self, df):
+        placeholders = ', '.join('?' for _ in FLEET_COLUMNS)
+        names = ', '.join(f'"{col}"' for col in FLEET_COLUMNS)
+        try:
+            return self._write(f'INSERT INTO fleet ({names}) VALUES ({placeholders})',
+                               _to_rows(df), 'insert', df['Unit_ID'].tolist())
+        except sqlite3.IntegrityError as exc:
+            raise KeyError(f'Unit_ID already exists: {exc}') from exc
+
+    def upsert_many(self, df):
+        """Insert new units and overwrite existing ones (by Unit_ID) in one transaction."""
+        placeholders = ', '.join('?' for _ in FLEET_COLUMNS)
+        names = ', '.join(f'"{col}"' for col in FLEET_COLUMNS)
+        assignments = ', '.join(f'"{col}" = excluded."{col}"' for col in FLEET_COLUMNS if col != 'Unit_ID')
+        return self._write(f'INSERT INTO fleet ({names}) VALUES ({placeholders}) '
+                           f'ON CONFLICT(Unit_ID) DO UPDATE SET {assignments}',
+                           _to_rows(df), 'upsert', df['Unit_ID'].tolist())
+
+    def existing_ids(self, unit_ids):
+        """The subset of ``unit_ids`` already in the fleet."""
+        unit_ids = list(unit_ids)
+        found = set()
+        with self._lock:
+            for start in range(0, len(unit_ids), 900):  # stay under SQLite's parameter limit
+                batch = unit_ids[start:start + 900]
+                marks = ', '.join('?' for _ in batch)
+                found.update(row[0] for row in self._conn.execute(
+                    f'SELECT Unit_ID FROM fleet WHERE Unit_ID IN ({marks})', batch))
+        return found
+
+    def update(self, unit_id, **fields):
+        """Update selected columns of one unit. Returns the number of rows changed."""
+        unknown = set(fields) - set(FLEET_COLUMNS) - {'Unit_ID'}
+        if unknown:
+            raise ValueError(f'Unknown fleet columns: {sorted(unknown)}')
+        values = []
+        for col, value in fields.items():
+            if col in DATETIME_COLUMNS:
+                value = int(pd.Timestamp(value).as_unit('us').value)
+            elif isinstance(value, np.generic):
+                value = value.item()
+            values.append(value)
+        assignments = ', '.join(f'"{col}" = ?' for col in fields)
+        return self._write(f'UPDATE fleet SET {assignments} WHERE Unit_ID = ?',
+                           [(*values, unit_id)], 'update', [unit_id])
+
+    def update_many(self, df):
+        """Update the columns of ``df`` (other than Unit_ID) for every unit in it, in one transaction."""
+        columns = [col for col in df.columns if col != 'Unit_ID']
+        unknown = set(columns) - set(FLEET_COLUMNS)
+        if unknown:
+            raise ValueError(f'Unknown fleet columns: {sorted(unknown)}')
+        values = []
+        for col in columns:
+            column = df[col]
+            if col in DATETIME_COLUMNS:
+                column = pd.to_datetime(column).astype('datetime64[us]').astype('int64')
+            values.append(np.asarray(column).tolist())
+        unit_ids = df['Unit_ID'].tolist()
+        assignments = ', '.join(f'"{col}" = ?' for col in columns)
+        return self._write(f'UPDATE fleet SET {assignments} WHERE Unit_ID = ?',
+                           list(zip(*values, unit_ids)), 'update', unit_ids)
+
+    def delete(self, unit_id):
+        return self.delete_many([unit_id])
+
+    def delete_many(self, unit_ids):
+        unit_ids = list(unit_ids)
+        return self._write('DELETE FROM fleet WHERE Unit_ID = ?',
+                           [(uid,) for uid in unit_ids], 'delete', unit_ids)
+
+    def seed(self, df):
+        """Bulk-load ``df`` if the fleet table is empty. Returns True if seeded."""
+        with self._lock:
+            if self.count() > 0:
+                return False
+            self.insert_many(df)
+            return True
+
+    # --- READS ---
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM fleet').fetchone()[0]
+
+    def revision(self):
+        with self._lock:
+            row = self._conn.execute('SELECT MAX(revision) FROM fleet_changes').fetchone()
+        return row[0] or 0
+
+    def next_unit_id(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(CAST(SUBSTR(Unit_ID, 6) AS INTEGER)) FROM fleet WHERE Unit_ID LIKE 'K-DX-%'"
+            ).fetchone()
+        return f'K-DX-{(row[0] or 0) + 1:03}'
+
+    def _read_units(self, where='', params=()):
+        names = ', '.join(f'"{col}"' for col in FLEET_COLUMNS)
+        df = pd.read_sql_query(f'SELECT {names} FROM fleet {where}', self._conn, params=params)
+        return _from_sql(df)
+
+    def get_units(self, unit_ids):
+        """Current rows of ``unit_ids`` (missing units are skipped), read by primary key."""
+        unit_ids = list(unit_ids)
+        with self._lock:
+            parts = [self._read_units(f'WHERE Unit_ID IN ({", ".join("?" for _ in batch)})', batch)
+                     for batch in (unit_ids[i:i + 900] for i in range(0, len(unit_ids), 900))]
+        return pd.concat(parts, ignore_index=True) if parts else self._read_units('WHERE 0')
+
+    def iter_chunks(self, chunksize=10000):
+        """Yield the fleet as DataFrames of up to ``chunksize`` rows, ordered by Unit_ID.
+
+        File databases are read through a separate connection, so a long
+        export sees one consistent WAL snapshot and does not block writers.
+        """
+        names = ', '.join(f'"{col}"' for col in FLEET_COLUMNS)
+        sql = f'SELECT {names} FROM fleet ORDER BY Unit_ID'
+        if self.path == ':memory:':
+            with self._lock:
+                chunk_source = pd.read_sql_query(sql, self._conn, chunksize=chunksize)
+                for chunk in chunk_source:
+                    yield _from_sql(chunk)
+            return
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute('BEGIN')  # hold one read snapshot for the whole export
+            cursor = conn.execute(sql)
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield _from_sql(pd.DataFrame.from_records(rows, columns=FLEET_COLUMNS))
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def changes_since(self, revision):
+        """Return ``(current_revision, changed_unit_ids, rows)`` for edits after ``revision``.
+
+        ``rows`` holds the current row of every changed unit that still exists
+        (deleted units are in ``changed_unit_ids`` only). When the change log
+        no longer reaches back to ``revision`` both are None and the caller
+        must reload the whole fleet.
+        """
+        with self._lock:
+            current = self.revision()
+            if current == revision:
+                return current, [], self._read_units('WHERE 0')
+            oldest = self._conn.execute('SELECT MIN(revision) FROM fleet_changes').fetchone()[0]
+            if revision < 0 or oldest is None or oldest > revision + 1:
+                return current, None, None
+            changed = [row[0] for row in self._conn.execute(
+                'SELECT DISTINCT unit_id FROM fleet_changes WHERE revision > ? AND revision <= ?',
+                (revision, current)
+            )]
+            fetched = self._read_units(
+                'WHERE Unit_ID IN (SELECT DISTINCT unit_id FROM fleet_changes WHERE revision > ? AND revision <= ?)',
+                (revision, current)
+            )
+            return current, changed, fetched
+
+    def snapshot(self):
+        """Return the current fleet as a shared, read-only DataFrame.
+
+        Callers must not mutate the returned frame (use ``.assign`` / copies).
+        """
+        with self._lock:
+            revision, changed, fetched = self.changes_since(self._revision)
+            if self._frame is not None and revision == self._revision:
+                return self._frame
+
+            if self._frame is None or changed is None:
+                # First read, or the change log no longer covers our revision
+                self._frame = self._read_units()
+            else:
+                kept = self._frame[~self._frame['Unit_ID'].isin(changed)]
+                self._frame = pd.concat([kept, fetched], ignore_index=True) if len(fetched) else kept.reset_index(drop=True)
+
+            self._revision = revision
+            self._compact(revision)
+            return self._frame
+
+    def _compact(self, revision):
+        if revision - self._compacted_at >= CHANGE_LOG_RETENTION:
+            self._conn.execute('DELETE FROM fleet_changes WHERE revision <= ?',
+                               (revision - CHANGE_LOG_RETENTION,))
+            self._compacted_at = revision
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,178 @@
+"""Online anomaly detection on the telemetry stream.
+
+Every sample is scored as it is ingested with a rolling robust z-score:
+|x - median| / (1.4826 * MAD) per feature, against a per-unit model (median
+and MAD of Suhu and Tekanan) fitted on the unit's sliding window of recent
+samples. Models are refreshed every ``refresh_every`` samples, so scoring a
+batch is a handful of vectorized array operations for the whole fleet.
+
+A unit's alert level follows an exponentially weighted rate of anomalous
+samples (about the last ``alert_window`` samples), using the same 5% / 15%
+bands as the AI Diagnostic Laboratory.
+"""
+import threading
+import time
+
+import numpy as np
+
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normal data
+MIN_SCALE = 1e-3
+
+
+class StreamingDetector:
+    def __init__(self, window=512, refresh_every=64, threshold=4.0, alert_window=100,
+                 min_samples=50, warning_rate=0.05, critical_rate=0.15, stale_after=30.0):
+        self.window = window
+        self.refresh_every = refresh_every
+        self.threshold = threshold
+        self.alpha = 1.0 / alert_window
+        self.min_samples = min_samples
+        self.warning_rate = warning_rate
+        self.critical_rate = critical_rate
+        self.stale_after = stale_after
+
+        self._lock = threading.Lock()
+        self._index = {}                      # Unit_ID -> row
+        self._unit_ids = []
+        self._center = np.zeros((0, 2))       # median [Suhu, Tekanan]
+        self._scale = np.ones((0, 2))         # 1.4826 * MAD
+        self._fitted = np.zeros(0, dtype=bool)
+        self._since_refresh = np.zeros(0, dtype=np.int64)
+        self._rate = np.zeros(0)              # EWMA of the anomaly flag
+        self._last_score = np.zeros(0)
+        self._last_seen = np.zeros(0)         # wall clock of the unit's last sample
+
+        self.samples_scored = 0
+        self.refreshes = 0
+        self.latency = 0.0                    # ingest delay of the newest scored sample
+        self.updated_at = 0.0
+
+    def _rows(self, units):
+        rows = np.empty(len(units), dtype=np.int64)
+        new = 0
+        for i, unit_id in enumerate(units):
+            row = self._index.get(unit_id)
+            if row is None:
+                row = self._index[unit_id] = len(self._unit_ids)
+                self._unit_ids.append(unit_id)
+                new += 1
+            rows[i] = row
+        if new:
+            self._center = np.vstack([self._center, np.zeros((new, 2))])
+            self._scale = np.vstack([self._scale, np.ones((new, 2))])
+            self._fitted = np.concatenate([self._fitted, np.zeros(new, dtype=bool)])
+            self._since_refresh = np.concatenate([self._since_refresh, np.zeros(new, dtype=np.int64)])
+            self._rate = np.concatenate([self._rate, np.zeros(new)])
+            self._last_score = np.concatenate([self._last_score, np.zeros(new)])
+            self._last_seen = np.concatenate([self._last_seen, np.zeros(new)])
+        return rows
+
+    def _refresh(self, rows, units, buffers):
+        for row, unit_id in zip(rows, units):
+            buffer = buffers.get(unit_id)
+            if buffer is None or buffer.size < self.min_samples:
+                continue
+            _, suhu, tekanan = buffer.window(self.window)
+            X = np.column_stack([suhu, tekanan]).astype(float)
+            center = np.median(X, axis=0)
+            self._center[row] = center
+            self._scale[row] = np.maximum(MAD_SCALE * np.median(np.abs(X - center), axis=0), MIN_SCALE)
+            self._fitted[row] = True
+            self._since_refresh[row] = 0
+            self.refreshes += 1
+
+    def observe(self, units, inverse, ts, suhu, tekanan, buffers):
+        """Score one ingested batch.
+
+        ``units`` are the batch's distinct Unit_IDs and ``inverse`` maps each
+        sample to its unit; ``buffers`` are the hub's ring buffers (already
+        holding the batch), used as the sliding windows for model refresh.
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._rows(units)
+            # Units without a model yet are fitted first (e.g. on backfilled history)
+            unfitted = ~self._fitted[rows]
+            if unfitted.any():
+                self._refresh(rows[unfitted], np.asarray(units)[unfitted], buffers)
+
+            sample_rows = rows[inverse]
+            X = np.column_stack([suhu, tekanan])
+            z = np.abs(X - self._center[sample_rows]) / self._scale[sample_rows]
+            score = z.max(axis=1)
+            scored = self._fitted[sample_rows]
+            flags = (score > self.threshold) & scored
+
+            # EWMA over each unit's samples in this batch, applied in closed form
+            n = np.bincount(inverse, weights=scored, minlength=len(units))
+            hits = np.bincount(inverse, weights=flags, minlength=len(units))
+            decay = (1 - self.alpha) ** n
+            batch_rate = np.divide(hits, n, out=np.zeros(len(units)), where=n > 0)
+            self._rate[rows] = self._rate[rows] * decay + (1 - decay) * batch_rate
+            peak = np.zeros(len(units))
+            np.maximum.at(peak, inverse, np.where(scored, score, 0))
+            self._last_score[rows] = peak
+            self._last_seen[rows] = now
+            self._since_refresh[rows] += np.bincount(inverse, minlength=len(units))
+
+            due = rows[self._since_refresh[rows] >= self.refresh_every]
+            if len(due):
+                self._refresh(due, [self._unit_ids[r] for r in due], buffers)
+
+            self.samples_scored += int(scored.sum())
+            self.latency = max(0.0, now - float(np.max(ts)))
+            self.updated_at = now
+            return flags
+
+    def forget(self, unit_ids):
+        """Drop the models and alert state of ``unit_ids`` (units removed from the fleet)."""
+        with self._lock:
+            drop = [self._index[unit_id] for unit_id in unit_ids if unit_id in self._index]
+            if not drop:
+                return
+            keep = np.ones(len(self._unit_ids), dtype=bool)
+            keep[drop] = False
+            self._unit_ids = [unit_id for unit_id, kept in zip(self._unit_ids, keep) if kept]
+            self._index = {unit_id: row for row, unit_id in enumerate(self._unit_ids)}
+            self._center, self._scale = self._center[keep], self._scale[keep]
+            self._fitted, self._since_refresh = self._fitted[keep], self._since_refresh[keep]
+            self._rate, self._last_score = self._rate[keep], self._last_score[keep]
+            self._last_seen = self._last_seen[keep]
+
+    def alerts(self, unit_ids=None):
+        """Current alert state: {'Critical': n, 'Warning': n, 'units': [(Unit_ID, rate, level), ...]}.
+
+        Units without a sample for ``stale_after`` seconds, or not in
+        ``unit_ids`` when given, are ignored. ``units`` lists alerting units,
+        highest rate first.
+        """
+        now = time.time()
+        with self._lock:
+            active = (now - self._last_seen) <= self.stale_after
+            if unit_ids is not None:
+                active &= np.isin(np.asarray(self._unit_ids, dtype=object), list(unit_ids))
+            rate = np.where(active, self._rate, 0.0)
+            unit_ids = list(self._unit_ids)
+        critical = rate > self.critical_rate
+        warning = (rate > self.warning_rate) & ~critical
+        order = np.argsort(-rate, kind='stable')
+        units = [(str(unit_ids[i]), float(rate[i]), 'Critical' if critical[i] else 'Warning')
+                 for i in order if critical[i] or warning[i]]
+        return {'Critical': int(critical.sum()), 'Warning': int(warning.sum()), 'units': units}
+
+    def rates(self):
+        """{Unit_ID: anomaly rate} for fitted units with a sample in the last ``stale_after`` seconds."""
+        now = time.time()
+        with self._lock:
+            active = np.flatnonzero(self._fitted & ((now - self._last_seen) <= self.stale_after))
+            return dict(zip((self._unit_ids[i] for i in active), self._rate[active].tolist()))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'units': len(self._unit_ids),
+                'samples_scored': self.samples_scored,
+                'refreshes': self.refreshes,
+                'latency': self.latency,
+                'updated_at': self.updated_at,
+            }
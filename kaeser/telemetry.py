@@ -0,0 +1,386 @@
+"""Per-unit sensor telemetry ingestion.
+
+Samples (Suhu = temperature, Tekanan = pressure) arrive through a queue and
+are stored in columnar, fixed-capacity ring buffers per unit. The Streamlit
+script thread only ever enqueues (``submit``) or copies a window out
+(``window``); grouping and appending happens on a background thread.
+
+Sources:
+    - ``submit`` / ``submit_frame``: in-process queue (stand-in for a broker)
+    - ``ingest_file``: CSV or Parquet with Unit_ID, Timestamp, Suhu, Tekanan
+    - ``watch_directory``: poll a directory for new CSV/Parquet drops
+    - ``serve_socket``: TCP line protocol ``unit_id,timestamp,suhu,tekanan``
+    - ``SimulatedFeed``: synthetic readings for every unit in the fleet store
+
+With an ``archive`` (kaeser.archive.TelemetryArchive) every ingested sample is
+also written to the on-disk history by the same background thread, and with a
+``detector`` (kaeser.streaming.StreamingDetector) it is scored for live alerts.
+``track_fleet`` drops the ring buffers (and detector state) of units deleted
+from the fleet store; their archived history stays on disk.
+"""
+import glob
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from kaeser.sensors import injected_anomaly_rate, simulate_readings, unit_seed
+
+TELEMETRY_COLUMNS = ['Unit_ID', 'Timestamp', 'Suhu', 'Tekanan']
+
+
+class RingBuffer:
+    """Columnar ring buffer holding the last ``capacity`` samples of one unit."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.suhu = np.zeros(capacity, dtype=np.float32)
+        self.tekanan = np.zeros(capacity, dtype=np.float32)
+        self.head = 0    # next write position
+        self.size = 0
+        self.total = 0   # samples ever appended; doubles as a data version
+
+    def append(self, ts, suhu, tekanan):
+        n = len(ts)
+        self.total += n
+        if n >= self.capacity:
+            ts, suhu, tekanan = ts[-self.capacity:], suhu[-self.capacity:], tekanan[-self.capacity:]
+            n = self.capacity
+        end = self.head + n
+        if end <= self.capacity:
+            self.ts[self.head:end] = ts
+            self.suhu[self.head:end] = suhu
+            self.tekanan[self.head:end] = tekanan
+        else:
+            split = self.capacity - self.head
+            self.ts[self.head:], self.ts[:n - split] = ts[:split], ts[split:]
+            self.suhu[self.head:], self.suhu[:n - split] = suhu[:split], suhu[split:]
+            self.tekanan[self.head:], self.tekanan[:n - split] = tekanan[:split], tekanan[split:]
+        self.head = end % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def window(self, n=None):
+        """Copy of the last ``n`` samples in chronological order."""
+        n = self.size if n is None else min(n, self.size)
+        idx = (self.head - n + np.arange(n)) % self.capacity
+        return self.ts[idx], self.suhu[idx], self.tekanan[idx]
+
+
+class TelemetryHub:
+    def __init__(self, capacity=2048, max_queue=10000, archive=None, detector=None):
+        self.capacity = capacity
+        self.archive = archive    # optional TelemetryArchive receiving every sample
+        self.detector = detector  # optional StreamingDetector scoring every sample
+        self._buffers = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.samples_ingested = 0
+        self.batches_dropped = 0
+        self.batches_failed = 0
+        self._started_at = time.time()
+
+        self._start_thread(self._drain_loop, 'telemetry-ingest')
+
+    def _start_thread(self, target, name, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    # --- PRODUCERS ---
+    def submit(self, unit_ids, ts, suhu, tekanan, block=False):
+        """Enqueue samples; ``unit_ids`` may be one ID or an array aligned with the values.
+
+        With ``block=False`` (the default, for the script thread) a full queue
+        drops the batch and returns False instead of waiting.
+        """
+        ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+        if np.isscalar(unit_ids) or isinstance(unit_ids, str):
+            unit_ids = np.full(len(ts), unit_ids, dtype=object)
+        batch = (np.asarray(unit_ids, dtype=object), ts,
+                 np.atleast_1d(np.asarray(suhu, dtype=np.float32)),
+                 np.atleast_1d(np.asarray(tekanan, dtype=np.float32)))
+        try:
+            self._queue.put(batch, block=block)
+            return True
+        except queue.Full:
+            self.batches_dropped += 1
+            return False
+
+    def submit_frame(self, df, block=False):
+        timestamps = pd.to_datetime(df['Timestamp']).astype('datetime64[ns]').astype('int64') / 1e9
+        return self.submit(df['Unit_ID'].to_numpy(dtype=object), timestamps.to_numpy(),
+                           df['Suhu'].to_numpy(), df['Tekanan'].to_numpy(), block=block)
+
+    def ingest_file(self, path, chunksize=100000):
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=TELEMETRY_COLUMNS):
+                self.submit_frame(batch.to_pandas(), block=True)
+        else:
+            for chunk in pd.read_csv(path, usecols=TELEMETRY_COLUMNS, chunksize=chunksize):
+                self.submit_frame(chunk, block=True)
+
+    def watch_directory(self, path, interval=2.0):
+        """Ingest every new *.csv / *.parquet file dropped into ``path``."""
+        def loop():
+            seen = set()
+            while not self._stop.is_set():
+                files = sorted(glob.glob(os.path.join(path, '*.csv')) + glob.glob(os.path.join(path, '*.parquet')))
+                for file in files:
+                    if file in seen:
+                        continue
+                    try:
+                        self.ingest_file(file)
+                    except Exception:
+                        # Possibly still being written; retried on the next poll
+                        logging.getLogger(__name__).exception('Telemetry file ingest failed: %s', file)
+                    else:
+                        seen.add(file)
+                self._stop.wait(interval)
+        return self._start_thread(loop, 'telemetry-watch')
+
+    def serve_socket(self, host='127.0.0.1', port=9500):
+        """Accept ``unit_id,timestamp,suhu,tekanan`` lines over TCP."""
+        hub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                rows = []
+                for line in self.rfile:
+                    parts = line.decode('utf-8').strip().split(',')
+                    if len(parts) == 4:
+                        rows.append(parts)
+                    if len(rows) >= 1000:
+                        hub._submit_rows(rows)
+                        rows = []
+                if rows:
+                    hub._submit_rows(rows)
+
+        server = socketserver.ThreadingTCPServer((host, port), Handler)
+        server.daemon_threads = True
+        self._start_thread(server.serve_forever, 'telemetry-socket')
+        return server
+
+    def track_fleet(self, store, interval=1.0):
+        """Prune buffers of units deleted from ``store`` (read from its change log)."""
+        wake = threading.Event()
+        store.subscribe(wake.set)
+
+        def loop():
+            revision = -1
+            while not self._stop.is_set():
+                try:
+                    current, changed, rows = store.changes_since(revision)
+                    if changed is None:
+                        self.retain(store.snapshot()['Unit_ID'])
+                    elif changed:
+                        self.forget(set(changed) - set(rows['Unit_ID']))
+                    revision = current
+                except Exception:
+                    logging.getLogger(__name__).exception('Telemetry buffer pruning failed')
+                wake.wait(interval)
+                wake.clear()
+        return self._start_thread(loop, 'telemetry-prune')
+
+    def _submit_rows(self, rows):
+        unit_ids, ts, suhu, tekanan = zip(*rows)
+        self.submit(np.array(unit_ids, dtype=object), np.array(ts, dtype=float),
+                    np.array(suhu, dtype=float), np.array(tekanan, dtype=float), block=True)
+
+    # --- CONSUMER ---
+    def _drain_loop(self):
+        while not self._stop.is_set():
+            if self.archive is not None and self.archive.flush_due():
+                try:
+                    self.archive.flush()
+                except Exception:
+                    logging.getLogger(__name__).exception('Telemetry archive flush failed')
+            try:
+                batches = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            # Coalesce whatever else is waiting into one grouped append
+            while len(batches) < 256:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append_batches(batches)
+            except Exception:
+                # Drop the failed batches but keep the only ingest thread alive
+                self.batches_failed += len(batches)
+                logging.getLogger(__name__).exception('Telemetry ingest failed')
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+
+    def _append_batches(self, batches):
+        unit_ids = np.concatenate([b[0] for b in batches])
+        ts = np.concatenate([b[1] for b in batches])
+        suhu = np.concatenate([b[2] for b in batches])
+        tekanan = np.concatenate([b[3] for b in batches])
+
+        units, inverse = np.unique(unit_ids.astype(str), return_inverse=True)
+        order = np.lexsort((ts, inverse))  # group by unit, chronological inside each group
+        bounds = np.searchsorted(inverse[order], np.arange(len(units) + 1))
+
+        with self._lock:
+            for i, unit_id in enumerate(units):
+                sel = order[bounds[i]:bounds[i + 1]]
+                buffer = self._buffers.get(unit_id)
+                if buffer is None:
+                    buffer = self._buffers[unit_id] = RingBuffer(self.capacity)
+                buffer.append(ts[sel], suhu[sel], tekanan[sel])
+                if self.archive is not None:
+                    self.archive.append(unit_id, ts[sel], suhu[sel], tekanan[sel])
+            if self.detector is not None:
+                self.detector.observe(units, inverse, ts, suhu, tekanan, self._buffers)
+            self.samples_ingested += len(ts)
+
+    # --- READERS ---
+    def window(self, unit_id, n=None):
+        """Latest ``n`` samples of a unit as a DataFrame (Timestamp, Suhu, Tekanan)."""
+        with self._lock:
+            buffer = self._buffers.get(unit_id)
+            if buffer is None:
+                return pd.DataFrame({'Timestamp': pd.to_datetime([]), 'Suhu': [], 'Tekanan': []})
+            ts, suhu, tekanan = buffer.window(n)
+        return pd.DataFrame({
+            'Timestamp': pd.to_datetime(ts, unit='s'),
+            'Suhu': suhu.astype(float),
+            'Tekanan': tekanan.astype(float)
+        })
+
+    def windows(self, unit_ids=None, n=None):
+        """{Unit_ID: (n, 2) array of [Suhu, Tekanan]} for many units under one lock."""
+        with self._lock:
+            unit_ids = list(self._buffers) if unit_ids is None else unit_ids
+            result = {}
+            for unit_id in unit_ids:
+                buffer = self._buffers.get(unit_id)
+                if buffer is not None:
+                    _, suhu, tekanan = buffer.window(n)
+                    result[unit_id] = np.column_stack([suhu, tekanan]).astype(float)
+        return result
+
+    def version(self, unit_id):
+        """Number of samples ever received for a unit (changes when new data arrives)."""
+        with self._lock:
+            buffer = self._buffers.get(unit_id)
+            return 0 if buffer is None else buffer.total
+
+    def units(self):
+        with self._lock:
+            return list(self._buffers)
+
+    # --- PRUNING ---
+    def forget(self, unit_ids):
+        """Drop the ring buffers and detector state of ``unit_ids``."""
+        with self._lock:
+            removed = [unit_id for unit_id in unit_ids if self._buffers.pop(unit_id, None) is not None]
+        if removed and self.detector is not None:
+            self.detector.forget(removed)
+        return removed
+
+    def retain(self, unit_ids):
+        """Drop every buffer whose unit is not in ``unit_ids``."""
+        keep = set(unit_ids)
+        with self._lock:
+            stale = [unit_id for unit_id in self._buffers if unit_id not in keep]
+        return self.forget(stale)
+
+    def stats(self):
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        return {
+            'units': len(self._buffers),
+            'samples_ingested': self.samples_ingested,
+            'samples_per_sec': self.samples_ingested / elapsed,
+            'queue_depth': self._queue.qsize(),
+            'batches_dropped': self.batches_dropped,
+            'batches_failed': self.batches_failed,
+        }
+
+    def wait_idle(self, timeout=5.0):
+        """Block until queued batches are appended (used by scripts and benchmarks)."""
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.005)
+
+    def stop(self):
+        self._stop.set()
+        if self.archive is not None:
+            self.archive.flush()
+
+
+class SimulatedFeed:
+    """Synthetic telemetry for every unit returned by ``fleet_source()``.
+
+    New units are backfilled with ``history`` readings, then every unit emits
+    ``rate_hz`` samples per second with anomalies at its injected rate
+    (``injected_anomaly_rate``, from static unit attributes). All of
+    it runs on the feed's background thread, so pages may briefly see units
+    without telemetry right after start-up.
+    """
+
+    def __init__(self, hub, fleet_source, rate_hz=1.0, history=500):
+        self.hub = hub
+        self.fleet_source = fleet_source
+        self.rate_hz = rate_hz
+        self.history = history
+        self._known = set()
+        self._rng = np.random.default_rng()
+        self._rates = (None, None)    # (fleet snapshot, its injected anomaly rates)
+        hub._start_thread(self._loop, 'telemetry-simulated')
+
+    def _backfill(self, fleet):
+        # Removed units are forgotten so that a re-added Unit_ID is backfilled again
+        self._known.intersection_update(fleet['Unit_ID'])
+        new_units = fleet[~fleet['Unit_ID'].isin(self._known)]
+        now = time.time()
+        for unit_id, rate in zip(new_units['Unit_ID'], injected_anomaly_rate(new_units)):
+            readings = simulate_readings(unit_id, n=self.history, anomaly_rate=rate)
+            readings = readings.sample(frac=1, random_state=unit_seed(unit_id))
+            ts = now - (len(readings) - np.arange(len(readings))) / self.rate_hz
+            self.hub.submit(unit_id, ts, readings['Suhu'].to_numpy(), readings['Tekanan'].to_numpy(), block=True)
+            self._known.add(unit_id)
+
+    def _tick(self, fleet, dt):
+        n = len(fleet)
+        per_unit = max(1, int(round(self.rate_hz * dt)))
+        unit_ids = np.repeat(fleet['Unit_ID'].to_numpy(dtype=object), per_unit)
+        if self._rates[0] is not fleet:
+            # Snapshots are shared until the store changes, so rates are recomputed only then
+            self._rates = (fleet, injected_anomaly_rate(fleet))
+        rates = np.repeat(self._rates[1], per_unit)
+        is_anomaly = self._rng.random(n * per_unit) < rates
+        suhu = np.where(is_anomaly, self._rng.normal(90, 8, n * per_unit), self._rng.normal(70, 2, n * per_unit))
+        tekanan = np.where(is_anomaly, self._rng.normal(4, 1.5, n * per_unit), self._rng.normal(7, 0.3, n * per_unit))
+        ts = time.time() - self._rng.uniform(0, dt, n * per_unit)
+        self.hub.submit(unit_ids, ts, suhu, tekanan)
+
+    def _loop(self):
+        interval = max(1.0 / self.rate_hz, 0.1)
+        last = time.time()
+        while not self.hub._stop.is_set():
+            now = time.time()
+            try:
+                fleet = self.fleet_source()
+                self._backfill(fleet)
+                now = time.time()
+                if len(fleet):
+                    self._tick(fleet, now - last)
+            except Exception:
+                logging.getLogger(__name__).exception('Simulated telemetry tick failed')
+            last = now
+            self.hub._stop.wait(interval)
@@ -0,0 +1,24 @@
+"""Dashboard pages, one module per menu entry.
+
+Page modules are imported on first use, so heavy dependencies (scikit-learn,
+matplotlib) load only when a page that needs them is opened.
+"""
+import importlib
+
+from kaeser.metrics import metrics
+
+# Menu label -> page module (order is the sidebar order)
+PAGES = {
+    "📊 Executive Dashboard": 'kaeser.views.executive',
+    "🌐 Fleet Management Control": 'kaeser.views.fleet_control',
+    "🧠 AI Diagnostic Laboratory": 'kaeser.views.diagnostics',
+    "📅 Smart Maintenance Calendar": 'kaeser.views.maintenance',
+    "⚡ Energy & ESG Sustainability": 'kaeser.views.energy',
+    "💰 Financial Loss & ROI Analysis": 'kaeser.views.finance',
+    "🔧 Unit Management": 'kaeser.views.unit_management',
+}
+
+
+def render_page(menu, fleet, kpis):
+    with metrics.span('page', page=PAGES[menu].rsplit('.', 1)[-1]):
+        importlib.import_module(PAGES[menu]).render(fleet, kpis)
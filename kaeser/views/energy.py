@@ -0,0 +1,280 @@
+"""Energy Optimization & ESG Sustainability dashboard."""
+import pandas as pd
+import streamlit as st
+
+from kaeser.charts import cached_chart, use_native
+from kaeser.config import ENERGY_HISTORY_DAYS
+from kaeser.energy import CO2_KG_PER_KWH, PowerHistory, daily_savings, fleet_energy, telemetry_load_factor
+from kaeser.fleet import ELECTRICITY_RATE
+from kaeser.resources import (get_fleet_store, get_savings_sweep, get_telemetry_archive, get_telemetry_hub,
+                              get_unit_energy)
+
+
+def render(fleet, kpis):
+    st.markdown('<div class="main-header"><h1>⚡ Energy Optimization & ESG Sustainability Dashboard</h1><p>Monitor energy consumption and environmental impact</p></div>', unsafe_allow_html=True)
+    
+    # Energy model: per-unit reductions of the 1-minute power history, scaled by live pressure
+    day = pd.Timestamp.now().normalize()
+    units = get_unit_energy(PowerHistory.history_key(fleet, ENERGY_HISTORY_DAYS, day), day)
+    load_factor = telemetry_load_factor(units.unit_ids, get_telemetry_hub().windows(units.unit_ids, 120))
+    energy = fleet_energy(units, load_factor)
+    
+    # Energy Metrics
+    col_e1, col_e2, col_e3, col_e4 = st.columns(4)
+    
+    with col_e1:
+        total_daily_energy = kpis.daily_energy_cost
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>💰 Daily Energy Cost</h4>
+            <h2>Rp {total_daily_energy:,.0f}</h2>
+            <p>Monthly: Rp {total_daily_energy * 30:,.0f}</p>
+            <small>Formula: Σ(Operational Hours × Power Consumption × 1500)</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col_e2:
+        avg_efficiency = energy.efficiency
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>⚡ Energy Efficiency</h4>
+            <h2>{avg_efficiency:.1f}%</h2>
+            <p>vs Standard: 68% | {avg_efficiency - 68:+.1f}%</p>
+            <small>Formula: (Loaded kWh / Total kWh) × 100%</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col_e3:
+        co2_reduction = energy.co2_avoided_tons
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>🌿 CO2 Reduction</h4>
+            <h2>{co2_reduction:,.1f} Ton</h4>
+            <p>Annualized | Target: 120 Ton</p>
+            <small>Formula: (Energy Saved × 0.85 kg CO2/kWh) / 1000</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col_e4:
+        water_saved = energy.water_saved_l
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>💧 Water Saved</h4>
+            <h2>{water_saved:,.0f} L</h2>
+            <p>Monthly Average | {energy.monthly_kwh:,.0f} kWh</p>
+            <small>Dry compression technology saves 100% water vs water-cooled</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Charts
+    col_ch1, col_ch2 = st.columns(2)
+    
+    with col_ch1:
+        st.subheader("Real-time Power Load Distribution (kWh)")
+        
+        # Fleet 24-hour load profile: average draw per hour of day over the power history
+        hours = list(range(24))
+        power_load = energy.hourly_kw.round(1).tolist()
+        
+        power_df = pd.DataFrame({
+            'Hour': hours,
+            'Power_kW': power_load,
+            'Cost_Rp': energy.hourly_kw * ELECTRICITY_RATE
+        })
+        
+        # Peak hour
+        peak_hour = energy.peak_hour
+        
+        if use_native(len(power_load)):
+            st.area_chart(power_df, x='Hour', y='Power_kW', height=300)
+        else:
+            def draw(ax):
+                ax.plot(hours, power_load, marker='o', color='#005293', linewidth=3)
+                ax.fill_between(hours, power_load, alpha=0.3, color='#005293')
+                
+                # Mark peak hour
+                ax.annotate(f'Peak: {max(power_load):.0f} kW',
+                           xy=(peak_hour, max(power_load)),
+                           xytext=(peak_hour, max(power_load) + 20),
+                           arrowprops=dict(arrowstyle='->', color='red'),
+                           fontsize=10, color='red')
+                
+                ax.set_xlabel('Hour of Day')
+                ax.set_ylabel('Power Consumption (kW)')
+                ax.set_title('24-Hour Power Load Profile')
+                ax.grid(True, alpha=0.3)
+                ax.set_xticks(range(0, 24, 2))
+            
+            st.image(cached_chart('power_load_profile', draw, power_df), use_container_width=True)
+        st.caption(f"Average over {len(energy.daily_kwh)} days of 1-minute power history since "
+                   f"{energy.daily_kwh.index[0]:%d %b %Y}, scaled by live pressure telemetry")
+        
+        st.info(f"""
+        **AI Energy Optimization Insight:**
+        
+        Peak load occurs at **{peak_hour}:00** with **{max(power_load):.0f} kW** consumption.
+        
+        **Recommendation:**
+        - Load shifting: Move non-critical operations to off-peak hours (22:00-06:00)
+        - Potential savings: **15%** (Rp {max(power_load) * ELECTRICITY_RATE * 0.15:,.0f}/day)
+        - Implement smart scheduling for compressor units
+        """)
+    
+    with col_ch2:
+        st.subheader("ESG: Carbon Footprint Analysis")
+        
+        # CO2 Calculation Breakdown (monthly kWh × 0.85 kg CO2/kWh)
+        to_tons = CO2_KG_PER_KWH / 1000
+        
+        co2_data = pd.DataFrame({
+            'Category': ['Loaded Operation', 'Unloaded Idling', 'Avoided (Auto Shutdown)', 'Net Footprint'],
+            'CO2_Tons': [energy.loaded_kwh * to_tons, energy.idle_kwh * to_tons,
+                         -energy.avoided_kwh * to_tons, energy.co2_tons],
+            'Color': ['#ef4444', '#f59e0b', '#10b981', '#005293']
+        })
+        
+        if use_native(len(co2_data)):
+            st.bar_chart(co2_data, x='Category', y='CO2_Tons', color='Color', height=300)
+        else:
+            def draw(ax):
+                bars = ax.bar(co2_data['Category'], co2_data['CO2_Tons'], 
+                             color=co2_data['Color'])
+                
+                # Add value labels on bars
+                for bar, value in zip(bars, co2_data['CO2_Tons']):
+                    height = bar.get_height()
+                    ax.text(bar.get_x() + bar.get_width()/2., height,
+                           f'{value:.1f} Ton', ha='center', va='bottom' if height > 0 else 'top')
+                
+                ax.set_ylabel('CO2 (Tons)')
+                ax.set_title('Carbon Footprint Breakdown (Monthly)')
+                ax.grid(True, alpha=0.3, axis='y')
+            
+            st.image(cached_chart('co2_breakdown', draw, co2_data), use_container_width=True)
+        
+        # ESG Score Calculation
+        st.markdown("""
+        **ESG Score Calculation:**
+        
+        | Metric | Weight | Score | Contribution |
+        |--------|--------|-------|--------------|
+        | Energy Efficiency | 30% | 92/100 | 27.6 |
+        | Carbon Reduction | 40% | 88/100 | 35.2 |
+        | Water Conservation | 20% | 95/100 | 19.0 |
+        | Circular Economy | 10% | 85/100 | 8.5 |
+        | **Total ESG Score** | **100%** | **90.3/100** | **Excellent** |
+        """)
+    
+    # Archived telemetry for one unit (daily aggregates over memmapped day partitions)
+    telemetry_archive = get_telemetry_archive()
+    if telemetry_archive is not None:
+        with st.expander("📈 Unit Telemetry History"):
+            col_h1, col_h2 = st.columns([1, 3])
+            with col_h1:
+                history_unit = st.selectbox("Unit", units.unit_ids, key='energy_history_unit')
+                history_days = st.slider("Days", 1, 90, 30, key='energy_history_days')
+            now = pd.Timestamp.now(tz='UTC').tz_localize(None)
+            daily = telemetry_archive.daily_stats(history_unit, now - pd.Timedelta(days=history_days), now)
+            with col_h2:
+                if daily.empty:
+                    st.info(f"No archived telemetry for {history_unit} yet")
+                else:
+                    st.line_chart(daily.set_index('Date')[['Tekanan_Mean', 'Tekanan_Min']], height=250)
+                    st.caption(f"{daily['Samples'].sum():,} samples over {len(daily)} days")
+    
+    # Energy Savings Calculation
+    st.markdown("---")
+    st.subheader("💡 Energy Savings Calculator")
+    
+    col_calc1, col_calc2, col_calc3 = st.columns(3)
+    
+    with col_calc1:
+        current_hours = st.number_input("Current Daily Operating Hours", 
+                                       min_value=8.0, max_value=24.0, value=16.0, step=0.5)
+    
+    with col_calc2:
+        current_power = st.number_input("Current Power Consumption (kW)", 
+                                       min_value=50.0, max_value=200.0, value=100.0, step=5.0)
+    
+    with col_calc3:
+        optimization_rate = st.slider("Optimization Potential (%)", 0, 30, 15)
+    
+    # Calculate savings (same formula as the sweep: fewer hours at OPTIMIZED_EFFICIENCY of the draw)
+    current_daily = current_hours * current_power * ELECTRICITY_RATE
+    savings_per_day = float(daily_savings(current_hours, current_power, optimization_rate))
+    optimized_daily = current_daily - savings_per_day
+    
+    monthly_savings = savings_per_day * 30
+    annual_savings = monthly_savings * 12
+    
+    st.success(f"""
+    **Potential Savings Calculation:**
+    
+    - Current Daily Cost: **Rp {current_daily:,.0f}**
+    - Optimized Daily Cost: **Rp {optimized_daily:,.0f}**
+    - Daily Savings: **Rp {savings_per_day:,.0f}**
+    - Monthly Savings: **Rp {monthly_savings:,.0f}**
+    - Annual Savings: **Rp {annual_savings:,.0f}**
+    
+    *Based on {optimization_rate}% optimization through load shifting and efficiency improvements*
+    """)
+    
+    if st.toggle("🧮 Sweep mode: every hours × power × optimization combination at once", key='energy_sweep'):
+        savings_sweep_panel(current_hours, current_power, optimization_rate)
+
+
+@st.fragment
+def savings_sweep_panel(current_hours, current_power, optimization_rate):
+    """Heatmap and savings frontier from one cached grid evaluation (reruns only this panel)."""
+    col_r1, col_r2 = st.columns(2)
+    with col_r1:
+        hours_range = st.slider("Operating Hours Range", 8.0, 24.0, (8.0, 24.0), 0.5, key='energy_sweep_hours')
+    with col_r2:
+        power_range = st.slider("Power Range (kW)", 50.0, 200.0, (50.0, 200.0), 5.0, key='energy_sweep_power')
+    
+    sweep = get_savings_sweep(get_fleet_store().revision(), hours_range, power_range, 0.5, 5.0)
+    rate = st.select_slider("Optimization Potential (%) for the heatmap", options=[int(r) for r in sweep.rates],
+                            value=optimization_rate, key='energy_sweep_rate')
+    annual = sweep.grid[:, :, rate]
+    
+    col_s1, col_s2 = st.columns(2)
+    
+    with col_s1:
+        def draw_heatmap(ax):
+            extent = [sweep.power_kw[0], sweep.power_kw[-1], sweep.hours[0], sweep.hours[-1]]
+            image = ax.imshow(annual / 1e6, origin='lower', aspect='auto', extent=extent, cmap='YlGn')
+            ax.figure.colorbar(image, ax=ax, label='Annual Savings (Rp M)')
+            if hours_range[0] <= current_hours <= hours_range[1] and power_range[0] <= current_power <= power_range[1]:
+                ax.plot(current_power, current_hours, marker='*', markersize=14, color='#ef4444', label='Calculator input')
+                ax.legend(loc='upper left')
+            ax.set_xlabel('Power Consumption (kW)')
+            ax.set_ylabel('Daily Operating Hours')
+            ax.set_title(f'Annual Savings per Unit at {rate}% Optimization')
+        
+        png = cached_chart('energy_savings_heatmap', draw_heatmap, annual, sweep.hours, sweep.power_kw,
+                           rate, current_hours, current_power, figsize=(8, 6))
+        st.image(png, use_container_width=True)
+    
+    with col_s2:
+        frontier = sweep.fleet
+        if frontier.empty:
+            st.info("No fleet units to sweep.")
+        else:
+            def draw_frontier(ax):
+                regions = [col for col in frontier.columns if col != 'Fleet']
+                ax.stackplot(frontier.index, *(frontier[col] / 1e9 for col in regions), labels=regions, alpha=0.8)
+                ax.axvline(rate, color='#ef4444', linestyle='--', linewidth=2)
+                ax.set_xlabel('Optimization Potential (%)')
+                ax.set_ylabel('Fleet Annual Savings (Rp B)')
+                ax.set_title('Fleet Savings Frontier by Region')
+                ax.legend(loc='upper left', fontsize=8)
+                ax.grid(True, alpha=0.3)
+            
+            png = cached_chart('energy_savings_frontier', draw_frontier, frontier, rate, figsize=(8, 6))
+            st.image(png, use_container_width=True)
+    
+    if not sweep.fleet.empty:
+        st.metric(f"Fleet Annual Savings at {rate}% (every unit's own hours and power)",
+                  f"Rp {sweep.fleet.loc[rate, 'Fleet']:,.0f}")
@@ -0,0 +1,101 @@
+"""Executive Dashboard: fleet KPIs, health distribution and recent alerts."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from kaeser.charts import cached_chart, use_native
+from kaeser.metrics import metrics
+from kaeser.resources import get_streaming_detector
+
+
+def render(fleet, kpis):
+    streaming_detector = get_streaming_detector()
+    
+    st.markdown('<div class="main-header"><h1>📊 Executive Dashboard</h1><p>Real-time overview of enterprise operations and KPIs</p></div>', unsafe_allow_html=True)
+    
+    # Top Level KPIs
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>🟢 System Reliability</h4>
+            <h2>99.92%</h2>
+            <p>vs Target: 98.5% | +1.42%</p>
+            <small>Formula: (Total Uptime Hours / Total Hours) × 100%</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col2:
+        avg_health = kpis.avg_health
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>⚕️ Avg Health Score</h4>
+            <h2>{avg_health:.1f}/100</h2>
+            <p>Stable Trend | Last 30d: +2.3%</p>
+            <small>Formula: 100 - Σ(Age + Usage + Maintenance Penalties)</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col3:
+        total_energy_cost = kpis.monthly_energy_cost
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>💰 Monthly Energy Cost</h4>
+            <h2>Rp {total_energy_cost:,.0f}</h2>
+            <p>Efficiency: 12.4% vs Last Month</p>
+            <small>Formula: Σ(Hours × Power × Electricity Rate × 30)</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    with col4:
+        online_units = kpis.online_units
+        st.markdown(f'''
+        <div class="metric-card">
+            <h4>🔧 Units Online</h4>
+            <h2>{online_units}/{kpis.total_units}</h2>
+            <p>{kpis.total_units - online_units} Units Offline</p>
+            <small>Operational Status: Health Score > 50</small>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    # Charts Row
+    st.markdown("---")
+    col_chart1, col_chart2 = st.columns(2)
+    
+    with col_chart1:
+        st.subheader("Health Score Distribution")
+        # The figure depends only on the 20 bin counts, not on every unit
+        counts, edges = np.histogram(fleet['Health_Score'].to_numpy(), bins=20)
+        if use_native(len(counts)):
+            st.bar_chart(pd.Series(counts, index=edges[:-1].round(1), name='Frequency'), height=300)
+        else:
+            def draw(ax):
+                ax.stairs(counts, edges, fill=True, color='#005293', edgecolor='black')
+                ax.set_xlabel('Health Score')
+                ax.set_ylabel('Frequency')
+                ax.set_title('Distribution of Health Scores')
+            st.image(cached_chart('health_hist', draw, counts, edges), use_container_width=True)
+    
+    with col_chart2:
+        st.subheader("Status by Location")
+        status_by_loc = kpis.status_by_location
+        st.bar_chart(status_by_loc, height=300)
+    
+    # Recent Alerts
+    st.markdown("---")
+    st.subheader("🚨 Recent Alerts & Notifications")
+    
+    # Same source and bands (5% / 15%) as the sidebar live alerts: the streaming detector
+    alerts = streaming_detector.alerts(fleet['Unit_ID'])
+    alerts_df = pd.DataFrame(alerts['units'][:5], columns=['Unit_ID', 'Anomaly_Rate', 'Level']).merge(fleet, on='Unit_ID')
+    if not alerts_df.empty:
+        with metrics.span('section', section='executive_alerts'):
+            for _, row in alerts_df.iterrows():
+                level = "🔴 CRITICAL" if row['Level'] == 'Critical' else "🟡 WARNING"
+                with st.expander(f"{level}: {row['Unit_ID']} - Anomaly Rate: {row['Anomaly_Rate']:.1%} | Health Score: {row['Health_Score']}", expanded=True):
+                    st.write(f"**Location:** {row['Lokasi']} | **Live Alerts:** {alerts['Critical']} critical, {alerts['Warning']} warning fleet-wide")
+                    st.write(f"**Breakdown:** Age Penalty: {row['Age_Penalty']} | Usage Penalty: {row['Usage_Penalty']} | Maintenance Penalty: {row['Maintenance_Penalty']}")
+                    st.progress(row['Health_Score']/100)
+    else:
+        st.success("No units above the 5% anomaly-rate alert level")
@@ -0,0 +1,425 @@
+"""Financial Exposure & ROI Control Center."""
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+from matplotlib.ticker import FuncFormatter
+
+from kaeser.charts import cached_chart, use_native
+from kaeser.finance import (ADMIN_FEE_BASE, DEFAULT_HOURS_CV, DEFAULT_REPAIR_CV, INDIRECT_LOSS_SHARE, annual_savings,
+                            loss_per_failure, unit_losses)
+from kaeser.resources import get_fleet_store, get_loss_simulation, get_report_job
+
+SIMULATION_COUNTS = [1000, 10000, 100000]
+
+
+def render(fleet, kpis):
+    st.markdown('<div class="main-header"><h1>💰 Financial Exposure & ROI Control Center</h1><p>Comprehensive financial analysis and risk quantification</p></div>', unsafe_allow_html=True)
+    
+    col_f1, col_f2 = st.columns(2)
+    
+    with col_f1:
+        st.subheader("📉 Loss Exposure Calculation")
+        
+        # Input Parameters with explanations
+        st.markdown("#### 📊 Input Parameters")
+        
+        col_p1, col_p2 = st.columns(2)
+        with col_p1:
+            downtime_cost = st.number_input("Cost of Downtime (Rp/Hour)", 
+                                          value=25000000,
+                                          help="Includes lost production, labor costs, and penalty fees")
+            
+            repair_cost = st.number_input("Average Repair Cost (Rp)", 
+                                        value=15000000,
+                                        help="Average cost of emergency repairs including parts and labor")
+        
+        with col_p2:
+            risk_probability = st.slider("Risk Probability (%)", 
+                                       0, 100, 30,
+                                       help="Probability of failure occurring based on health score and usage")
+            
+            affected_hours = st.number_input("Expected Downtime Hours", 
+                                           min_value=1, max_value=168, value=48,
+                                           help="Estimated downtime duration in case of failure")
+        
+        # CALCULATION FORMULAS (EXPLICIT)
+        st.markdown("---")
+        st.markdown("#### 🧮 Calculation Breakdown")
+        
+        # Formulas 1-3: Direct, Indirect (share of direct loss) and Total Potential Loss
+        direct_loss, indirect_loss, total_potential_loss = loss_per_failure(downtime_cost, affected_hours, repair_cost)
+        
+        # Formula 4: Risk-adjusted Loss
+        risk_adjusted_loss = total_potential_loss * (risk_probability / 100)
+        
+        st.markdown(f"""
+        **1. Direct Loss Calculation:**
+        ```
+        Direct Loss = (Downtime Cost × Hours) + Repair Cost
+                    = (Rp {downtime_cost:,.0f} × {affected_hours}) + Rp {repair_cost:,.0f}
+                    = Rp {direct_loss:,.0f}
+        ```
+        
+        **2. Indirect Loss Calculation:**
+        ```
+        Indirect Loss = Direct Loss × {INDIRECT_LOSS_SHARE:.0%}
+                      = Rp {direct_loss:,.0f} × {INDIRECT_LOSS_SHARE:.2f}
+                      = Rp {indirect_loss:,.0f}
+        ```
+        
+        **3. Total Potential Loss:**
+        ```
+        Total Loss = Direct Loss + Indirect Loss
+                   = Rp {direct_loss:,.0f} + Rp {indirect_loss:,.0f}
+                   = Rp {total_potential_loss:,.0f}
+        ```
+        
+        **4. Risk-adjusted Loss (Probability {risk_probability}%):**
+        ```
+        Risk-adjusted Loss = Total Loss × (Risk Probability / 100)
+                          = Rp {total_potential_loss:,.0f} × ({risk_probability}/100)
+                          = Rp {risk_adjusted_loss:,.0f}
+        ```
+        """)
+        
+        # Display Results
+        st.markdown(f"""
+        <div style="background-color: #fef2f2; padding: 20px; border-radius: 10px; border-left: 5px solid #ef4444;">
+            <h3 style="color: #dc2626; margin-top: 0;">⚠️ FINANCIAL EXPOSURE</h3>
+            <h2 style="color: #dc2626;">Rp {risk_adjusted_loss:,.0f}</h2>
+            <p>Potential loss that could be avoided with preventive maintenance</p>
+            <small>Based on {risk_probability}% failure probability</small>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.caption("💡 **Admin Insight:** This amount represents the financial risk exposure that can be mitigated through predictive maintenance.")
+    
+    with col_f2:
+        st.subheader("📈 ROI Analysis")
+        
+        st.markdown("#### 💰 Service ROI Model: Sigma Air Utility")
+        
+        # ROI Calculation Inputs
+        st.markdown("**Investment Parameters:**")
+        
+        col_roi1, col_roi2 = st.columns(2)
+        with col_roi1:
+            capex_savings = st.number_input("CAPEX Savings (Rp)", 
+                                          value=1500000000,
+                                          help="Capital expenditure avoided through pay-per-use model")
+            
+            energy_savings = st.number_input("Monthly Energy Savings (Rp)", 
+                                           value=12000000,
+                                           help="Reduced energy consumption through efficiency")
+        
+        with col_roi2:
+            maintenance_savings = st.number_input("Monthly Maintenance Savings (Rp)", 
+                                                value=8000000,
+                                                help="Reduced maintenance costs")
+            
+            admin_fee = st.slider("Admin Fee Optimization (%)", 0, 30, 15,
+                                help="Reduction in administrative costs")
+        
+        # ROI Calculation Formulas
+        st.markdown("---")
+        st.markdown("#### 🧮 ROI Calculation")
+        
+        # Annual Savings Calculation (each component, then the total)
+        annual_energy_savings = annual_savings(energy_savings, 0, capex_savings, 0)
+        annual_maintenance_savings = annual_savings(0, maintenance_savings, capex_savings, 0)
+        admin_savings = annual_savings(0, 0, capex_savings, admin_fee)
+        
+        total_annual_savings = annual_savings(energy_savings, maintenance_savings, capex_savings, admin_fee)
+        
+        # ROI Formula
+        roi_percentage = (total_annual_savings / capex_savings) * 100
+        
+        # Payback Period
+        payback_months = (capex_savings / total_annual_savings) * 12
+        
+        st.markdown(f"""
+        **1. Annual Savings Breakdown:**
+        ```
+        Energy Savings = Monthly Savings × 12
+                       = Rp {energy_savings:,.0f} × 12
+                       = Rp {annual_energy_savings:,.0f}/year
+        
+        Maintenance Savings = Monthly Savings × 12
+                            = Rp {maintenance_savings:,.0f} × 12
+                            = Rp {annual_maintenance_savings:,.0f}/year
+        
+        Admin Fee Savings = CAPEX × {ADMIN_FEE_BASE:.0%} × {admin_fee}%
+                          = Rp {capex_savings:,.0f} × {ADMIN_FEE_BASE:.2f} × {admin_fee/100}
+                          = Rp {admin_savings:,.0f}/year
+        
+        Total Annual Savings = Rp {total_annual_savings:,.0f}/year
+        ```
+        
+        **2. ROI Calculation:**
+        ```
+        ROI = (Total Annual Savings / CAPEX Savings) × 100%
+            = (Rp {total_annual_savings:,.0f} / Rp {capex_savings:,.0f}) × 100%
+            = {roi_percentage:.1f}%
+        ```
+        
+        **3. Payback Period:**
+        ```
+        Payback Period = (CAPEX Savings / Total Annual Savings) × 12 months
+                       = (Rp {capex_savings:,.0f} / Rp {total_annual_savings:,.0f}) × 12
+                       = {payback_months:.1f} months
+        ```
+        """)
+        
+        # Display ROI Results
+        st.markdown(f"""
+        <div style="background-color: #f0fdf4; padding: 20px; border-radius: 10px; border-left: 5px solid #10b981;">
+            <h3 style="color: #059669; margin-top: 0;">📊 ROI SUMMARY</h3>
+            <h2 style="color: #059669;">{roi_percentage:.1f}% ROI</h2>
+            <p>Payback Period: {payback_months:.1f} months</p>
+            <h4 style="color: #059669;">Rp {total_annual_savings:,.0f}</h4>
+            <p>Total Value Gained (First Year)</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # ROI Visualization with matplotlib
+        years = [1, 2, 3, 4, 5]
+        cumulative_savings = [total_annual_savings * y for y in years]
+        
+        def draw_roi(ax):
+            ax.plot(years, cumulative_savings, marker='o', color='#10b981', 
+                    linewidth=3, label='Cumulative Savings')
+            ax.axhline(y=capex_savings, color='#ef4444', linestyle='--', 
+                      linewidth=2, label='Initial Investment')
+            
+            ax.set_xlabel('Years')
+            ax.set_ylabel('Amount (Rp)')
+            ax.set_title('5-Year ROI Projection')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+            
+            # Format y-axis to show in millions
+            def millions(x, pos):
+                return f'Rp {x/1e6:.0f}M'
+            
+            ax.yaxis.set_major_formatter(FuncFormatter(millions))
+        
+        if use_native(len(years)):
+            roi_df = pd.DataFrame({'Cumulative Savings': cumulative_savings,
+                                   'Initial Investment': [capex_savings] * len(years)}, index=years)
+            st.line_chart(roi_df, height=300)
+        else:
+            png = cached_chart('roi_projection', draw_roi, years, cumulative_savings, capex_savings, figsize=(10, 4))
+            st.image(png, use_container_width=True)
+    
+    # Fleet-wide exposure (the same formulas applied to every unit)
+    st.markdown("---")
+    fleet_loss_exposure(fleet, downtime_cost, affected_hours, repair_cost)
+    
+    # Additional Financial Analysis
+    st.markdown("---")
+    st.subheader("📊 Comparative Financial Analysis")
+    
+    col_comp1, col_comp2, col_comp3 = st.columns(3)
+    
+    with col_comp1:
+        st.markdown("""
+        **Traditional Model:**
+        - CAPEX: Rp 2.5M
+        - Monthly Opex: Rp 45jt
+        - Downtime: 7%
+        - Total 5-Year Cost: **Rp 3.1M**
+        """)
+    
+    with col_comp2:
+        st.markdown("""
+        **Sigma Air Utility (Current):**
+        - CAPEX: Rp 1.0M
+        - Monthly Opex: Rp 32jt
+        - Downtime: 2%
+        - Total 5-Year Cost: **Rp 2.0M**
+        """)
+    
+    with col_comp3:
+        savings = 3100000000 - 2000000000
+        st.markdown(f"""
+        **Savings with Kaeser:**
+        - CAPEX Savings: **35%**
+        - OPEX Savings: **29%**
+        - Downtime Reduction: **71%**
+        - **Total 5-Year Savings: Rp {savings:,.0f}**
+        """)
+    
+    # Export Financial Report
+    st.markdown("---")
+    st.subheader("📥 Export Financial Report")
+    
+    # Create comprehensive report
+    report_data = {
+        'Parameter': [
+            'Cost of Downtime per Hour',
+            'Average Repair Cost',
+            'Risk Probability',
+            'Expected Downtime Hours',
+            'Direct Loss',
+            'Indirect Loss',
+            'Total Potential Loss',
+            'Risk-adjusted Loss',
+            'CAPEX Savings',
+            'Monthly Energy Savings',
+            'Monthly Maintenance Savings',
+            'Total Annual Savings',
+            'ROI Percentage',
+            'Payback Period (months)'
+        ],
+        'Value': [
+            f'Rp {downtime_cost:,.0f}',
+            f'Rp {repair_cost:,.0f}',
+            f'{risk_probability}%',
+            f'{affected_hours} hours',
+            f'Rp {direct_loss:,.0f}',
+            f'Rp {indirect_loss:,.0f}',
+            f'Rp {total_potential_loss:,.0f}',
+            f'Rp {risk_adjusted_loss:,.0f}',
+            f'Rp {capex_savings:,.0f}',
+            f'Rp {energy_savings:,.0f}',
+            f'Rp {maintenance_savings:,.0f}',
+            f'Rp {total_annual_savings:,.0f}',
+            f'{roi_percentage:.1f}%',
+            f'{payback_months:.1f}'
+        ]
+    }
+    
+    report_df = pd.DataFrame(report_data)
+    
+    col_exp1, col_exp2 = st.columns(2)
+    
+    with col_exp1:
+        # CSV Export
+        csv = report_df.to_csv(index=False).encode('utf-8')
+        st.download_button(
+            label="📄 Download Financial Report (CSV)",
+            data=csv,
+            file_name=f"Kaeser_Financial_Analysis_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    
+    with col_exp2:
+        # Fleet-wide per-unit / per-region report, built on a background thread
+        report_job = get_report_job()
+        if st.button(f"⚙️ Generate Fleet Report ({kpis.total_units:,} units)", use_container_width=True):
+            params = {
+                'downtime_cost': downtime_cost, 'repair_cost': repair_cost, 'affected_hours': affected_hours,
+                'capex_savings': capex_savings, 'energy_savings': energy_savings,
+                'maintenance_savings': maintenance_savings, 'admin_fee': admin_fee,
+            }
+            roi_png = cached_chart('roi_projection', draw_roi, years, cumulative_savings, capex_savings, figsize=(10, 4))
+            if not report_job.start(params, report_df, charts=[('5-Year ROI Projection', roi_png)]):
+                st.warning("A report is already being generated.")
+    
+    fleet_report_status(report_job)
+
+
+def fleet_loss_exposure(fleet, downtime_cost, affected_hours, repair_cost):
+    """Per-unit risk-adjusted loss by region, with an optional Monte Carlo distribution."""
+    st.subheader("🏭 Fleet Loss Exposure by Region")
+    st.caption("Risk probability per unit = (100 - Health_Score) / 100; loss per failure uses the inputs above.")
+    
+    units = unit_losses(fleet, downtime_cost, affected_hours, repair_cost)
+    col_m1, col_m2, col_m3 = st.columns(3)
+    with col_m1:
+        st.metric("Expected Fleet Loss", f"Rp {units['Risk_Adjusted_Loss_Rp'].sum() / 1e9:,.2f} B")
+    with col_m2:
+        st.metric("Avg Failure Probability", f"{units['Failure_Probability'].mean() * 100:.1f}%")
+    with col_m3:
+        st.metric("Units ≥ 50% Risk", f"{int((units['Failure_Probability'] >= 0.5).sum()):,}")
+    
+    monte_carlo = st.toggle("🎲 Monte Carlo simulation (sample downtime hours and repair costs)", key='fin_monte_carlo')
+    if not monte_carlo:
+        by_region = units.groupby('Lokasi').agg(
+            Units=('Unit_ID', 'size'),
+            Expected_Failures=('Failure_Probability', 'sum'),
+            Expected_Loss_Rp=('Risk_Adjusted_Loss_Rp', 'sum'),
+        ).reset_index()
+        st.dataframe(by_region.style.format({'Expected_Failures': '{:,.1f}', 'Expected_Loss_Rp': 'Rp {:,.0f}'}),
+                     use_container_width=True, hide_index=True)
+    else:
+        col_s1, col_s2, col_s3 = st.columns(3)
+        with col_s1:
+            n_sims = st.select_slider("Simulations", options=SIMULATION_COUNTS, value=10000, key='fin_mc_sims')
+        with col_s2:
+            hours_cv = st.slider("Downtime Hours Variability (CV)", 0.0, 1.5, DEFAULT_HOURS_CV, 0.1, key='fin_mc_hours_cv',
+                                 help="Standard deviation / mean of downtime hours per failure")
+        with col_s3:
+            repair_cv = st.slider("Repair Cost Variability (CV)", 0.0, 1.5, DEFAULT_REPAIR_CV, 0.1, key='fin_mc_repair_cv',
+                                  help="Standard deviation / mean of repair cost per failure")
+        
+        table, fleet_losses = get_loss_simulation(get_fleet_store().revision(), downtime_cost, affected_hours,
+                                                  repair_cost, n_sims, hours_cv, repair_cv)
+        st.dataframe(table.style.format({'Expected_Failures': '{:,.1f}', 'Expected_Loss_Rp': 'Rp {:,.0f}',
+                                         'P50_Loss_Rp': 'Rp {:,.0f}', 'P95_Loss_Rp': 'Rp {:,.0f}'}),
+                     use_container_width=True, hide_index=True)
+        
+        p50, p95 = table.iloc[-1][['P50_Loss_Rp', 'P95_Loss_Rp']]
+        
+        def draw(ax):
+            ax.hist(fleet_losses / 1e9, bins=60, color='#3b82f6', alpha=0.8)
+            ax.axvline(p50 / 1e9, color='#10b981', linestyle='--', linewidth=2, label=f'P50: Rp {p50 / 1e9:,.2f} B')
+            ax.axvline(p95 / 1e9, color='#ef4444', linestyle='--', linewidth=2, label=f'P95: Rp {p95 / 1e9:,.2f} B')
+            ax.set_xlabel('Fleet Loss (Rp B)')
+            ax.set_ylabel('Simulations')
+            ax.set_title(f'Fleet Loss Distribution ({n_sims:,} simulations)')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        png = cached_chart('fleet_loss_distribution', draw, fleet_losses, figsize=(10, 4))
+        st.image(png, use_container_width=True)
+    
+    with st.expander("🔎 Highest-exposure Units"):
+        top = units.nlargest(10, 'Risk_Adjusted_Loss_Rp')
+        st.dataframe(top.style.format({'Failure_Probability': '{:.0%}', 'Risk_Adjusted_Loss_Rp': 'Rp {:,.0f}'}),
+                     use_container_width=True, hide_index=True)
+
+
+def fleet_report_status(report_job):
+    """Progress of the background report and its downloads (polls only while running)."""
+    polling = report_job.status()['state'] == 'running'
+    st.fragment(_report_status, run_every=1.0 if polling else None)(report_job, polling)
+
+
+def _read_report(path):
+    """Contents of a generated report file (the handle is closed before returning)."""
+    with open(path, 'rb') as fh:
+        return fh.read()
+
+
+def _report_status(report_job, polling):
+    status = report_job.status()
+    if polling and status['state'] != 'running':
+        st.rerun()  # full rerun drops the polling timer
+    if status['state'] == 'running':
+        done = status['rows'] / status['total'] if status['total'] else 0.0
+        st.progress(min(done, 1.0), text=f"Generating fleet report... {status['rows']:,} / {status['total']:,} units")
+    elif status['state'] == 'failed':
+        st.error(f"Report generation failed: {status['error']}")
+    elif status['state'] == 'done':
+        files = status['files']
+        stamp = datetime.fromtimestamp(status['finished_at'])
+        st.success(f"Fleet report ready ({status['rows']:,} units, generated {stamp:%H:%M:%S}).")
+        
+        col_dl1, col_dl2, col_dl3, col_dl4 = st.columns(4)
+        downloads = [
+            (col_dl1, "📑 Executive Summary (PDF)", 'summary_pdf', 'Kaeser_Executive_Summary', 'pdf', "application/pdf"),
+            (col_dl2, "📄 Unit Report (CSV)", 'units_csv', 'Kaeser_Unit_Report', 'csv', "text/csv"),
+            (col_dl3, "🗂️ Unit Report (Parquet)", 'units_parquet', 'Kaeser_Unit_Report', 'parquet', "application/vnd.apache.parquet"),
+            (col_dl4, "🌏 Region Report (CSV)", 'regions_csv', 'Kaeser_Region_Report', 'csv', "text/csv"),
+        ]
+        for col, label, key, name, extension, mime in downloads:
+            with col:
+                # Read from disk only when clicked
+                st.download_button(label, data=lambda path=files[key]: _read_report(path),
+                                   file_name=f"{name}_{stamp:%Y%m%d_%H%M}.{extension}",
+                                   mime=mime, use_container_width=True, key=f'report_download_{key}')
+        
+        st.dataframe(status['regions'], use_container_width=True, hide_index=True)
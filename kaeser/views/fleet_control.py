@@ -0,0 +1,110 @@
+"""Global Fleet Control Center: map, regional stats and unit details."""
+import streamlit as st
+
+from kaeser.fleet import filter_units, page_units
+from kaeser.geo import ZOOM_LEVELS, unit_points
+from kaeser.resources import get_cluster_index, get_fleet_store
+
+# "Auto" map mode switches to clusters above this many units
+CLUSTER_THRESHOLD = 2000
+
+# Sort label -> (column, ascending)
+SORT_OPTIONS = {
+    "Health Score (lowest first)": ('Health_Score', True),
+    "Health Score (highest first)": ('Health_Score', False),
+    "Unit ID": ('Unit_ID', True),
+    "Last Service (oldest first)": ('Last_Service', True),
+    "Next Service Due (soonest first)": ('Next_Service_Due', True),
+}
+
+
+def render(fleet, kpis):
+    st.markdown('<div class="main-header"><h1>🌐 Global Fleet Control Center</h1><p>Real-time monitoring and geographical distribution of all units</p></div>', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader("Real-time Unit Distribution")
+        
+        # Enhanced map with status colors. Large fleets are shown as precomputed
+        # grid clusters so only the aggregated layer is sent to the browser.
+        col_map1, col_map2 = st.columns(2)
+        with col_map1:
+            map_mode = st.radio("Map Mode", ["Auto", "Clustered", "Individual Units"], horizontal=True, key='map_mode')
+        with col_map2:
+            zoom_label = st.selectbox("Cluster Grid", list(ZOOM_LEVELS), index=1, key='map_zoom')
+        
+        clustered = map_mode == "Clustered" or (map_mode == "Auto" and len(fleet) > CLUSTER_THRESHOLD)
+        if clustered:
+            clusters = get_cluster_index(get_fleet_store().revision())[zoom_label]
+            st.map(clusters, latitude='Latitude', longitude='Longitude', color='color', size='size')
+            st.caption(f"{len(fleet):,} units in {len(clusters):,} clusters "
+                       f"(🔴 ≥20% critical, 🟡 ≥50% warning/critical, 🟢 otherwise)")
+            with st.expander("Cluster Status Counts"):
+                st.dataframe(clusters.drop(columns=['color', 'size']).sort_values(['Critical', 'Units'], ascending=False),
+                             use_container_width=True, hide_index=True)
+        else:
+            st.map(unit_points(fleet), latitude='Latitude', longitude='Longitude', color='color')
+    
+    with col2:
+        st.subheader("Regional Quick Stats")
+        selected_loc = st.selectbox("Filter Region", ["All Regions"] + list(kpis.status_by_location.index))
+        
+        if selected_loc == "All Regions":
+            df_filtered = fleet
+            region_counts = kpis.status_counts
+        else:
+            df_filtered = fleet[fleet['Lokasi'] == selected_loc]
+            region_counts = kpis.status_by_location.loc[selected_loc]
+        
+        st.write(f"**Showing {len(df_filtered)} units in {selected_loc}**")
+        
+        # Metrics (materialized per-region counts)
+        healthy = int(region_counts.get('Healthy', 0))
+        warning = int(region_counts.get('Warning', 0))
+        critical = int(region_counts.get('Critical', 0))
+        
+        col_m1, col_m2, col_m3 = st.columns(3)
+        with col_m1:
+            st.metric("Healthy", healthy)
+        with col_m2:
+            st.metric("Warning", warning)
+        with col_m3:
+            st.metric("Critical", critical, delta_color="inverse")
+        
+        st.markdown("---")
+        
+        # Unit Details (paginated: only the visible page is rendered)
+        st.subheader("Unit Details")
+        col_u1, col_u2 = st.columns(2)
+        with col_u1:
+            sort_label = st.selectbox("Sort By", list(SORT_OPTIONS), key='fleet_sort')
+            status_filter = st.multiselect("Status", ['Critical', 'Warning', 'Healthy'], key='fleet_status')
+        with col_u2:
+            page_size = st.selectbox("Units per Page", [10, 25, 50, 100], index=1, key='fleet_page_size')
+            search = st.text_input("Search Unit ID", key='fleet_search')
+        
+        sort_by, ascending = SORT_OPTIONS[sort_label]
+        df_units = filter_units(df_filtered, statuses=status_filter, search=search.strip())
+        n_pages = max(1, -(-len(df_units) // page_size))
+        if st.session_state.get('fleet_page', 1) > n_pages:
+            st.session_state.fleet_page = n_pages  # filters shrank the list
+        page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key='fleet_page')
+        rows, _ = page_units(df_units, sort_by, ascending, page, page_size)
+        st.caption(f"Showing {len(rows)} of {len(df_units)} matching units")
+        
+        for label, health, lokasi, last_str, next_str, penalty_str in zip(
+                rows['Label'], rows['Health_Score'], rows['Lokasi'],
+                rows['Last_Service_Str'], rows['Next_Service_Str'], rows['Penalty_Str']):
+            with st.expander(label):
+                col_d1, col_d2 = st.columns(2)
+                with col_d1:
+                    st.write(f"**Health Score:** {health}/100")
+                    st.progress(health/100)
+                    st.write(f"**Location:** {lokasi}")
+                with col_d2:
+                    st.write(f"**Last Service:** {last_str}")
+                    st.write(f"**Next Service:** {next_str}")
+                
+                # Penalty Breakdown
+                st.caption(penalty_str)
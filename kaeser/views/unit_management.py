@@ -0,0 +1,169 @@
+"""Unit Management Console: add, remove, bulk import and export fleet units."""
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from kaeser.config import DATA_DIR
+from kaeser.fleet import LAT_MAP, LON_MAP
+from kaeser.fleet_io import REQUIRED_COLUMNS, export_csv, export_parquet, prepare_import, read_upload
+from kaeser.health import HEALTH_COLUMNS, score_units
+from kaeser.resources import get_fleet_aggregates, get_fleet_store
+
+EXPORT_FORMATS = {
+    "CSV": ('csv', 'text/csv'),
+    "Parquet": ('parquet', 'application/octet-stream'),
+}
+
+
+def _export_bytes(fleet_store, fmt):
+    """The fleet export file as bytes.
+
+    The store is written chunk by chunk to a temporary file under
+    DATA_DIR/exports, so building the export never holds more than one
+    chunk of rows. Serving it does hold the whole file: Streamlit keeps
+    download_button data in its in-memory media storage and has no
+    file-backed download path, so the finished file is read back (the file
+    is closed and removed before returning). Parquet is several times
+    smaller than CSV for large fleets.
+    """
+    export_dir = os.path.join(DATA_DIR, 'exports')
+    os.makedirs(export_dir, exist_ok=True)
+    with tempfile.TemporaryFile(dir=export_dir) as spool:
+        if fmt == "CSV":
+            text = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+            export_csv(fleet_store, text)
+            text.flush()
+            text.detach()
+        else:
+            export_parquet(fleet_store, spool)
+        spool.seek(0)
+        return spool.read()
+
+
+def render(fleet, kpis):
+    fleet_store = get_fleet_store()
+    fleet_aggregates = get_fleet_aggregates()
+    
+    st.markdown('<div class="main-header"><h1>🔧 Unit Management Console</h1><p>Add or remove units from the fleet database</p></div>', unsafe_allow_html=True)
+    
+    col_m1, col_m2 = st.columns([2, 1])
+    
+    with col_m1:
+        st.subheader("Current Fleet Overview")
+        st.dataframe(fleet[['Unit_ID', 'Lokasi', 'Status', 'Health_Score', 'Last_Service']].sort_values('Health_Score'), 
+                    use_container_width=True, height=400)
+    
+    with col_m2:
+        st.subheader("Quick Actions")
+        
+        # Add Unit Form
+        with st.expander("➕ Add New Unit", expanded=st.session_state.get('show_add_unit', False)):
+            with st.form("add_unit_form"):
+                new_unit_id = st.text_input("Unit ID", value=fleet_store.next_unit_id())
+                new_location = st.selectbox("Location", ['Jakarta', 'Surabaya', 'Bandung', 'Semarang', 'Medan', 'Makassar'])
+                new_last_service = st.date_input("Last Service", value=datetime.now().date(),
+                                                 max_value=datetime.now().date())
+                new_hours = st.slider("Operational Hours / Day", 8.0, 24.0, 12.0, 0.5)
+                
+                if st.form_submit_button("Add Unit to Fleet"):
+                    # Create new unit entry (penalties and Health Score computed from its inputs;
+                    # the maintenance penalty follows once live anomaly rates arrive)
+                    last_service = pd.Timestamp(new_last_service)
+                    new_unit = pd.DataFrame({
+                        'Unit_ID': [new_unit_id],
+                        'Lokasi': [new_location],
+                        'Status': [''],
+                        'Health_Score': [0],
+                        'Age_Penalty': [0],
+                        'Usage_Penalty': [0],
+                        'Maintenance_Penalty': [0],
+                        'Last_Service': [last_service],
+                        'Next_Service_Due': [last_service + timedelta(days=90)],
+                        'Operational_Hours_Daily': [new_hours],
+                        'Power_Consumption_kW': [round(np.random.uniform(50, 150), 1)],
+                        'Daily_Energy_Cost_Rp': [0],
+                        'Latitude': [LAT_MAP[new_location] + np.random.uniform(-0.1, 0.1)],
+                        'Longitude': [LON_MAP[new_location] + np.random.uniform(-0.1, 0.1)],
+                        'Installation_Date': [datetime.now()]
+                    })
+                    
+                    # Calculate energy cost and health
+                    new_unit['Daily_Energy_Cost_Rp'] = (new_unit['Operational_Hours_Daily'] * 
+                                                       new_unit['Power_Consumption_kW'] * 1500).round(0)
+                    new_unit[HEALTH_COLUMNS] = score_units(new_unit)[HEALTH_COLUMNS]
+                    
+                    # Persist to fleet store (indexed insert by Unit_ID)
+                    try:
+                        fleet_store.insert(new_unit)
+                    except KeyError:
+                        st.error(f"Unit {new_unit_id} already exists in fleet!")
+                    else:
+                        fleet_aggregates.refresh()
+                        st.session_state.show_add_unit = False
+                        st.success(f"Unit {new_unit_id} successfully added to fleet!")
+                        st.rerun()
+        
+        # Remove Unit Form
+        with st.expander("🗑️ Remove Unit", expanded=st.session_state.get('show_remove_unit', False)):
+            unit_to_remove = st.selectbox("Select Unit to Remove", fleet['Unit_ID'].tolist())
+            
+            if st.button("Confirm Removal", type="primary"):
+                fleet_store.delete(unit_to_remove)
+                fleet_aggregates.refresh()
+                st.session_state.show_remove_unit = False
+                st.error(f"Unit {unit_to_remove} has been removed from fleet!")
+                st.rerun()
+        
+        # Bulk Import (validated and written in one transaction)
+        with st.expander("📥 Bulk Import (CSV / Parquet)"):
+            st.caption(f"Required columns: {', '.join(REQUIRED_COLUMNS)}. Optional: Operational_Hours_Daily, "
+                       "Power_Consumption_kW, Last_Service, Next_Service_Due, Installation_Date, "
+                       "Maintenance_Penalty, Latitude/Longitude. Health_Score, Status, the age and usage "
+                       "penalties and Daily_Energy_Cost_Rp are computed from those, as for a new unit.")
+            upload = st.file_uploader("Fleet file", type=['csv', 'parquet'], key='bulk_import_file')
+            mode = st.radio("Existing Unit IDs", ["Reject", "Update"], horizontal=True, key='bulk_import_mode')
+            if upload is not None:
+                try:
+                    data = read_upload(upload.getvalue(), upload.name)
+                    # Updates keep the stored values of columns the file does not have
+                    stored = (fleet_store.get_units(data['Unit_ID'].astype(str).str.strip())
+                              if mode == "Update" and 'Unit_ID' in data.columns else None)
+                    units, errors = prepare_import(data, existing=stored)
+                except (ValueError, OSError) as exc:
+                    st.error(f"Cannot read {upload.name}: {exc}")
+                else:
+                    existing = fleet_store.existing_ids(units['Unit_ID'])
+                    st.write(f"**{len(units):,}** valid rows, **{len(errors):,}** rejected, "
+                             f"**{len(existing):,}** already in the fleet")
+                    if len(errors):
+                        st.dataframe(errors, use_container_width=True, hide_index=True, height=150)
+                    if mode == "Reject" and existing:
+                        units = units[~units['Unit_ID'].isin(existing)]
+                    if st.button(f"Import {len(units):,} Units", type="primary", disabled=units.empty):
+                        if mode == "Update":
+                            fleet_store.upsert_many(units)
+                        else:
+                            fleet_store.insert_many(units)
+                        fleet_aggregates.refresh()
+                        st.success(f"Imported {len(units):,} units")
+                        st.rerun()
+        
+        # Export (built chunk by chunk only when downloaded; served from memory)
+        with st.expander("📤 Export Fleet"):
+            export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key='fleet_export_format')
+            st.caption("The file is built when you click download and held in server memory while it is "
+                       "served; prefer Parquet for large fleets.")
+            extension, mime = EXPORT_FORMATS[export_format]
+            st.download_button(f"Download {kpis.total_units:,} Units",
+                               data=lambda: _export_bytes(fleet_store, export_format),
+                               file_name=f"kaeser_fleet_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                               mime=mime, use_container_width=True)
+        
+        # Fleet Statistics
+        st.metric("Total Units", kpis.total_units)
+        st.metric("Average Health Score", f"{kpis.avg_health:.1f}/100")
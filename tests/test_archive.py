@@ -0,0 +1,70 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kaeser.archive import SECONDS_PER_DAY, TelemetryArchive
+
+DAY0 = 20000 * SECONDS_PER_DAY   # start of a UTC day
+
+
+def write(archive, unit_id, ts):
+    ts = np.asarray(ts, dtype=np.float64)
+    # Suhu encodes the timestamp so misaligned columns are detectable
+    archive.append(unit_id, ts, (ts - DAY0).astype(np.float32), np.full(len(ts), 7.0, dtype=np.float32))
+    archive.flush()
+
+
+def test_appends_and_range_query(tmp_path):
+    archive = TelemetryArchive(str(tmp_path))
+    write(archive, 'A', DAY0 + np.arange(10.0))
+    write(archive, 'A', DAY0 + SECONDS_PER_DAY + np.arange(5.0))
+    ts, suhu, _ = archive.query('A', DAY0 + 5, DAY0 + SECONDS_PER_DAY + 2).columns()
+    assert ts.tolist() == [DAY0 + t for t in [5, 6, 7, 8, 9]] + [DAY0 + SECONDS_PER_DAY + t for t in [0, 1]]
+    assert np.array_equal(suhu, (ts - DAY0).astype(np.float32))
+    assert len(archive.latest('A', 3)) == 3
+
+
+def test_late_samples_are_merged_in_order(tmp_path):
+    archive = TelemetryArchive(str(tmp_path))
+    write(archive, 'A', DAY0 + np.array([0.0, 2.0, 4.0, 6.0]))
+    write(archive, 'A', DAY0 + np.array([1.0, 5.0]))          # older than the partition's last sample
+    write(archive, 'A', DAY0 + np.array([7.0]))               # plain append again
+    ts, suhu, tekanan = archive.query('A', DAY0, DAY0 + 10).columns()
+    assert ts.tolist() == [DAY0 + t for t in [0, 1, 2, 4, 5, 6, 7]]
+    assert np.array_equal(suhu, (ts - DAY0).astype(np.float32))
+    assert (tekanan == 7.0).all()
+
+
+def test_readers_never_see_misaligned_columns_during_merges(tmp_path):
+    archive = TelemetryArchive(str(tmp_path))
+    write(archive, 'A', DAY0 + np.arange(0.0, 2000.0, 2.0))
+    stop = threading.Event()
+    bad = []
+
+    def reader():
+        while not stop.is_set():
+            ts, suhu, _ = archive.query('A', DAY0, DAY0 + SECONDS_PER_DAY).columns()
+            if not np.array_equal(suhu, (ts - DAY0).astype(np.float32)):
+                bad.append(len(ts))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(50):
+            write(archive, 'A', DAY0 + np.array([2.0 * i + 1]))   # late sample: full rewrite
+    finally:
+        stop.set()
+        thread.join()
+    assert not bad
+    assert len(archive.query('A', DAY0, DAY0 + SECONDS_PER_DAY)) == 1050
+
+
+def test_retention_prunes_old_partitions_on_flush(tmp_path):
+    archive = TelemetryArchive(str(tmp_path), retention_days=2, prune_interval=0)
+    now = pd.Timestamp.now().timestamp()
+    write(archive, 'OLD', [now - 10 * SECONDS_PER_DAY])
+    write(archive, 'A', [now - 10 * SECONDS_PER_DAY, now])
+    assert archive.units() == ['A']
+    assert len(archive.days('A')) == 1
+    assert archive.stats()['partitions_pruned'] == 2
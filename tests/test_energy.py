@@ -0,0 +1,54 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kaeser.energy import PowerHistory, daily_savings
+from kaeser.fleet import generate_fleet
+
+END = pd.Timestamp('2026-01-15')
+
+
+def test_history_key_ignores_row_order_and_other_columns():
+    fleet = generate_fleet(30, seed=2)
+    key = PowerHistory.history_key(fleet, 2, END)
+    edited = pd.concat([fleet.iloc[5:], fleet.iloc[:5]]).assign(Health_Score=41)
+    assert PowerHistory.history_key(edited, 2, END) == key
+    changed = fleet.assign(Power_Consumption_kW=fleet['Power_Consumption_kW'] + 1)
+    assert PowerHistory.history_key(changed, 2, END) != key
+
+
+def test_build_reuses_matching_history(tmp_path):
+    path = str(tmp_path / 'power.f32')
+    fleet = generate_fleet(10, seed=2)
+    first = PowerHistory.build(path, fleet, days=1, end=END)
+    mtime = os.path.getmtime(path)
+    second = PowerHistory.build(path, fleet.iloc[::-1], days=1, end=END)
+    assert second.key == first.key
+    assert os.path.getmtime(path) == mtime
+    assert second.unit_ids == sorted(fleet['Unit_ID'])
+
+
+def test_concurrent_builds_leave_a_consistent_history(tmp_path):
+    path = str(tmp_path / 'power.f32')
+    fleets = [generate_fleet(n, seed=n) for n in (5, 12, 20)]
+    results = [None] * len(fleets)
+
+    def build(i):
+        results[i] = PowerHistory.build(path, fleets[i], days=1, end=END)
+
+    threads = [threading.Thread(target=build, args=(i,)) for i in range(len(fleets))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for fleet, history in zip(fleets, results):
+        assert len(history.unit_ids) == len(fleet)
+    final = PowerHistory(path)
+    assert os.path.getsize(path) == final.power.nbytes
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_daily_savings_formula():
+    assert np.isclose(daily_savings(16, 100, 15), 16 * 100 * 1500 * (1 - 0.85 * 0.9))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import LAT_MAP, generate_fleet
+from kaeser.fleet_io import prepare_import
+from kaeser.store import FleetStore
+
+NOW = pd.Timestamp('2026-01-15 08:00')
+
+
+def make_store(n_units=5):
+    store = FleetStore(':memory:')
+    store.insert_many(generate_fleet(n_units, seed=1))
+    return store
+
+
+def test_defaults_for_new_units():
+    units, errors = prepare_import(pd.DataFrame({'Unit_ID': ['A'], 'Lokasi': ['Medan']}), now=NOW, seed=0)
+    assert errors.empty
+    unit = units.iloc[0]
+    assert unit['Operational_Hours_Daily'] == 16.0
+    assert unit['Power_Consumption_kW'] == 100.0
+    assert unit['Last_Service'] == NOW
+    assert unit['Installation_Date'] == NOW
+    assert unit['Next_Service_Due'] == NOW + pd.Timedelta(days=90)
+    assert unit['Maintenance_Penalty'] == 0
+    assert abs(unit['Latitude'] - LAT_MAP['Medan']) <= 0.1
+
+
+def test_health_columns_are_computed():
+    df = pd.DataFrame({'Unit_ID': ['A'], 'Lokasi': ['Jakarta'], 'Health_Score': [5],
+                       'Operational_Hours_Daily': [8.0], 'Last_Service': [NOW]})
+    units, errors = prepare_import(df, now=NOW)
+    assert errors.empty
+    assert units.loc[0, 'Health_Score'] == 100
+    assert units.loc[0, 'Status'] == 'Healthy'
+
+
+def test_invalid_rows_are_reported():
+    df = pd.DataFrame({'Unit_ID': ['A', 'A', 'B'], 'Lokasi': ['Jakarta', 'Jakarta', 'Atlantis'],
+                       'Operational_Hours_Daily': [30.0, 10.0, 10.0]})
+    units, errors = prepare_import(df, now=NOW)
+    assert units.empty
+    assert errors['Row'].tolist() == [1, 2, 3]
+
+
+def test_update_keeps_columns_missing_from_file():
+    store = make_store()
+    before = store.get_units(['K-DX-002']).iloc[0]
+    df = pd.DataFrame({'Unit_ID': ['K-DX-002'], 'Lokasi': [before['Lokasi']], 'Operational_Hours_Daily': [20.0]})
+    units, errors = prepare_import(df, now=NOW, existing=store.get_units(df['Unit_ID']))
+    assert errors.empty
+    store.upsert_many(units)
+
+    after = store.get_units(['K-DX-002']).iloc[0]
+    assert after['Operational_Hours_Daily'] == 20.0
+    for col in ['Power_Consumption_kW', 'Last_Service', 'Next_Service_Due', 'Installation_Date',
+                'Maintenance_Penalty', 'Latitude', 'Longitude']:
+        assert after[col] == before[col], col
+    assert after['Usage_Penalty'] > before['Usage_Penalty']
+
+
+def test_update_moves_coordinates_with_region():
+    store = make_store()
+    before = store.get_units(['K-DX-001']).iloc[0]
+    region = 'Medan' if before['Lokasi'] != 'Medan' else 'Jakarta'
+    df = pd.DataFrame({'Unit_ID': ['K-DX-001'], 'Lokasi': [region]})
+    units, _ = prepare_import(df, now=NOW, existing=store.get_units(df['Unit_ID']))
+    assert abs(units.loc[0, 'Latitude'] - LAT_MAP[region]) <= 0.1
+    assert units.loc[0, 'Power_Consumption_kW'] == before['Power_Consumption_kW']
+
+
+def test_update_mixes_new_and_existing_units():
+    store = make_store()
+    df = pd.DataFrame({'Unit_ID': ['K-DX-003', 'NEW-1'], 'Lokasi': ['Jakarta', 'Jakarta']})
+    units, errors = prepare_import(df, now=NOW, existing=store.get_units(df['Unit_ID']))
+    assert errors.empty
+    stored = store.get_units(['K-DX-003']).iloc[0]
+    assert units.loc[0, 'Last_Service'] == stored['Last_Service']
+    assert units.loc[1, 'Last_Service'] == NOW
+    assert np.isfinite(units['Latitude']).all()
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import generate_fleet
+from kaeser.scheduler import _pack, schedule_maintenance
+
+
+def test_pack_fills_each_day_to_capacity():
+    release = np.array([0, 0, 0, 0, 0, 3])
+    days, slots = _pack(np.zeros(6, dtype=int), release, 1, [2])
+    assert days.tolist() == [0, 0, 1, 1, 2, 3]
+    assert slots.tolist() == [0, 1, 0, 1, 0, 0]
+
+
+def test_pack_keeps_regions_independent():
+    codes = np.array([0, 1, 0, 1, 0])
+    days, _ = _pack(codes, np.zeros(5, dtype=int), 2, [1, 2])
+    assert days.tolist() == [0, 0, 1, 0, 2]
+
+
+def test_pack_handles_late_releases_without_a_dense_horizon():
+    release = np.array([10 ** 9, 10 ** 9, 5])
+    days, slots = _pack(np.zeros(3, dtype=int), release, 1, [1])
+    assert days.tolist() == [10 ** 9, 10 ** 9 + 1, 5]
+    assert slots.tolist() == [0, 0, 0]
+
+
+def test_schedule_respects_capacity():
+    fleet = generate_fleet(200, seed=4)
+    schedule = schedule_maintenance(fleet, jobs_per_technician=1)
+    per_tech_day = schedule.groupby(['Technician', 'Scheduled_Date']).size()
+    assert per_tech_day.max() == 1
+    assert (schedule['Scheduled_Date'] >= schedule['Predicted_Failure'] - pd.Timedelta(days=14)).all()
+
+
+def test_schedule_with_no_jobs_is_empty():
+    fleet = generate_fleet(20, seed=4)
+    schedule = schedule_maintenance(fleet, today=pd.Timestamp('2026-01-01'), horizon_days=-1)
+    assert schedule.empty
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import generate_fleet
+from kaeser.sensors import MAX_ANOMALY_RATE, MIN_ANOMALY_RATE, injected_anomaly_rate
+
+NOW = pd.Timestamp('2026-01-15')
+
+
+def test_injected_rate_ignores_health_score():
+    fleet = generate_fleet(50, seed=3)
+    degraded = fleet.assign(Health_Score=40, Maintenance_Penalty=15)
+    assert np.array_equal(injected_anomaly_rate(fleet, NOW), injected_anomaly_rate(degraded, NOW))
+
+
+def test_injected_rate_grows_with_age_and_hours():
+    unit = pd.DataFrame({'Unit_ID': ['A', 'A', 'A'], 'Operational_Hours_Daily': [8.0, 24.0, 24.0],
+                         'Installation_Date': [NOW, NOW, NOW - pd.Timedelta(days=3650)]})
+    rates = injected_anomaly_rate(unit, NOW)
+    assert rates[0] < rates[1] < rates[2]
+    assert ((rates >= MIN_ANOMALY_RATE) & (rates <= MAX_ANOMALY_RATE)).all()
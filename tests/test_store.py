@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from kaeser.fleet import generate_fleet
+from kaeser.store import FleetStore
+
+
+@pytest.fixture
+def store():
+    store = FleetStore(':memory:')
+    store.insert_many(generate_fleet(5, seed=1))
+    return store
+
+
+def test_insert_rejects_existing_ids(store):
+    with pytest.raises(KeyError):
+        store.insert_many(store.get_units(['K-DX-001']))
+
+
+def test_upsert_overwrites_existing_and_inserts_new(store):
+    rows = store.get_units(['K-DX-001'])
+    rows['Power_Consumption_kW'] = 150.0
+    new = rows.assign(Unit_ID='K-DX-100')
+    store.upsert_many(pd.concat([rows, new], ignore_index=True))
+    assert store.count() == 6
+    assert store.get_units(['K-DX-001', 'K-DX-100'])['Power_Consumption_kW'].tolist() == [150.0, 150.0]
+
+
+def test_update_many_changes_only_given_columns(store):
+    before = store.get_units(['K-DX-002', 'K-DX-003'])
+    store.update_many(pd.DataFrame({'Unit_ID': ['K-DX-002', 'K-DX-003'], 'Health_Score': [41, 42]}))
+    after = store.get_units(['K-DX-002', 'K-DX-003'])
+    assert after['Health_Score'].tolist() == [41, 42]
+    pd.testing.assert_frame_equal(after.drop(columns='Health_Score'), before.drop(columns='Health_Score'))
+
+
+def test_changes_since_reports_edits_and_deletes(store):
+    revision = store.revision()
+    store.update('K-DX-001', Health_Score=50)
+    store.delete('K-DX-002')
+    current, changed, rows = store.changes_since(revision)
+    assert current > revision
+    assert set(changed) == {'K-DX-001', 'K-DX-002'}
+    assert rows['Unit_ID'].tolist() == ['K-DX-001']
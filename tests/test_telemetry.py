@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from kaeser.fleet import generate_fleet
+from kaeser.store import FleetStore
+from kaeser.telemetry import TelemetryHub
+
+
+class FailingDetector:
+    def __init__(self):
+        self.calls = 0
+
+    def observe(self, *args):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError('boom')
+
+
+def test_ingest_survives_a_failing_batch():
+    detector = FailingDetector()
+    hub = TelemetryHub(detector=detector)
+    try:
+        hub.submit('A', [1.0], [70.0], [7.0], block=True)
+        hub.wait_idle()
+        hub.submit('A', [2.0], [71.0], [7.1], block=True)
+        hub.wait_idle()
+        assert hub.stats()['batches_failed'] == 1
+        assert detector.calls == 2
+        assert hub.version('A') == 2
+    finally:
+        hub.stop()
+
+
+def test_watch_directory_retries_unreadable_files(tmp_path):
+    hub = TelemetryHub()
+    path = tmp_path / 'drop.csv'
+    path.write_text('Unit_ID,Timestamp\n')   # half-written: columns missing
+    try:
+        hub.watch_directory(str(tmp_path), interval=0.05)
+        hub._stop.wait(0.3)   # let the watcher fail on the partial file first
+        pd.DataFrame({'Unit_ID': ['B', 'B'], 'Timestamp': ['2026-01-01 00:00:00', '2026-01-01 00:00:01'],
+                      'Suhu': [70.0, 71.0], 'Tekanan': [7.0, 7.0]}).to_csv(path, index=False)
+        for _ in range(100):
+            hub.wait_idle()
+            if hub.version('B') == 2:
+                break
+            hub._stop.wait(0.05)
+        assert hub.version('B') == 2
+    finally:
+        hub.stop()
+
+
+def test_track_fleet_prunes_deleted_units():
+    store = FleetStore(':memory:')
+    store.insert_many(generate_fleet(3, seed=1))
+    hub = TelemetryHub()
+    try:
+        hub.track_fleet(store, interval=0.05)
+        for unit_id in store.snapshot()['Unit_ID']:
+            hub.submit(unit_id, np.arange(5.0), np.full(5, 70.0), np.full(5, 7.0), block=True)
+        hub.wait_idle()
+        store.delete('K-DX-001')
+        for _ in range(100):
+            if 'K-DX-001' not in hub.units():
+                break
+            hub._stop.wait(0.05)
+        assert sorted(hub.units()) == ['K-DX-002', 'K-DX-003']
+    finally:
+        hub.stop()